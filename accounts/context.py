@@ -0,0 +1,65 @@
+from functools import cached_property
+
+from rates.utils import resolve_currency
+
+from .models import User
+
+
+"""
+    # 요청 단위 유저 컨텍스트
+    - 유저 + 파견 프로필 + 예산안(기본파견비/생활비)을 쿼리 한 번(select_related)으로 로드
+    - 예산안 항목(items)은 처음 쓸 때 한 번만 조회해서 재사용
+    - 같은 요청 안에서는 get_user_context(request) 로 같은 객체를 공유
+"""
+class UserContext:
+    def __init__(self, user):
+        self.user = (
+            User.objects
+            .select_related(
+                "exchange_profile",
+                "exchange_profile__exchange_univ",
+                "budget__base_budget",
+                "budget__living_budget",
+            )
+            .get(pk=user.pk)
+        )
+
+    @cached_property
+    def exchange_profile(self):
+        return getattr(self.user, "exchange_profile", None)
+
+    @cached_property
+    def currency(self):
+        return resolve_currency(self.exchange_profile)
+
+    @cached_property
+    def budget(self):
+        return getattr(self.user, "budget", None)
+
+    @cached_property
+    def base_budget(self):
+        return getattr(self.budget, "base_budget", None)
+
+    @cached_property
+    def living_budget(self):
+        return getattr(self.budget, "living_budget", None)
+
+    @cached_property
+    def base_budget_items(self):
+        if self.base_budget is None:
+            return []
+        return list(self.base_budget.items.all())
+
+    @cached_property
+    def living_budget_items(self):
+        if self.living_budget is None:
+            return []
+        return list(self.living_budget.items.all())
+
+
+def get_user_context(request):
+    context = getattr(request, "_user_context", None)
+    if context is None or context.user.pk != request.user.pk:
+        context = UserContext(request.user)
+        request._user_context = context
+    return context
@@ -0,0 +1,12 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from dongleDongle.cache import FEEDS_SCOPE, bump_versions, user_scope
+
+from .models import ExchangeProfile
+
+
+# 파견 국가(통화)/기간이 바뀌면 해당 유저의 응답 캐시와 피드 목록 캐시 무효화
+@receiver([post_save, post_delete], sender=ExchangeProfile)
+def invalidate_cache_on_profile_change(sender, instance, **kwargs):
+    bump_versions(user_scope(instance.user_id), FEEDS_SCOPE)
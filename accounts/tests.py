@@ -1,3 +1,9 @@
 from django.test import TestCase
+from django.urls import reverse
 
-# Create your tests here.
+from dongleDongle.testing import QueryBudgetMixin
+
+
+class MyProfileQueryBudgetTest(QueryBudgetMixin, TestCase):
+    def test_my_profile(self):
+        self.assertQueryBudget("accounts:my-profile", reverse("accounts:my-profile"))
@@ -2,33 +2,9 @@ from rest_framework import serializers
 from .models import *
 from accounts.models import ExchangeProfile
 from rates.views import convert_to_krw, convert_from_krw
+from rates.utils import resolve_currency
 
 
-COUNTRY_TO_CURRENCY = {
-    "한국": "KRW",
-    "미국": "USD",
-    "일본": "JPY",
-    "독일": "EUR",
-    "프랑스": "EUR",
-    "중국": "CNY",
-    "대만": "TWD",
-    "캐나다": "CAD",
-    "이탈리아": "EUR",
-    "네덜란드": "EUR",
-    "영국": "GBP",
-    "USA": "USD",
-    "JAPAN": "JPY",
-    "KOREA": "KRW",
-    "CHINA": "CNY",
-    "TAIWAN": "TWD",
-    "CANADA": "CAD",
-    "UK": "GBP",
-    "FRANCE": "EUR",
-    "GERMANY": "EUR",
-    "NETHERLANDS": "EUR",
-    "ITALY": "EUR",
-}
-
 #기본 파견비 내 아이템 시리얼라이저 
 class BaseBudgetItemSerializer(serializers.ModelSerializer):
     class Meta:
@@ -262,8 +238,7 @@ class BudgetSerializer(serializers.ModelSerializer):
         #2) 파견 통화 가져오기 
         profile = getattr(obj.user, "exchange_profile", None)
 
-        country_name = profile.exchange_country
-        target_currency = COUNTRY_TO_CURRENCY.get(country_name)
+        target_currency = resolve_currency(profile)
         converted = convert_from_krw(total_krw, target_currency)
 
         return{
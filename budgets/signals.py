@@ -0,0 +1,28 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from dongleDongle.cache import bump_user_version
+
+from .models import BaseBudget, BaseBudgetItem, Budget, LivingBudget, LivingBudgetItem
+
+
+def _budget_user_id(**lookup):
+    return Budget.objects.filter(**lookup).values_list("user_id", flat=True).first()
+
+
+# 예산안이 바뀌면 해당 유저의 응답 캐시(예산안 조회, 카테고리별 조회, 가계부 요약본) 무효화
+# Budget 자체는 조회(get_total_budget) 때마다 저장되므로 제외, 총액은 아래 항목들로부터 계산됨
+@receiver([post_save, post_delete], sender=BaseBudget)
+@receiver([post_save, post_delete], sender=LivingBudget)
+def invalidate_user_cache_on_budget_change(sender, instance, **kwargs):
+    bump_user_version(_budget_user_id(id=instance.budget_id))
+
+
+@receiver([post_save, post_delete], sender=BaseBudgetItem)
+def invalidate_user_cache_on_base_item_change(sender, instance, **kwargs):
+    bump_user_version(_budget_user_id(base_budget__id=instance.base_budget_id))
+
+
+@receiver([post_save, post_delete], sender=LivingBudgetItem)
+def invalidate_user_cache_on_living_item_change(sender, instance, **kwargs):
+    bump_user_version(_budget_user_id(living_budget__id=instance.living_budget_id))
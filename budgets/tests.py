@@ -1,3 +1,9 @@
 from django.test import TestCase
+from django.urls import reverse
 
-# Create your tests here.
+from dongleDongle.testing import QueryBudgetMixin
+
+
+class BudgetQueryBudgetTest(QueryBudgetMixin, TestCase):
+    def test_budget_view(self):
+        self.assertQueryBudget("budgets:budget-view", reverse("budgets:budget-view"))
@@ -8,6 +8,8 @@ from django.conf import settings
 from rest_framework import status
 from django.db import connection
 from accounts.models import ExchangeProfile
+from rates.utils import resolve_currency
+from dongleDongle.cache import cache_user_response
 
 # Create your views here.
 """
@@ -24,6 +26,7 @@ class BudgetView(APIView):
     permission_classes = [permissions.IsAuthenticated]
 
     #조회
+    @cache_user_response("budgets:budget-view")
     def get(self, request):
         budget, _ = Budget.objects.get_or_create(user=request.user)
 
@@ -211,7 +214,7 @@ def get_total_avg_cost(user):
     min_krw, max_krw = row
 
     # 환산 통화 계산
-    target_currency = COUNTRY_TO_CURRENCY.get(country)
+    target_currency = resolve_currency(profile)
 
     min_converted = convert_from_krw(min_krw, target_currency)
     max_converted = convert_from_krw(max_krw, target_currency)
@@ -0,0 +1,7 @@
+from django.apps import AppConfig
+
+
+# 특정 앱에 속하지 않는 프로젝트 공통 관리 커맨드 (데이터 생성/벤치마크/쿼리 실행 계획)
+class CoreConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'core'
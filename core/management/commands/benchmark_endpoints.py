@@ -0,0 +1,193 @@
+import json
+import math
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.test import Client
+from django.test.utils import CaptureQueriesContext, setup_test_environment, teardown_test_environment
+from django.urls import URLPattern, URLResolver, get_resolver
+
+from accounts.models import User
+from ledgers.models import LedgerEntry
+from summaries.models import SummarySnapshot
+
+
+# 측정하지 않는 URL 네임스페이스/경로
+SKIP_PREFIXES = ("admin/", "media/", "static/")
+
+# URL 이름별로 붙여서 측정할 쿼리스트링 (여러 개면 각각 따로 측정)
+QUERY_VARIANTS = {
+    "rates:convert-currency": ["from=USD&to=KRW&amount=10", "from=JPY&to=EUR&amount=1000"],
+    "ledgers:ledger_by_date": ["", "months=3"],
+    "ledgers:ledger_export": ["type=csv"],
+    "feeds:feed_list": ["", "sort=popular"],
+    "accounts:university_list": ["search=대"],
+    "accounts:exchange_university_list": ["search=University"],
+}
+
+
+def percentile(values, percent):
+    ordered = sorted(values)
+    index = max(math.ceil(percent / 100 * len(ordered)) - 1, 0)
+    return ordered[index]
+
+
+# urlpatterns 를 따라가며 (경로, URL 이름, 뷰 클래스) 목록 만들기
+def iter_routes(patterns=None, prefix="", namespace=None):
+    if patterns is None:
+        patterns = get_resolver().url_patterns
+    for pattern in patterns:
+        route = prefix + str(pattern.pattern)
+        if isinstance(pattern, URLResolver):
+            child_namespace = pattern.namespace or namespace
+            if pattern.namespace and namespace:
+                child_namespace = f"{namespace}:{pattern.namespace}"
+            yield from iter_routes(pattern.url_patterns, route, child_namespace)
+        elif isinstance(pattern, URLPattern):
+            name = pattern.name
+            if name and namespace:
+                name = f"{namespace}:{name}"
+            yield route, name, getattr(pattern.callback, "view_class", None)
+
+
+class Command(BaseCommand):
+    help = (
+        "dongleDongle/urls.py 의 모든 GET 엔드포인트를 테스트 클라이언트로 반복 호출해서 "
+        "p50/p95 응답 시간과 쿼리 수를 출력합니다. "
+        "DB 는 현재 settings 를 따르므로 SQLite(dongleDongle.settings.bench)나 로컬 MySQL 컨테이너(dev)로 실행합니다."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--user", default="bench0001", help="로그인할 유저(username), generate_synthetic_data 의 첫 유저가 기본값")
+        parser.add_argument("--repeat", type=int, default=20, help="엔드포인트별 측정 횟수 (워밍업 1회 별도)")
+        parser.add_argument("--only", help="이 문자열이 경로나 URL 이름에 포함된 엔드포인트만 측정")
+        parser.add_argument("--output", help="결과를 JSON 파일로 저장")
+        parser.add_argument("--baseline", help="이전에 --output 으로 저장한 결과와 비교해서 변화량 출력")
+
+    def handle(self, *args, **options):
+        user = User.objects.filter(username=options["user"]).first()
+        if user is None:
+            raise CommandError(
+                f"유저를 찾을 수 없습니다: {options['user']} (먼저 generate_synthetic_data 로 데이터를 만드세요)"
+            )
+        if options["repeat"] <= 0:
+            raise CommandError("--repeat 는 1 이상이어야 합니다.")
+
+        baseline = {}
+        if options["baseline"]:
+            with open(options["baseline"], encoding="utf-8") as f:
+                baseline = {row["url"]: row for row in json.load(f)}
+
+        # 테스트 클라이언트의 testserver 호스트 허용 등 테스트 환경 설정
+        setup_test_environment()
+        try:
+            client = Client(raise_request_exception=False)
+            client.force_login(user)
+            results = [
+                self._measure(client, url, name, options["repeat"])
+                for url, name in self._targets(user, options["only"])
+            ]
+        finally:
+            teardown_test_environment()
+
+        self._print(results, baseline)
+        if options["output"]:
+            with open(options["output"], "w", encoding="utf-8") as f:
+                json.dump(results, f, ensure_ascii=False, indent=2)
+            self.stdout.write(f"결과 저장: {options['output']}")
+
+    #1) 측정할 URL 목록 (GET 이 없는 뷰는 건너뜀, 경로 변수는 샘플 데이터로 채움)
+    def _targets(self, user, only):
+        samples = {
+            "feed_id": self._sample_snapshot_id(user),
+            "snapshot_id": self._sample_snapshot_id(user),
+            "ledger_id": LedgerEntry.objects.filter(user=user).values_list("id", flat=True).first(),
+        }
+
+        targets, seen, skipped = [], set(), []
+        for route, name, view_class in iter_routes():
+            if route.startswith(SKIP_PREFIXES) or route in seen:
+                continue
+            seen.add(route)
+            if view_class is None or not hasattr(view_class, "get"):
+                skipped.append(route)
+                continue
+
+            path = "/" + route
+            missing = False
+            for key, value in samples.items():
+                marker = f"<int:{key}>"
+                if marker in path:
+                    if value is None:
+                        missing = True
+                    path = path.replace(marker, str(value))
+            if missing or "<" in path:
+                skipped.append(route)
+                continue
+
+            for query in QUERY_VARIANTS.get(name, [""]):
+                url = f"{path}?{query}" if query else path
+                if only and only not in url and only not in (name or ""):
+                    continue
+                targets.append((url, name))
+
+        if skipped:
+            self.stdout.write(f"GET 이 없거나 샘플 데이터가 없어 건너뜀: {', '.join(skipped)}")
+        return targets
+
+    def _sample_snapshot_id(self, user):
+        return (
+            SummarySnapshot.objects
+            .filter(is_latest=True)
+            .exclude(user=user)
+            .order_by("-like_count", "id")
+            .values_list("id", flat=True)
+            .first()
+        )
+
+    #2) 워밍업 1회 후 repeat 회 측정 (응답 본문은 스트리밍까지 끝까지 읽음)
+    def _measure(self, client, url, name, repeat):
+        self._request(client, url)
+
+        timings, queries, status_code, size = [], [], None, 0
+        for _ in range(repeat):
+            with CaptureQueriesContext(connections["default"]) as captured:
+                started = time.perf_counter()
+                status_code, size = self._request(client, url)
+                timings.append((time.perf_counter() - started) * 1000)
+            queries.append(len(captured))
+
+        return {
+            "url": url,
+            "name": name,
+            "status": status_code,
+            "p50_ms": round(percentile(timings, 50), 2),
+            "p95_ms": round(percentile(timings, 95), 2),
+            "queries": max(queries),
+            "bytes": size,
+        }
+
+    def _request(self, client, url):
+        response = client.get(url)
+        if response.streaming:
+            body = b"".join(response.streaming_content)
+        else:
+            body = response.content
+        return response.status_code, len(body)
+
+    #3) 표 출력 (baseline 이 있으면 p95/쿼리 수 변화량도 같이)
+    def _print(self, results, baseline):
+        width = max([len(row["url"]) for row in results] + [10])
+        self.stdout.write(f"{'URL':<{width}}  상태    p50(ms)    p95(ms)  쿼리      bytes")
+        for row in results:
+            line = (
+                f"{row['url']:<{width}}  {row['status']:>4}  {row['p50_ms']:>9.2f}  {row['p95_ms']:>9.2f}"
+                f"  {row['queries']:>4}  {row['bytes']:>9}"
+            )
+            before = baseline.get(row["url"])
+            if before:
+                line += f"  (p95 {row['p95_ms'] - before['p95_ms']:+.2f}ms, 쿼리 {row['queries'] - before['queries']:+d})"
+            if row["status"] >= 500 or (before and row["queries"] > before["queries"]):
+                line = self.style.WARNING(line)
+            self.stdout.write(line)
@@ -0,0 +1,100 @@
+import random
+import time
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from accounts.models import User
+from ledgers.models import LedgerEntry, LedgerMonthlyRollup
+
+
+LIVING_CATEGORIES = ["FOOD", "HOUSING", "TRANSPORT", "SHOPPING", "TRAVEL", "STUDY_MATERIALS"]
+
+
+class Command(BaseCommand):
+    help = (
+        "LedgerEntry 주요 조회(월 범위 / 전체 내역 / 생활비 카테고리)의 실행 계획(EXPLAIN)과 소요 시간을 출력합니다. "
+        "--entries 를 주면 해당 유저에게 가짜 내역을 넣고 측정한 뒤 롤백합니다."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--user", required=True, help="측정할 유저(username)")
+        parser.add_argument("--entries", type=int, default=0, help="측정 전에 추가할 가짜 내역 수 (예: 100000)")
+        parser.add_argument("--years", type=int, default=5, help="가짜 내역 날짜 범위(년)")
+        parser.add_argument("--repeat", type=int, default=5, help="쿼리별 반복 횟수 (최솟값 출력)")
+        parser.add_argument("--keep", action="store_true", help="가짜 내역을 롤백하지 않고 남김")
+
+    def handle(self, *args, **options):
+        user = User.objects.filter(username=options["user"]).first()
+        if user is None:
+            raise CommandError(f"유저를 찾을 수 없습니다: {options['user']}")
+
+        with transaction.atomic():
+            if options["entries"]:
+                self._seed(user, options["entries"], options["years"])
+
+            for label, qs in self._queries(user):
+                self._report(label, qs, options["repeat"])
+
+            if not options["keep"]:
+                transaction.set_rollback(True)
+
+    # 1) 가짜 내역 생성 (bulk_create 는 시그널이 없으므로 --keep 으로 남겨도 맞도록 월별 집계는 직접 반영)
+    def _seed(self, user, count, years):
+        today = date.today()
+        days = 365 * years
+        entries = []
+        for _ in range(count):
+            entry_type = random.choice(["EXPENSE", "EXPENSE", "EXPENSE", "INCOME"])
+            entries.append(
+                LedgerEntry(
+                    user=user,
+                    entry_type=entry_type,
+                    date=today - timedelta(days=random.randint(0, days)),
+                    payment_method="CARD" if entry_type == "EXPENSE" else None,
+                    category=random.choice(LedgerEntry.Category.values),
+                    amount=Decimal(random.randint(1, 100000)) / 100,
+                    currency_code=random.choice(["KRW", "USD", "JPY", "EUR"]),
+                )
+            )
+        LedgerEntry.objects.bulk_create(entries, batch_size=2000)
+        LedgerMonthlyRollup.apply_many(entries)
+        self.stdout.write(f"가짜 내역 {count}건 추가")
+
+    # 2) 측정 대상 쿼리 (뷰에서 쓰는 조건/정렬 그대로)
+    def _queries(self, user):
+        today = date.today()
+        month_start = today.replace(day=1)
+        next_month = (month_start + timedelta(days=32)).replace(day=1)
+
+        yield "월 범위 조회", (
+            LedgerEntry.objects
+            .filter(user=user, date__gte=month_start, date__lt=next_month)
+            .order_by("-date", "-created_at")
+        )
+        yield "전체 내역 조회", (
+            LedgerEntry.objects
+            .filter(user=user)
+            .order_by("-date", "-created_at")
+        )
+        yield "생활비 카테고리 지출", (
+            LedgerEntry.objects
+            .filter(user=user, entry_type="EXPENSE", category__in=LIVING_CATEGORIES)
+        )
+
+    #3) EXPLAIN + 최소 소요 시간
+    def _report(self, label, qs, repeat):
+        self.stdout.write(self.style.MIGRATE_HEADING(f"[{label}]"))
+        self.stdout.write(qs.explain())
+
+        best = None
+        rows = 0
+        for _ in range(max(repeat, 1)):
+            started = time.perf_counter()
+            rows = len(list(qs.values_list("id", flat=True)))
+            elapsed = time.perf_counter() - started
+            best = elapsed if best is None else min(best, elapsed)
+
+        self.stdout.write(f"{rows}건, {best * 1000:.1f}ms (최소 / {repeat}회)\n")
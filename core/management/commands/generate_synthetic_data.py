@@ -0,0 +1,291 @@
+import random
+import time
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import Count
+
+from accounts.context import UserContext
+from accounts.models import CountryOption, ExchangeProfile, ExchangeUniversity, University, User
+from budgets.models import BaseBudget, BaseBudgetItem, Budget, LivingBudget, LivingBudgetItem
+from feeds.models import FeedFavorite, FeedScrap
+from ledgers.models import LedgerEntry, LedgerMonthlyRollup
+from ledgers.serializers import LedgerEntryCreateSerializer
+from rates.management.commands.update_exchange_rates import upsert_rates
+from rates.models import ExchangeRate
+from rates.utils import currency_for_country, rate_table
+from rates.views import convert_to_krw
+from summaries.models import DetailProfile, SummarySnapshot
+from summaries.views import DetailProfileView
+
+
+# 환율이 하나도 없을 때만 넣는 기본 환율 (1 KRW 기준)
+DEFAULT_RATES = {
+    "KRW": Decimal("1"),
+    "USD": Decimal("0.000720"),
+    "JPY": Decimal("0.108000"),
+    "EUR": Decimal("0.000650"),
+    "CNY": Decimal("0.005200"),
+    "TWD": Decimal("0.023000"),
+    "GBP": Decimal("0.000560"),
+    "CAD": Decimal("0.001000"),
+}
+
+# 기본 파견비 항목별 금액 범위 (KRW)
+BASE_ITEM_RANGES = {
+    "FLIGHT": (800000, 2000000),
+    "INSURANCE": (100000, 400000),
+    "VISA": (0, 300000),
+    "TUITION": (0, 5000000),
+}
+
+LIVING_ITEM_TYPES = ["FOOD", "HOUSING", "TRANSPORT", "SHOPPING", "TRAVEL", "STUDY_MATERIALS"]
+SEMESTERS = ["2024-2", "2025-1", "2025-2"]
+BENCH_PASSWORD = "bench1234!"
+
+
+# "LOCAL=60,KRW=30,USD=10" -> [("LOCAL", 60), ("KRW", 30), ("USD", 10)]
+# LOCAL 은 유저 파견국 통화
+def parse_currency_mix(value):
+    mix = []
+    for part in value.split(","):
+        code, _, weight = part.strip().partition("=")
+        try:
+            mix.append((code.strip().upper(), int(weight or 1)))
+        except ValueError:
+            raise CommandError(f"--currencies 형식이 잘못되었습니다: {part}")
+    if not mix or sum(weight for _, weight in mix) <= 0:
+        raise CommandError("--currencies 에 비중이 0보다 큰 통화가 하나 이상 있어야 합니다.")
+    return mix
+
+
+class Command(BaseCommand):
+    help = (
+        "벤치마크/테스트용 가짜 데이터를 만듭니다. "
+        "유저, 파견 프로필, 예산안, 가계부 내역, 요약본 스냅샷, 좋아요/스크랩까지 한 번에 생성하며 "
+        "--seed 가 같으면 같은 데이터가 만들어집니다."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=50, help="만들 유저 수")
+        parser.add_argument("--entries", type=int, default=200, help="유저당 가계부 내역 수")
+        parser.add_argument("--months", type=int, default=6, help="가계부 날짜 범위(오늘부터 몇 개월 전까지)")
+        parser.add_argument(
+            "--currencies",
+            default="LOCAL=60,KRW=30,USD=10",
+            help="가계부 통화 비중 (LOCAL=파견국 통화), 예: LOCAL=60,KRW=30,USD=10",
+        )
+        parser.add_argument("--likes", type=int, default=10, help="유저당 좋아요 수")
+        parser.add_argument("--scraps", type=int, default=3, help="유저당 스크랩 수")
+        parser.add_argument("--prefix", default="bench", help="생성할 유저 username/nickname 접두어")
+        parser.add_argument("--seed", type=int, default=42, help="난수 시드")
+        parser.add_argument("--clear", action="store_true", help="같은 접두어로 만든 기존 유저를 먼저 삭제")
+
+    def handle(self, *args, **options):
+        if options["users"] <= 0:
+            raise CommandError("--users 는 1 이상이어야 합니다.")
+        self.random = random.Random(options["seed"])
+        self.currency_mix = parse_currency_mix(options["currencies"])
+        prefix = options["prefix"]
+        started = time.perf_counter()
+
+        with transaction.atomic():
+            existing = User.objects.filter(username__startswith=prefix)
+            if options["clear"]:
+                deleted = existing.count()
+                existing.delete()
+                self.stdout.write(f"기존 유저 {deleted}명 삭제")
+            elif existing.exists():
+                raise CommandError(f"'{prefix}' 로 시작하는 유저가 이미 있습니다. --clear 또는 다른 --prefix 를 사용하세요.")
+
+            #1) 환율 (없을 때만)
+            if not ExchangeRate.objects.exists():
+                upsert_rates("KRW", DEFAULT_RATES)
+                self.stdout.write("환율이 없어 기본 환율을 넣었습니다.")
+            rate_table.invalidate()
+            rates = rate_table.rates()
+
+            users = self._create_users(prefix, options["users"])
+            self._create_budgets(users, rates)
+            entry_count = self._create_entries(users, options["entries"], options["months"], rates)
+            snapshots = self._create_snapshots(users)
+            reactions = self._create_reactions(users, snapshots, options["likes"], options["scraps"])
+
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(
+            f"유저 {len(users)}명, 가계부 {entry_count}건, 스냅샷 {len(snapshots)}개, "
+            f"좋아요/스크랩 {reactions}건 생성 완료 ({elapsed:.1f}s)"
+        ))
+        self.stdout.write(f"로그인: {prefix}0001 / {BENCH_PASSWORD}")
+
+    #2) 유저 + 본교/파견교 + 파견 프로필
+    def _create_users(self, prefix, count):
+        univ, _ = University.objects.get_or_create(univ_name=f"{prefix} 대학교")
+        exchange_univs = {}
+        for country in CountryOption:
+            exchange_univs[country.value], _ = ExchangeUniversity.objects.get_or_create(
+                univ_name=f"{prefix} {country.value} University",
+                defaults={"country": country.value, "city": country.label},
+            )
+
+        password = make_password(BENCH_PASSWORD)
+        User.objects.bulk_create(
+            User(
+                username=f"{prefix}{i:04d}",
+                nickname=f"{prefix}{i:04d}",
+                password=password,
+                gender=self.random.choice(User.Gender.values),
+                univ=univ,
+            )
+            for i in range(1, count + 1)
+        )
+        # MySQL 은 bulk_create 후 pk 가 채워지지 않으므로 다시 조회
+        users = list(User.objects.filter(username__startswith=prefix).order_by("username"))
+
+        profiles = []
+        for user in users:
+            country = self.random.choice(list(CountryOption))
+            profiles.append(ExchangeProfile(
+                user=user,
+                exchange_univ=exchange_univs[country.value],
+                exchange_country=country.label,
+                exchange_type=self.random.choice(ExchangeProfile.ExchangeType.values),
+                exchange_semester=self.random.choice(SEMESTERS),
+                exchange_period=f"{self.random.choice([4, 5, 6, 10, 12])}개월",
+            ))
+        ExchangeProfile.objects.bulk_create(profiles)
+        # bulk_create 로 만든 프로필을 유저에 연결 (이후 통화 계산에서 다시 조회하지 않도록)
+        for user, profile in zip(users, profiles):
+            user.exchange_profile = profile
+        return users
+
+    #3) 예산안 (기본 파견비 4항목 + 생활비 항목)
+    def _create_budgets(self, users, rates):
+        Budget.objects.bulk_create(Budget(user=user) for user in users)
+        budgets = {budget.user_id: budget for budget in Budget.objects.filter(user__in=users)}
+        BaseBudget.objects.bulk_create(BaseBudget(budget=budget) for budget in budgets.values())
+        LivingBudget.objects.bulk_create(
+            LivingBudget(budget=budget, total_amount=self.random.randint(80, 250) * 10000)
+            for budget in budgets.values()
+        )
+        base_budgets = {row.budget.user_id: row for row in BaseBudget.objects.filter(budget__in=budgets.values()).select_related("budget")}
+        living_budgets = {row.budget.user_id: row for row in LivingBudget.objects.filter(budget__in=budgets.values()).select_related("budget")}
+
+        base_items, living_items = [], []
+        for user in users:
+            local_currency = currency_for_country(user.exchange_profile.exchange_country)
+            base_budget = base_budgets[user.id]
+            total_krw = Decimal("0")
+            for item_type, (low, high) in BASE_ITEM_RANGES.items():
+                amount_krw = Decimal(self.random.randint(low, high))
+                currency = self.random.choice(["KRW", local_currency])
+                if currency == "KRW":
+                    amount, exchange_amount = amount_krw, amount_krw
+                else:
+                    # BaseBudgetItem.save() 와 같은 환산 (bulk_create 는 save 를 거치지 않음)
+                    amount = (amount_krw * rates.get(currency, Decimal("1"))).quantize(Decimal("0.01"))
+                    exchange_amount = convert_to_krw(amount, currency, rates)
+                base_items.append(BaseBudgetItem(
+                    base_budget=base_budget,
+                    type=item_type,
+                    amount=amount,
+                    currency=currency,
+                    exchange_amount=exchange_amount,
+                ))
+                total_krw += exchange_amount or 0
+            base_budget.total_amount_krw = total_krw
+
+            living_budget = living_budgets[user.id]
+            for item_type in self.random.sample(LIVING_ITEM_TYPES, 4):
+                living_items.append(LivingBudgetItem(
+                    living_budget=living_budget,
+                    type=item_type,
+                    amount=Decimal(self.random.randint(10, 80) * 10000),
+                ))
+
+        BaseBudgetItem.objects.bulk_create(base_items, batch_size=1000)
+        LivingBudgetItem.objects.bulk_create(living_items, batch_size=1000)
+        BaseBudget.objects.bulk_update(base_budgets.values(), ["total_amount_krw"], batch_size=500)
+
+    #4) 가계부 내역 (일괄 등록과 같은 build_entry 로 환산값까지 채움) + 월별 집계
+    def _create_entries(self, users, per_user, months, rates):
+        serializer = LedgerEntryCreateSerializer()
+        categories = LedgerEntry.Category.values
+        currencies, weights = zip(*self.currency_mix)
+        today = date.today()
+        span = max(months, 1) * 30
+
+        total = 0
+        for user in users:
+            local_currency = currency_for_country(user.exchange_profile.exchange_country)
+            entries = []
+            for _ in range(per_user):
+                entry_type = "INCOME" if self.random.random() < 0.15 else "EXPENSE"
+                currency = self.random.choices(currencies, weights)[0]
+                if currency == "LOCAL":
+                    currency = local_currency
+                data = {
+                    "entry_type": entry_type,
+                    "date": today - timedelta(days=self.random.randint(0, span)),
+                    "category": "ALLOWANCE" if entry_type == "INCOME" else self.random.choice(categories),
+                    "payment_method": None if entry_type == "INCOME" else self.random.choice(["CASH", "CARD"]),
+                    "amount": self._entry_amount(currency, rates),
+                    "currency_code": currency,
+                }
+                entries.append(serializer.build_entry(user, data, rates))
+
+            LedgerEntry.objects.bulk_create(entries, batch_size=1000)
+            LedgerMonthlyRollup.apply_many(entries)
+            total += len(entries)
+        return total
+
+    def _entry_amount(self, currency, rates):
+        amount_krw = Decimal(self.random.randint(3, 300) * 1000)
+        if currency == "KRW":
+            return amount_krw
+        return max((amount_krw * rates.get(currency, Decimal("1"))).quantize(Decimal("0.01")), Decimal("0.01"))
+
+    #5) 세부 프로필 + 요약본 스냅샷 (실제 게시와 같은 _create_snapshot 사용, 피드 비용 집계는 게시 시그널에서 생성)
+    def _create_snapshots(self, users):
+        view = DetailProfileView()
+        snapshots = []
+        for user in users:
+            detail_profile = DetailProfile.objects.create(
+                user=user,
+                monthly_spend_in_korea=self.random.randint(50, 200) * 10000,
+                meal_frequency=self.random.choice(DetailProfile.MealFrequency.values),
+                dineout_per_week=self.random.randint(0, 7),
+                coffee_per_week=self.random.randint(0, 14),
+                commute=self.random.random() < 0.5,
+            )
+            snapshots.append(view._create_snapshot(UserContext(user), detail_profile))
+        return snapshots
+
+    #6) 좋아요/스크랩 + 스냅샷 카운트 맞추기
+    def _create_reactions(self, users, snapshots, likes, scraps):
+        favorites, scrap_rows = [], []
+        for user in users:
+            others = [snapshot for snapshot in snapshots if snapshot.user_id != user.id]
+            for snapshot in self.random.sample(others, min(likes, len(others))):
+                favorites.append(FeedFavorite(user=user, snapshot=snapshot))
+            for snapshot in self.random.sample(others, min(scraps, len(others))):
+                scrap_rows.append(FeedScrap(user=user, snapshot=snapshot))
+        FeedFavorite.objects.bulk_create(favorites, batch_size=1000)
+        FeedScrap.objects.bulk_create(scrap_rows, batch_size=1000)
+
+        counted = list(
+            SummarySnapshot.objects
+            .filter(id__in=[snapshot.id for snapshot in snapshots])
+            .annotate(
+                actual_likes=Count("favorited_by", distinct=True),
+                actual_scraps=Count("scrapped_by", distinct=True),
+            )
+        )
+        for snapshot in counted:
+            snapshot.like_count = snapshot.actual_likes
+            snapshot.scrap_count = snapshot.actual_scraps
+        SummarySnapshot.objects.bulk_update(counted, ["like_count", "scrap_count"], batch_size=500)
+        return len(favorites) + len(scrap_rows)
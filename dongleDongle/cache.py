@@ -0,0 +1,118 @@
+import hashlib
+import time
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from rest_framework.response import Response
+
+
+# 버전 범위: 유저별 데이터 / 피드 목록 / 환율
+FEEDS_SCOPE = "feeds"
+RATES_SCOPE = "rates"
+
+
+def user_scope(user_id):
+    return f"user:{user_id}"
+
+
+def _version_key(scope):
+    return f"cache-version:{scope}"
+
+
+def _new_version():
+    # 버전 키가 캐시에서 밀려나도 예전 값으로 돌아가지 않도록 시각 기반 초기값 사용
+    return time.time_ns()
+
+
+"""
+    # 범위별 캐시 버전 조회
+    - 응답 캐시 키에 버전을 넣어 두고, 데이터가 바뀌면 버전만 올려서 이전 키를 전부 무효화
+    - 여러 범위를 get_many 한 번으로 조회
+"""
+def get_versions(scopes):
+    keys = {scope: _version_key(scope) for scope in scopes}
+    found = cache.get_many(list(keys.values()))
+
+    versions = {}
+    for scope, key in keys.items():
+        version = found.get(key)
+        if version is None:
+            cache.add(key, _new_version(), timeout=None)
+            version = cache.get(key)
+        versions[scope] = version
+    return versions
+
+
+# 커밋 후 버전 올리기 (커밋 전에 올리면 다른 요청이 이전 데이터를 새 버전으로 캐시할 수 있음)
+def bump_versions(*scopes):
+    def bump():
+        for scope in scopes:
+            key = _version_key(scope)
+            try:
+                cache.incr(key)
+            except ValueError:
+                cache.add(key, _new_version(), timeout=None)
+
+    transaction.on_commit(bump)
+
+
+def bump_user_version(user_id):
+    if user_id:
+        bump_versions(user_scope(user_id))
+
+
+# 범위별로 "이 프로세스가 실제로 쓰고 있는 데이터의 버전"을 돌려주는 함수 (예: 환율 테이블이 로드한 RATES_SCOPE 버전)
+# 등록된 범위는 공유 캐시의 최신 버전 대신 이 값으로 키를 만듦
+# -> 아직 예전 데이터를 들고 있는 프로세스가 예전 값을 새 버전 키로 저장하지 않도록
+_loaded_version_sources = {}
+
+
+def register_loaded_version(scope, source):
+    _loaded_version_sources[scope] = source
+
+
+def make_cache_key(name, scopes, *parts):
+    versions = get_versions([scope for scope in scopes if scope not in _loaded_version_sources])
+    for scope in scopes:
+        if scope in _loaded_version_sources:
+            versions[scope] = _loaded_version_sources[scope]()
+    raw = "|".join([str(part) for part in parts] + [f"{scope}={versions[scope]}" for scope in scopes])
+    # memcached 키 제한(길이/공백) 때문에 경로·쿼리스트링은 해시로
+    return f"response:{name}:{hashlib.sha1(raw.encode()).hexdigest()}"
+
+
+def get_response_cache_timeout():
+    return getattr(settings, "RESPONSE_CACHE_TIMEOUT", 300)
+
+
+"""
+    # 유저별 GET 응답 캐시 (APIView.get 데코레이터)
+    - 키: URL 이름 + 유저 + 전체 경로(쿼리스트링 포함) + (유저/환율 등) 버전
+    - 200 응답의 data 만 저장, RESPONSE_CACHE_TIMEOUT=0 이면 캐시하지 않음
+"""
+def cache_user_response(name, scopes=(RATES_SCOPE,)):
+    def decorator(method):
+        @wraps(method)
+        def wrapper(self, request, *args, **kwargs):
+            timeout = get_response_cache_timeout()
+            if not timeout:
+                return method(self, request, *args, **kwargs)
+
+            key = make_cache_key(
+                name,
+                [*scopes, user_scope(request.user.pk)],
+                request.user.pk,
+                request.get_full_path(),
+            )
+            data = cache.get(key)
+            if data is not None:
+                return Response(data)
+
+            response = method(self, request, *args, **kwargs)
+            if response.status_code == 200:
+                cache.set(key, response.data, timeout)
+            return response
+        return wrapper
+    return decorator
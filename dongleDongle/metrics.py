@@ -0,0 +1,169 @@
+import logging
+import threading
+import time
+from collections import Counter
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+
+logger = logging.getLogger("dongleDongle.metrics")
+
+
+"""
+    # 요청 단위 쿼리/시간 수집기
+    - connection.execute_wrapper 로 모든 DB 연결의 쿼리를 가로채서 개수/소요 시간/SQL 별 횟수 기록
+    - DEBUG 와 상관없이 동작 (connection.queries 를 쓰지 않음)
+    - SQL 은 파라미터가 빠진 원문(%s)으로 세므로 같은 쿼리를 행마다 반복하면(N+1) 한 줄로 모임
+"""
+class QueryRecorder:
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.statements = Counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - started
+            self.count += 1
+            self.statements[sql] += 1
+
+    def duplicates(self):
+        return [(sql, count) for sql, count in self.statements.most_common() if count > 1]
+
+
+"""
+    # URL 이름별 누적 통계 (프로세스 단위)
+    - 워커마다 따로 쌓이므로 /metrics/ 는 해당 워커의 값만 보여줌
+"""
+class EndpointMetrics:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._data = {}
+
+    def add(self, name, queries, db_ms, wall_ms, size):
+        with self._lock:
+            row = self._data.get(name)
+            if row is None:
+                row = self._data[name] = {
+                    "requests": 0,
+                    "queries": 0,
+                    "max_queries": 0,
+                    "db_ms": 0.0,
+                    "wall_ms": 0.0,
+                    "max_wall_ms": 0.0,
+                    "bytes": 0,
+                }
+            row["requests"] += 1
+            row["queries"] += queries
+            row["max_queries"] = max(row["max_queries"], queries)
+            row["db_ms"] += db_ms
+            row["wall_ms"] += wall_ms
+            row["max_wall_ms"] = max(row["max_wall_ms"], wall_ms)
+            row["bytes"] += size or 0
+
+    def snapshot(self):
+        with self._lock:
+            rows = {name: dict(row) for name, row in self._data.items()}
+
+        result = []
+        for name, row in sorted(rows.items()):
+            requests = row["requests"]
+            result.append({
+                "url_name": name,
+                "requests": requests,
+                "avg_queries": round(row["queries"] / requests, 2),
+                "max_queries": row["max_queries"],
+                "avg_db_ms": round(row["db_ms"] / requests, 2),
+                "avg_wall_ms": round(row["wall_ms"] / requests, 2),
+                "max_wall_ms": round(row["max_wall_ms"], 2),
+                "avg_bytes": row["bytes"] // requests,
+            })
+        return result
+
+    def reset(self):
+        with self._lock:
+            self._data.clear()
+
+
+endpoint_metrics = EndpointMetrics()
+
+
+def _url_name(request):
+    match = getattr(request, "resolver_match", None)
+    if match is None:
+        return "<unresolved>"
+    return match.view_name or match._func_path
+
+
+# 스트리밍 응답(ledgers/export/)은 크기를 알 수 없고, 본문을 보내면서 실행되는 쿼리도 집계되지 않음
+def _response_size(response):
+    if response.streaming:
+        return None
+    return len(response.content)
+
+
+"""
+    # 요청별 쿼리 수 / DB 시간 / 전체 시간 / 응답 크기 측정 미들웨어
+    1) Server-Timing 헤더로 내려줌 (브라우저 개발자도구 Timing 탭에서 확인)
+    2) URL 이름별로 누적 -> /metrics/ (관리자만)
+    3) 쿼리 수가 QUERY_COUNT_THRESHOLD 를 넘으면 반복된 SQL 을 경고 로그로 남김
+"""
+class QueryMetricsMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.enabled = getattr(settings, "QUERY_METRICS_ENABLED", True)
+        self.threshold = getattr(settings, "QUERY_COUNT_THRESHOLD", 30)
+
+    def __call__(self, request):
+        if not self.enabled:
+            return self.get_response(request)
+
+        recorder = QueryRecorder()
+        started = time.perf_counter()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(recorder))
+            response = self.get_response(request)
+        wall_ms = (time.perf_counter() - started) * 1000
+        db_ms = recorder.duration * 1000
+        size = _response_size(response)
+        name = _url_name(request)
+
+        response["Server-Timing"] = ", ".join([
+            f'db;dur={db_ms:.1f};desc="{recorder.count} queries"',
+            f"app;dur={wall_ms - db_ms:.1f}",
+            f"total;dur={wall_ms:.1f}",
+        ])
+
+        endpoint_metrics.add(name, recorder.count, db_ms, wall_ms, size)
+        logger.info(
+            "%s %s %s queries=%d db=%.1fms wall=%.1fms bytes=%s",
+            request.method, name, response.status_code, recorder.count, db_ms, wall_ms,
+            "-" if size is None else size,
+        )
+
+        if self.threshold and recorder.count > self.threshold:
+            duplicates = recorder.duplicates()
+            lines = [f"{request.method} {request.path} 쿼리 {recorder.count}개 (기준 {self.threshold}개 초과), 반복된 SQL {len(duplicates)}종"]
+            lines += [f"  x{count} {sql}" for sql, count in duplicates[:10]]
+            logger.warning("\n".join(lines))
+        return response
+
+
+# URL 이름별 누적 통계 조회 (관리자), ?reset=1 이면 조회 후 초기화
+class MetricsView(APIView):
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        data = endpoint_metrics.snapshot()
+        if request.query_params.get("reset") == "1":
+            endpoint_metrics.reset()
+        return Response({"message": "요청 통계 조회 성공", "data": data})
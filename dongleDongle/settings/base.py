@@ -60,6 +60,7 @@ INSTALLED_APPS = [
     'budgets',
     'feeds',
     'summaries',
+    'core',
 ]
 
 SITE_ID = 1
@@ -82,6 +83,8 @@ SIMPLE_JWT = {
 }
 
 MIDDLEWARE = [
+    # 요청별 쿼리 수/DB 시간 측정 (가장 바깥에서 전체 처리 시간 측정)
+    'dongleDongle.metrics.QueryMetricsMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -188,3 +191,49 @@ MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
+
+
+# 환율 API (update_exchange_rates 커맨드), 테스트/로컬에서는 환경변수로 다른 주소 지정 가능
+EXCHANGE_API_URL = env('EXCHANGE_API_URL', default='https://open.er-api.com/v6/latest/KRW')
+# 환율 갱신 주기(초) - exchange-updater 의 --interval, rates/convert/ 의 Cache-Control max-age 기준
+EXCHANGE_UPDATE_INTERVAL = env.int('EXCHANGE_UPDATE_INTERVAL', default=3600)
+
+# 캐시 - 기본은 프로세스 메모리(워커마다 따로), 여러 워커가 공유하려면 CACHE_URL 지정
+#   Redis:     CACHE_URL=redis://redis:6379/1       (redis 패키지 필요)
+#   Memcached: CACHE_URL=pymemcache://memcached:11211 (pymemcache 패키지 필요)
+CACHES = {
+    'default': env.cache('CACHE_URL', default='locmemcache://dongledongle'),
+}
+if env('CACHE_URL', default='').startswith('pymemcache://'):
+    # django-environ 0.11 은 pymemcache:// 를 PyLibMCCache 로 연결하므로 직접 지정
+    CACHES['default']['BACKEND'] = 'django.core.cache.backends.memcached.PyMemcacheCache'
+
+# 조회 응답 캐시 유지 시간(초), 0이면 응답 캐시 끔 (dongleDongle.cache)
+# 캐시 무효화(버전 올리기)는 다른 프로세스(웹 워커, exchange-updater 컨테이너)에서도 보여야 하므로
+# 공유 캐시(CACHE_URL 의 Redis/Memcached)가 없으면 기본값 0 (프로세스 메모리 캐시는 환율 갱신이 워커에 전달되지 않음)
+SHARED_CACHE = CACHES['default']['BACKEND'] not in (
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+)
+RESPONSE_CACHE_TIMEOUT = env.int('RESPONSE_CACHE_TIMEOUT', default=300 if SHARED_CACHE else 0)
+
+# 요청별 쿼리 수/DB 시간 측정 (dongleDongle.metrics.QueryMetricsMiddleware)
+QUERY_METRICS_ENABLED = env.bool('QUERY_METRICS_ENABLED', default=True)
+# 한 요청의 쿼리 수가 이 값을 넘으면 반복된 SQL 을 경고 로그로 남김 (0이면 끔)
+QUERY_COUNT_THRESHOLD = env.int('QUERY_COUNT_THRESHOLD', default=30)
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler'},
+    },
+    'loggers': {
+        # 요청마다 INFO 한 줄, 쿼리 수 초과 시 WARNING
+        'dongleDongle.metrics': {
+            'handlers': ['console'],
+            'level': env('QUERY_METRICS_LOG_LEVEL', default='WARNING'),
+            'propagate': False,
+        },
+    },
+}
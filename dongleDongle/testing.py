@@ -0,0 +1,96 @@
+import json
+import os
+from io import StringIO
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from accounts.models import User
+from feeds.models import FeedFavorite, FeedScrap
+from ledgers.models import LedgerEntry, LedgerMonthlyRollup
+from rates.utils import rate_table
+from summaries.models import SummarySnapshot
+
+
+QUERY_BUDGET_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "query_budgets.json")
+
+
+# URL 이름별 쿼리 수 상한 (query_budgets.json)
+def load_query_budgets():
+    with open(QUERY_BUDGET_FILE, encoding="utf-8") as f:
+        return json.load(f)
+
+
+"""
+    # 엔드포인트별 쿼리 수 회귀 테스트 공통 부분
+    - generate_synthetic_data (core 앱 커맨드)로 작은 데이터셋을 만들고 측정 -> 행을 크게 늘린 뒤 다시 측정
+    - 두 번 모두 query_budgets.json 의 상한 이하 + 두 값이 같아야 통과 (행마다 쿼리가 생기면 실패)
+    - 측정 전마다 환율 테이블과 응답 캐시를 비워서 항상 같은 조건(환율 로드, 캐시 미스)으로 측정
+"""
+class QueryBudgetMixin:
+    dataset_prefix = "qa"
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        call_command(
+            "generate_synthetic_data",
+            users=4, entries=20, likes=2, scraps=2,
+            prefix=cls.dataset_prefix, seed=1, stdout=StringIO(),
+        )
+        cls.user = User.objects.get(username=f"{cls.dataset_prefix}0001")
+
+    def setUp(self):
+        super().setUp()
+        rate_table.invalidate()
+        self.client.force_login(self.user)
+
+    def count_queries(self, url):
+        rate_table.invalidate()
+        cache.clear()
+        with CaptureQueriesContext(connection) as captured:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200, response.content[:500])
+        return len(captured)
+
+    # 다른 유저/피드를 늘리고, 측정 유저의 가계부 내역과 좋아요/스크랩도 늘림
+    def grow_dataset(self):
+        call_command(
+            "generate_synthetic_data",
+            users=12, entries=60, likes=8, scraps=6,
+            prefix=f"{self.dataset_prefix}grow", seed=2, stdout=StringIO(),
+        )
+
+        entries = list(LedgerEntry.objects.filter(user=self.user))
+        copies = []
+        for _ in range(3):
+            for entry in entries:
+                copies.append(LedgerEntry(**{
+                    field.attname: getattr(entry, field.attname)
+                    for field in LedgerEntry._meta.concrete_fields
+                    if not field.primary_key
+                }))
+        LedgerEntry.objects.bulk_create(copies)
+        LedgerMonthlyRollup.apply_many(copies)
+
+        snapshots = SummarySnapshot.objects.filter(is_latest=True).exclude(user=self.user)
+        FeedFavorite.objects.bulk_create(
+            [FeedFavorite(user=self.user, snapshot=snapshot) for snapshot in snapshots],
+            ignore_conflicts=True,
+        )
+        FeedScrap.objects.bulk_create(
+            [FeedScrap(user=self.user, snapshot=snapshot) for snapshot in snapshots],
+            ignore_conflicts=True,
+        )
+
+    def assertQueryBudget(self, name, url):
+        budget = load_query_budgets()[name]
+        small = self.count_queries(url)
+        self.grow_dataset()
+        large = self.count_queries(url)
+
+        self.assertLessEqual(small, budget, f"{name} 쿼리 {small}개 (상한 {budget}개)")
+        self.assertLessEqual(large, budget, f"{name} 데이터 증가 후 쿼리 {large}개 (상한 {budget}개)")
+        self.assertEqual(large, small, f"{name} 데이터가 늘어나자 쿼리 수가 {small}개 -> {large}개로 바뀜")
@@ -3,6 +3,8 @@ from django.urls import path, include
 from django.conf import settings
 from django.conf.urls.static import static
 
+from .metrics import MetricsView
+
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('accounts/', include('accounts.urls')),
@@ -11,4 +13,5 @@ urlpatterns = [
     path('budgets/', include('budgets.urls')),
     path('summaries/', include('summaries.urls')),
     path('feeds/', include('feeds.urls')),
+    path('metrics/', MetricsView.as_view(), name='metrics'),
 ] + static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
\ No newline at end of file
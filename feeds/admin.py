@@ -2,4 +2,5 @@ from django.contrib import admin
 from .models import *
 
 admin.site.register(FeedScrap)
-admin.site.register(FeedFavorite)
\ No newline at end of file
+admin.site.register(FeedFavorite)
+admin.site.register(FeedCostSummary)
@@ -0,0 +1,45 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Count, F, Q
+
+from dongleDongle.cache import FEEDS_SCOPE, bump_versions
+
+from summaries.models import SummarySnapshot
+
+
+class Command(BaseCommand):
+    help = "SummarySnapshot의 like_count / scrap_count 를 실제 좋아요/스크랩 수와 맞춥니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--dry-run", action="store_true", help="수정하지 않고 어긋난 스냅샷만 출력")
+
+    def handle(self, *args, **options):
+        drifted = (
+            SummarySnapshot.objects
+            .annotate(
+                actual_likes=Count("favorited_by", distinct=True),
+                actual_scraps=Count("scrapped_by", distinct=True),
+            )
+            .filter(~Q(like_count=F("actual_likes")) | ~Q(scrap_count=F("actual_scraps")))
+            .values_list("id", "like_count", "actual_likes", "scrap_count", "actual_scraps")
+        )
+
+        fixed = 0
+        for snapshot_id, like_count, actual_likes, scrap_count, actual_scraps in drifted:
+            self.stdout.write(
+                f"snapshot {snapshot_id}: 좋아요 {like_count} -> {actual_likes}, 스크랩 {scrap_count} -> {actual_scraps}"
+            )
+            if not options["dry_run"]:
+                SummarySnapshot.objects.filter(id=snapshot_id).update(
+                    like_count=actual_likes,
+                    scrap_count=actual_scraps,
+                )
+            fixed += 1
+
+        if fixed and not options["dry_run"]:
+            # update() 는 시그널이 없으므로 피드 목록 캐시를 직접 무효화
+            bump_versions(FEEDS_SCOPE)
+
+        if options["dry_run"]:
+            self.stdout.write(f"어긋난 스냅샷 {fixed}건 (dry-run)")
+        else:
+            self.stdout.write(self.style.SUCCESS(f"스냅샷 {fixed}건 보정 완료"))
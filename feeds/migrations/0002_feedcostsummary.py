@@ -0,0 +1,26 @@
+# Generated by Django 4.2.24 on 2026-10-18 18:46
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('feeds', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FeedCostSummary',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('ledger_amounts', models.JSONField(blank=True, default=dict, help_text='생활비 카테고리 지출 통화별 합계')),
+                ('base_budget_amounts', models.JSONField(blank=True, default=dict, help_text='기본 파견비 통화별 합계')),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='feed_cost_summary', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+    ]
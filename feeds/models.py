@@ -1,5 +1,14 @@
 from django.conf import settings
 from django.db import models
+from django.db.models import Sum
+
+from budgets.models import BaseBudgetItem
+from ledgers.models import LedgerEntry
+from summaries.models import SummarySnapshot
+
+
+# 피드 카드 비용 계산에 쓰는 생활비 카테고리
+LIVING_CATEGORIES = ["FOOD", "HOUSING", "TRANSPORT", "SHOPPING", "TRAVEL", "STUDY_MATERIALS"]
 
 class FeedScrap(models.Model):
     user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="scraps")
@@ -23,3 +32,56 @@ class FeedFavorite(models.Model):
 
     def __str__(self):
         return f"{self.user} → 좋아요 {self.snapshot.id}"
+
+
+# 피드 카드용 작성자별 비용 집계 ({통화: 합계} 형태로 저장)
+# LedgerEntry / BaseBudgetItem 이 바뀔 때 signals에서 갱신 (피드에 요약본을 게시한 유저만), 환산은 조회 시점 환율로
+class FeedCostSummary(models.Model):
+    user = models.OneToOneField(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="feed_cost_summary")
+    ledger_amounts = models.JSONField(default=dict, blank=True, help_text="생활비 카테고리 지출 통화별 합계")
+    base_budget_amounts = models.JSONField(default=dict, blank=True, help_text="기본 파견비 통화별 합계")
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.user_id} 피드 비용 집계"
+
+    # 합계가 그대로면 저장하지 않음 (저장 시 피드 목록 캐시 무효화)
+    @classmethod
+    def refresh(cls, user_id, ledger=True, base_budget=True):
+        summary, created = cls.objects.get_or_create(user_id=user_id)
+        before = (summary.ledger_amounts, summary.base_budget_amounts)
+        fields = ["updated_at"]
+
+        if ledger:
+            rows = (
+                LedgerEntry.objects
+                .filter(user_id=user_id, entry_type="EXPENSE", category__in=LIVING_CATEGORIES)
+                .values("currency_code")
+                .annotate(total=Sum("amount"))
+                .order_by()
+            )
+            summary.ledger_amounts = {row["currency_code"]: str(row["total"]) for row in rows}
+            fields.append("ledger_amounts")
+
+        if base_budget:
+            rows = (
+                BaseBudgetItem.objects
+                .filter(base_budget__budget__user_id=user_id)
+                .values("currency")
+                .annotate(total=Sum("amount"))
+                .order_by()
+            )
+            summary.base_budget_amounts = {row["currency"]: str(row["total"]) for row in rows}
+            fields.append("base_budget_amounts")
+
+        if created or (summary.ledger_amounts, summary.base_budget_amounts) != before:
+            summary.save(update_fields=fields)
+        return summary
+
+    # 최신 요약본(is_latest)이 있는 유저만 갱신 -> 피드에 안 나오는 유저의 변경은 집계/캐시 무효화 없음
+    # 게시 전 변경분은 요약본을 게시할 때(signals) 한 번에 반영, 게시 후 행이 없으면 조회 시 생성(get_cost_summary)
+    @classmethod
+    def refresh_if_published(cls, user_id, ledger=True, base_budget=True):
+        if not SummarySnapshot.objects.filter(user_id=user_id, is_latest=True).exists():
+            return None
+        return cls.refresh(user_id, ledger=ledger, base_budget=base_budget)
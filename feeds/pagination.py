@@ -0,0 +1,82 @@
+import base64
+import json
+from datetime import datetime
+
+from django.db.models import Q
+
+
+"""
+    # 피드 커서(keyset) 페이지네이션
+    - latest  : (created_at, id) 내림차순
+    - popular : (scrap_count, id) 내림차순
+    - cursor 는 마지막 항목의 (정렬 키, id)를 base64로 인코딩한 값
+    - OFFSET 없이 인덱스 범위 조회만 하므로 스냅샷 수와 관계없이 응답 시간이 일정
+"""
+
+FEED_PAGE_SIZE = 20
+FEED_MAX_PAGE_SIZE = 50
+
+SORT_KEYS = {
+    "latest": "created_at",
+    "popular": "scrap_count",
+}
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def get_sort_key(sort_option):
+    return SORT_KEYS.get(sort_option, SORT_KEYS["latest"])
+
+
+def get_page_size(raw):
+    try:
+        page_size = int(raw)
+    except (TypeError, ValueError):
+        return FEED_PAGE_SIZE
+    return max(1, min(page_size, FEED_MAX_PAGE_SIZE))
+
+
+def encode_cursor(sort_key, obj):
+    value = getattr(obj, sort_key)
+    if isinstance(value, datetime):
+        value = value.isoformat()
+    payload = json.dumps([sort_key, value, obj.id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode()
+
+
+def decode_cursor(sort_key, raw):
+    try:
+        key, value, last_id = json.loads(base64.urlsafe_b64decode(raw.encode()).decode())
+        if key != sort_key:
+            raise InvalidCursor()
+        if sort_key == "created_at":
+            value = datetime.fromisoformat(value)
+        else:
+            value = int(value)
+        return value, int(last_id)
+    except (ValueError, TypeError, UnicodeDecodeError):
+        raise InvalidCursor()
+
+
+def paginate(queryset, sort_option, cursor=None, page_size=FEED_PAGE_SIZE):
+    """
+    반환: (이번 페이지 객체 목록, 다음 페이지 cursor 또는 None)
+    잘못된 cursor 는 InvalidCursor
+    """
+    sort_key = get_sort_key(sort_option)
+    queryset = queryset.order_by(f"-{sort_key}", "-id")
+
+    if cursor:
+        value, last_id = decode_cursor(sort_key, cursor)
+        queryset = queryset.filter(
+            Q(**{f"{sort_key}__lt": value}) | Q(**{sort_key: value, "id__lt": last_id})
+        )
+
+    items = list(queryset[:page_size + 1])
+    next_cursor = None
+    if len(items) > page_size:
+        items = items[:page_size]
+        next_cursor = encode_cursor(sort_key, items[-1])
+    return items, next_cursor
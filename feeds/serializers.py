@@ -12,8 +12,8 @@ class FeedListSerializer(serializers.ModelSerializer):
     exchange_semester = serializers.CharField(source="snapshot_exchange_semester")
     exchange_period = serializers.CharField(source="snapshot_exchange_period")
 
-    like_count = serializers.SerializerMethodField()
-    scrap_count = serializers.SerializerMethodField()
+    like_count = serializers.IntegerField(read_only=True)
+    scrap_count = serializers.IntegerField(read_only=True)
     liked = serializers.SerializerMethodField()
     scrapped = serializers.SerializerMethodField()
 
@@ -40,25 +40,24 @@ class FeedListSerializer(serializers.ModelSerializer):
             "created_at",
         ]
 
-    # 좋아요 / 스크랩 count
-    def get_like_count(self, obj):
-        return obj.favorited_by.count()
-
-    def get_scrap_count(self, obj):
-        return obj.scrapped_by.count()
-
-    # 로그인한 유저가 좋아요 눌렀는지
+    # 로그인한 유저가 좋아요 눌렀는지 (목록 뷰는 context의 liked_ids로 판단)
     def get_liked(self, obj):
         user = self.context.get("user")
         if not user or user.is_anonymous:
             return False
+        liked_ids = self.context.get("liked_ids")
+        if liked_ids is not None:
+            return obj.id in liked_ids
         return obj.favorited_by.filter(user=user).exists()
 
-    # 로그인한 유저가 스크랩 했는지
+    # 로그인한 유저가 스크랩 했는지 (목록 뷰는 context의 scrapped_ids로 판단)
     def get_scrapped(self, obj):
         user = self.context.get("user")
         if not user or user.is_anonymous:
             return False
+        scrapped_ids = self.context.get("scrapped_ids")
+        if scrapped_ids is not None:
+            return obj.id in scrapped_ids
         return obj.scrapped_by.filter(user=user).exists()
 
 
@@ -0,0 +1,51 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from budgets.models import BaseBudgetItem, Budget
+from dongleDongle.cache import FEEDS_SCOPE, bump_versions
+from ledgers.models import LedgerEntry
+from summaries.models import SummarySnapshot
+
+from .models import FeedCostSummary, FeedFavorite, FeedScrap
+
+
+# 커밋 후 피드에 게시된 유저만 갱신
+# (유저 삭제 CASCADE 중에는 요약본/집계 행이 먼저 지워질 수 있어서 커밋 후 다시 확인)
+def _refresh_feed_cost_after_commit(user_id, **parts):
+    transaction.on_commit(lambda: FeedCostSummary.refresh_if_published(user_id, **parts))
+
+
+# 가계부가 바뀌면 작성자의 피드 비용 집계(가계부 부분) 갱신
+@receiver([post_save, post_delete], sender=LedgerEntry)
+def refresh_feed_cost_on_ledger_change(sender, instance, **kwargs):
+    if instance.user_id:
+        _refresh_feed_cost_after_commit(instance.user_id, base_budget=False)
+
+
+# 기본 파견비가 바뀌면 작성자의 피드 비용 집계(예산안 부분) 갱신
+@receiver([post_save, post_delete], sender=BaseBudgetItem)
+def refresh_feed_cost_on_base_budget_change(sender, instance, **kwargs):
+    user_id = (
+        Budget.objects
+        .filter(base_budget__id=instance.base_budget_id)
+        .values_list("user_id", flat=True)
+        .first()
+    )
+    if user_id:
+        _refresh_feed_cost_after_commit(user_id, ledger=False)
+
+
+# 요약본을 새로 게시하면 게시 전 변경분까지 한 번에 반영
+@receiver(post_save, sender=SummarySnapshot)
+def refresh_feed_cost_on_snapshot_publish(sender, instance, created, raw=False, **kwargs):
+    if created and instance.is_latest and not raw:
+        FeedCostSummary.refresh(instance.user_id)
+
+
+# 좋아요/스크랩 수, 작성자 비용 집계가 바뀌면 피드 목록 캐시 무효화
+@receiver([post_save, post_delete], sender=FeedFavorite)
+@receiver([post_save, post_delete], sender=FeedScrap)
+@receiver(post_save, sender=FeedCostSummary)
+def invalidate_feed_cache(sender, **kwargs):
+    bump_versions(FEEDS_SCOPE)
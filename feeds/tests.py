@@ -1,3 +1,91 @@
+from datetime import date
+from decimal import Decimal
+
+from django.core.cache import cache
 from django.test import TestCase
+from django.urls import reverse
+
+from accounts.models import User
+from dongleDongle.cache import FEEDS_SCOPE, get_versions
+from dongleDongle.testing import QueryBudgetMixin
+from ledgers.models import LedgerEntry
+from summaries.models import SummarySnapshot
+
+from .models import FeedCostSummary
+
+
+class FeedQueryBudgetTest(QueryBudgetMixin, TestCase):
+    def test_feed_list(self):
+        self.assertQueryBudget("feeds:feed_list", reverse("feeds:feed_list"))
+
+    def test_feed_list_popular(self):
+        self.assertQueryBudget("feeds:feed_list", reverse("feeds:feed_list") + "?sort=popular")
+
+    def test_feed_detail(self):
+        snapshot = SummarySnapshot.objects.filter(is_latest=True).exclude(user=self.user).first()
+        self.assertQueryBudget("feeds:feed_detail", reverse("feeds:feed_detail", args=[snapshot.id]))
+
+    def test_my_scraps(self):
+        self.assertQueryBudget("feeds:my_scraps", reverse("feeds:my_scraps"))
+
+
+"""
+    # 피드 비용 집계(FeedCostSummary) 갱신 범위
+    - 최신 요약본이 있는(피드에 나오는) 유저만 커밋 후 갱신 + 피드 목록 캐시 무효화
+    - 요약본이 없는 유저의 가계부 변경은 집계/캐시를 건드리지 않음
+"""
+class FeedCostSummaryRefreshTest(QueryBudgetMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.unpublished = User.objects.create_user(username="nofeed", password="pw", nickname="nofeed", gender="F")
+
+    def _add_expense(self, user, amount):
+        return LedgerEntry.objects.create(
+            user=user, entry_type="EXPENSE", date=date(2025, 3, 1), category="FOOD",
+            payment_method="CARD", amount=Decimal(amount), currency_code="KRW",
+        )
+
+    def test_published_user_refreshed_after_commit(self):
+        before = FeedCostSummary.objects.get(user=self.user).ledger_amounts
+        version = get_versions([FEEDS_SCOPE])[FEEDS_SCOPE]
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self._add_expense(self.user, "1000.00")
+
+        after = FeedCostSummary.objects.get(user=self.user).ledger_amounts
+        self.assertEqual(Decimal(after["KRW"]) - Decimal(before.get("KRW", "0")), Decimal("1000.00"))
+        self.assertGreater(get_versions([FEEDS_SCOPE])[FEEDS_SCOPE], version)
+
+    def test_unpublished_user_skipped(self):
+        version = get_versions([FEEDS_SCOPE])[FEEDS_SCOPE]
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self._add_expense(self.unpublished, "1000.00")
+
+        self.assertFalse(FeedCostSummary.objects.filter(user=self.unpublished).exists())
+        self.assertEqual(get_versions([FEEDS_SCOPE])[FEEDS_SCOPE], version)
+
+    def test_unchanged_totals_do_not_bump_feed_cache(self):
+        version = get_versions([FEEDS_SCOPE])[FEEDS_SCOPE]
+
+        with self.captureOnCommitCallbacks(execute=True):
+            LedgerEntry.objects.create(
+                user=self.user, entry_type="INCOME", date=date(2025, 3, 1), category="ALLOWANCE",
+                amount=Decimal("500.00"), currency_code="KRW",
+            )
+
+        self.assertEqual(get_versions([FEEDS_SCOPE])[FEEDS_SCOPE], version)
+
+    def test_publishing_snapshot_includes_earlier_changes(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self._add_expense(self.unpublished, "700.00")
+        SummarySnapshot.objects.create(user=self.unpublished, is_latest=True)
+
+        summary = FeedCostSummary.objects.get(user=self.unpublished)
+        self.assertEqual(Decimal(summary.ledger_amounts["KRW"]), Decimal("700.00"))
 
-# Create your tests here.
+    def test_user_delete_does_not_recreate_summary(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.delete()
+        self.assertFalse(FeedCostSummary.objects.filter(user_id=self.user.pk).exists())
@@ -1,61 +1,54 @@
 from decimal import Decimal, ROUND_HALF_UP
-from django.db.models import Count, Max
+from django.db.models import F
 from django.shortcuts import get_object_or_404
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
 from rest_framework.permissions import IsAuthenticated, AllowAny
 
-from django.db import models
-from .models import FeedFavorite, FeedScrap
+from django.db import models, transaction
+from .models import FeedCostSummary, FeedFavorite, FeedScrap
 from .serializers import *
+from .pagination import InvalidCursor, get_page_size, paginate
 from summaries.models import SummarySnapshot
 from ledgers.models import LedgerEntry
-from rates.views import convert_to_krw, convert_from_krw
-from budgets.models import BaseBudget, Budget, BaseBudgetItem
+from rates.views import convert_to_krw, convert_from_krw, convert_totals
+from rates.utils import resolve_currency
+from budgets.models import BaseBudget, BaseBudgetItem
+from accounts.context import UserContext
+from django.core.cache import cache
+from dongleDongle.cache import FEEDS_SCOPE, RATES_SCOPE, get_response_cache_timeout, make_cache_key
 import re
 
 
-COUNTRY_TO_CURRENCY = {
-    "한국": "KRW",
-    "미국": "USD",
-    "일본": "JPY",
-    "독일": "EUR",
-    "프랑스": "EUR",
-    "중국": "CNY",
-    "대만": "TWD",
-    "캐나다": "CAD",
-    "이탈리아": "EUR",
-    "네덜란드": "EUR",
-    "영국": "GBP",
-}
+# 작성자별 비용 집계 ({통화: 합계}) 가져오기, 없으면 새로 만들기
+def get_cost_summary(user):
+    try:
+        return user.feed_cost_summary
+    except FeedCostSummary.DoesNotExist:
+        return FeedCostSummary.refresh(user.id)
+
+
+def _amount_pairs(amounts):
+    return [(Decimal(amount), currency) for currency, amount in amounts.items()]
 
 
 # 총 파견비용 합산 -> 가계부 등록 총합 + 기본파견비용
 def get_total_expense_with_budget(user):
-    living_categories = ["FOOD", "HOUSING", "TRANSPORT", "SHOPPING", "TRAVEL", "STUDY_MATERIALS"]
-
     exchange_profile = getattr(user, "exchange_profile", None)
     if not exchange_profile:
         return Decimal("0"), Decimal("0")
 
-    exchange_country = exchange_profile.exchange_country
-    target_currency = COUNTRY_TO_CURRENCY.get(exchange_country, "KRW")
+    target_currency = resolve_currency(exchange_profile)
 
-    # LedgerEntry 지출 합산 (원화 기준)
-    entries = LedgerEntry.objects.filter(user=user, entry_type="EXPENSE", category__in=living_categories)
+    summary = get_cost_summary(user)
 
-    total_krw = Decimal("0")
-    for entry in entries:
-        total_krw += convert_to_krw(entry.amount, entry.currency_code)
+    # LedgerEntry 지출 합산 (원화 기준)
+    ledger_krw, _ = convert_totals(_amount_pairs(summary.ledger_amounts))
 
     # 예산안 기본파견비용 추가
-    budget = Budget.objects.filter(user=user).first()
-    if budget and hasattr(budget, "base_budget"):
-        base_budget = budget.base_budget
-        if base_budget.items.exists():
-            for item in base_budget.items.all():
-                total_krw += item.get_krw_amount()
+    base_krw, _ = convert_totals(_amount_pairs(summary.base_budget_amounts))
+    total_krw = ledger_krw + base_krw
 
     # 교환국 화폐 기준으로 변환
     total_foreign = convert_from_krw(total_krw, target_currency)
@@ -64,24 +57,38 @@ def get_total_expense_with_budget(user):
 
 # 가계부 등록합산만 (예산안 제외)
 def get_total_ledger_expense(user):
-    living_categories = ["FOOD", "HOUSING", "TRANSPORT", "SHOPPING", "TRAVEL", "STUDY_MATERIALS"]
-
     exchange_profile = getattr(user, "exchange_profile", None)
     if not exchange_profile:
         return Decimal("0"), Decimal("0")
 
-    exchange_country = exchange_profile.exchange_country
-    target_currency = COUNTRY_TO_CURRENCY.get(exchange_country, "KRW")
+    target_currency = resolve_currency(exchange_profile)
 
     # LedgerEntry 지출 합산 (원화 기준)
-    entries = LedgerEntry.objects.filter(user=user, entry_type="EXPENSE", category__in=living_categories)
+    summary = get_cost_summary(user)
+    total_krw, total_foreign = convert_totals(_amount_pairs(summary.ledger_amounts), target_currency)
+    return total_foreign, total_krw
 
-    total_krw = Decimal("0")
-    for entry in entries:
-        total_krw += convert_to_krw(entry.amount, entry.currency_code)
 
-    total_foreign = convert_from_krw(total_krw, target_currency)
-    return total_foreign, total_krw
+# 목록 조회용 serializer context
+# 로그인 유저의 좋아요/스크랩 여부를 IN 쿼리 한 번씩으로 미리 조회
+def get_feed_list_context(user, snapshot_ids, scrapped_ids=None):
+    context = {"user": user, "liked_ids": set(), "scrapped_ids": set()}
+    if not user or user.is_anonymous or not snapshot_ids:
+        return context
+
+    context["liked_ids"] = set(
+        FeedFavorite.objects
+        .filter(user=user, snapshot_id__in=snapshot_ids)
+        .values_list("snapshot_id", flat=True)
+    )
+    if scrapped_ids is None:
+        scrapped_ids = (
+            FeedScrap.objects
+            .filter(user=user, snapshot_id__in=snapshot_ids)
+            .values_list("snapshot_id", flat=True)
+        )
+    context["scrapped_ids"] = set(scrapped_ids)
+    return context
 
 
 def get_months(exchange_period: str) -> int:
@@ -107,27 +114,46 @@ class FeedListView(APIView):
     permission_classes = [AllowAny]
 
     def get(self, request):
-        sort_option = request.query_params.get("sort", "latest")
-        search = request.query_params.get("search")
-        country = request.query_params.get("country")
-        univ = request.query_params.get("univ")
-        exchange_type = request.query_params.get("exchange_type")
-
-        latest_ids = (
-            SummarySnapshot.objects
-            .values("user")
-            .annotate(latest_id=Max("id"))
-            .values_list("latest_id", flat=True)
-        )
-
+        try:
+            data, next_cursor = self._get_page(request)
+        except InvalidCursor:
+            return bad("잘못된 cursor 값입니다.")
+
+        # 좋아요/스크랩 여부는 보는 유저마다 다르므로 캐시 밖에서 채움
+        context = get_feed_list_context(request.user, [feed_data["id"] for feed_data in data])
+        for feed_data in data:
+            feed_data["liked"] = feed_data["id"] in context["liked_ids"]
+            feed_data["scrapped"] = feed_data["id"] in context["scrapped_ids"]
+
+        response = ok("가계부 요약본 목록 조회 성공", data)
+        response.data["next_cursor"] = next_cursor
+        return response
+
+    # 목록 페이지는 모든 유저가 같은 결과를 보므로 쿼리스트링 단위로 공유 캐시 (피드/환율 버전)
+    def _get_page(self, request):
+        timeout = get_response_cache_timeout()
+        if not timeout:
+            return self._build_page(request.query_params)
+
+        key = make_cache_key("feeds:feed_list", [FEEDS_SCOPE, RATES_SCOPE], request.get_full_path())
+        page = cache.get(key)
+        if page is None:
+            page = self._build_page(request.query_params)
+            cache.set(key, page, timeout)
+        return page
+
+    def _build_page(self, params):
+        sort_option = params.get("sort", "latest")
+        search = params.get("search")
+        country = params.get("country")
+        univ = params.get("univ")
+        exchange_type = params.get("exchange_type")
+
+        # 유저별 최신 스냅샷만 (is_latest 인덱스로 조회)
         feeds = (
             SummarySnapshot.objects
-            .filter(id__in=latest_ids)
-            .select_related("user", "exchange_profile")
-            .annotate(
-                like_count=Count("favorited_by"),
-                scrap_count=Count("scrapped_by"),
-            )
+            .filter(is_latest=True)
+            .select_related("user__exchange_profile", "user__feed_cost_summary", "exchange_profile")
         )
 
         if search:
@@ -143,17 +169,16 @@ class FeedListView(APIView):
         if exchange_type:
             feeds = feeds.filter(exchange_profile__exchange_type=exchange_type)
 
-        if sort_option == "popular":
-            feeds = feeds.order_by("-scrap_count")
-        else:
-            feeds = feeds.order_by("-created_at")
-
-        serializer = FeedListSerializer(
+        # 커서 페이지네이션 (latest: created_at, popular: scrap_count 기준)
+        feeds, next_cursor = paginate(
             feeds,
-            many=True,
-            context={"user": request.user}
+            sort_option,
+            cursor=params.get("cursor"),
+            page_size=get_page_size(params.get("page_size")),
         )
-        data = serializer.data
+
+        serializer = FeedListSerializer(feeds, many=True, context=get_feed_list_context(None, []))
+        data = [dict(feed_data) for feed_data in serializer.data]
 
         # 계산된 비용 추가
         for feed_data, snapshot in zip(data, feeds):
@@ -171,7 +196,7 @@ class FeedListView(APIView):
             feed_data["living_expense_foreign_amount"] = str(avg_foreign.quantize(Decimal("0.01")))
             feed_data["living_expense_krw_amount"] = str(avg_krw.quantize(Decimal("0.01")))
 
-        return ok("가계부 요약본 목록 조회 성공", data)
+        return data, next_cursor
 
 
 class FeedDetailView(APIView):
@@ -179,12 +204,14 @@ class FeedDetailView(APIView):
 
     def get(self, request, feed_id):
         feed = get_object_or_404(
-            SummarySnapshot.objects.select_related("user", "exchange_profile", "detail_profile"),
+            SummarySnapshot.objects.select_related(
+                "user__exchange_profile", "user__feed_cost_summary", "exchange_profile", "detail_profile"
+            ),
             id=feed_id
         )
 
-        like_count = feed.favorited_by.count()
-        scrap_count = feed.scrapped_by.count()
+        like_count = feed.like_count
+        scrap_count = feed.scrap_count
         user_liked = False
         user_scrapped = False
 
@@ -202,7 +229,7 @@ class FeedDetailView(APIView):
         exchange_profile = getattr(user, "exchange_profile", None)
         if not exchange_profile:
             return bad("교환학생 정보가 없습니다.")
-        target_currency = COUNTRY_TO_CURRENCY.get(exchange_profile.exchange_country, "KRW")
+        target_currency = resolve_currency(exchange_profile)
 
         # 한달평균생활비 계산
         living_categories = ["FOOD", "HOUSING", "TRANSPORT", "SHOPPING", "TRAVEL", "STUDY_MATERIALS"]
@@ -212,7 +239,11 @@ class FeedDetailView(APIView):
         avg_krw = safe_divide(ledger_krw, months)
 
         # LedgerEntry 지출합
-        entries = LedgerEntry.objects.filter(user=user, entry_type="EXPENSE", category__in=living_categories)
+        entries = (
+            LedgerEntry.objects
+            .filter(user=user, entry_type="EXPENSE", category__in=living_categories)
+            .order_by("id")  # 카테고리 표시 순서를 등록 순서로 고정 (인덱스 순서에 따라 바뀌지 않도록)
+        )
 
         category_totals_krw = {}
         for entry in entries:
@@ -249,9 +280,9 @@ class FeedDetailView(APIView):
             "categories": living_expense_categories,
         }
 
-        # 기본파견비용
-        budget = Budget.objects.filter(user=user).first()
-        base_budget = getattr(budget, "base_budget", None)
+        # 기본파견비용 (작성자 예산안 + 항목을 한 번씩만 조회)
+        author_context = UserContext(user)
+        base_budget = author_context.base_budget
         base_dispatch_summary = {
             "foreign_amount": "0",
             "foreign_currency": target_currency,
@@ -261,10 +292,11 @@ class FeedDetailView(APIView):
         }
 
         if base_budget:
-            total_krw = sum(item.get_krw_amount() for item in base_budget.items.all())
+            items = author_context.base_budget_items
+            total_krw = sum(item.get_krw_amount() for item in items)
             categories = []
 
-            for item in base_budget.items.all():
+            for item in items:
                 label = BaseBudgetItem.BaseItem(item.type).label
                 cost_krw = item.get_krw_amount()
                 cost_foreign = convert_from_krw(cost_krw, target_currency)
@@ -307,7 +339,9 @@ class FeedFavoriteView(APIView):
         if FeedFavorite.objects.filter(user=request.user, snapshot=snapshot).exists():
             return bad("이미 좋아요를 누른 요약본입니다.")
 
-        favorite = FeedFavorite.objects.create(user=request.user, snapshot=snapshot)
+        with transaction.atomic():
+            favorite = FeedFavorite.objects.create(user=request.user, snapshot=snapshot)
+            SummarySnapshot.objects.filter(id=snapshot.id).update(like_count=F("like_count") + 1)
         serializer = FeedFavoriteSerializer(favorite)
 
         return ok("가계부 요약본 좋아요 추가 성공", serializer.data, status=status.HTTP_201_CREATED)
@@ -319,7 +353,9 @@ class FeedFavoriteView(APIView):
         if not favorite:
             return bad("좋아요를 누르지 않은 요약본입니다.", status=status.HTTP_404_NOT_FOUND)
 
-        favorite.delete()
+        with transaction.atomic():
+            favorite.delete()
+            SummarySnapshot.objects.filter(id=snapshot.id, like_count__gt=0).update(like_count=F("like_count") - 1)
         return ok("가계부 요약본 좋아요 삭제 성공", status=status.HTTP_204_NO_CONTENT)
 
 
@@ -332,7 +368,9 @@ class FeedScrapView(APIView):
         if FeedScrap.objects.filter(user=request.user, snapshot=snapshot).exists():
             return bad("이미 스크랩한 요약본입니다.")
 
-        scrap = FeedScrap.objects.create(user=request.user, snapshot=snapshot)
+        with transaction.atomic():
+            scrap = FeedScrap.objects.create(user=request.user, snapshot=snapshot)
+            SummarySnapshot.objects.filter(id=snapshot.id).update(scrap_count=F("scrap_count") + 1)
         serializer = FeedScrapSerializer(scrap)
         return ok("가계부 요약본 스크랩 추가 성공", serializer.data, status=status.HTTP_201_CREATED)
 
@@ -343,7 +381,9 @@ class FeedScrapView(APIView):
         if not scrap:
             return bad("스크랩하지 않은 요약본입니다.", status=status.HTTP_404_NOT_FOUND)
 
-        scrap.delete()
+        with transaction.atomic():
+            scrap.delete()
+            SummarySnapshot.objects.filter(id=snapshot.id, scrap_count__gt=0).update(scrap_count=F("scrap_count") - 1)
         return ok("가계부 요약본 스크랩 삭제 성공", status=status.HTTP_204_NO_CONTENT)
 
 
@@ -354,16 +394,22 @@ class MyScrapListView(APIView):
         scraps = (
             FeedScrap.objects
             .filter(user=request.user)
-            .select_related("snapshot__user", "snapshot__exchange_profile")
+            .select_related(
+                "snapshot__user__exchange_profile",
+                "snapshot__user__feed_cost_summary",
+                "snapshot__exchange_profile",
+            )
             .order_by("-created_at")
         )
 
         snapshots = [scrap.snapshot for scrap in scraps]
+        snapshot_ids = [snapshot.id for snapshot in snapshots]
 
+        # 내 스크랩 목록이므로 스크랩 여부는 조회 없이 전부 True
         serializer = FeedListSerializer(
             snapshots,
             many=True,
-            context={"user": request.user}
+            context=get_feed_list_context(request.user, snapshot_ids, scrapped_ids=snapshot_ids),
         )
         data = serializer.data
 
@@ -1,5 +1,23 @@
 from django.contrib import admin
 from .models import *
 
-admin.site.register(Ledger)
-admin.site.register(LedgerEntry)
\ No newline at end of file
+admin.site.register(LedgerEntry)
+admin.site.register(LedgerIdempotencyKey)
+
+
+# 월별 집계는 LedgerEntry 시그널로만 바뀌므로 조회 전용
+# 어긋났으면 python manage.py rebuild_ledger_rollups (LedgerMonthlyRollup.rebuild) 로 재계산
+@admin.register(LedgerMonthlyRollup)
+class LedgerMonthlyRollupAdmin(admin.ModelAdmin):
+    list_display  = ["id", "user", "month", "entry_type", "category", "currency_code", "amount_sum", "entry_count"]
+    list_filter   = ["entry_type", "category", "currency_code"]
+    ordering      = ["-month", "id"]
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
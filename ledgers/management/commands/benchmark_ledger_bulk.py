@@ -0,0 +1,79 @@
+import random
+import time
+from datetime import date, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from accounts.models import User
+from ledgers.models import LedgerEntry
+from ledgers.views import LedgerEntryBulkCreateView, LedgerEntryCreateView
+
+
+class Command(BaseCommand):
+    help = (
+        "가계부 일괄 등록(fill/bulk/)과 단건 등록(fill/)을 같은 데이터로 비교 측정합니다. "
+        "측정이 끝나면 모두 롤백합니다."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--user", required=True, help="측정할 유저(username)")
+        parser.add_argument("--rows", type=int, default=10000, help="일괄 등록 행 수")
+        parser.add_argument("--single", type=int, default=200, help="단건 등록으로 보낼 행 수 (행당 시간으로 환산)")
+
+    def handle(self, *args, **options):
+        user = User.objects.filter(username=options["user"]).first()
+        if user is None:
+            raise CommandError(f"유저를 찾을 수 없습니다: {options['user']}")
+
+        rows = [self._row() for _ in range(options["rows"])]
+        factory = APIRequestFactory()
+
+        with transaction.atomic():
+            # 1) 일괄 등록
+            request = factory.post("/ledgers/fill/bulk/", rows, format="json")
+            force_authenticate(request, user=user)
+            before = LedgerEntry.objects.filter(user=user).count()
+            with CaptureQueriesContext(connection) as queries:
+                started = time.perf_counter()
+                response = LedgerEntryBulkCreateView.as_view()(request)
+                bulk_elapsed = time.perf_counter() - started
+            if response.status_code != 201:
+                raise CommandError(f"일괄 등록 실패: {response.data}")
+            created = LedgerEntry.objects.filter(user=user).count() - before
+            self.stdout.write(
+                f"[일괄] {created}건, {bulk_elapsed * 1000:.0f}ms, 쿼리 {len(queries)}개, "
+                f"행당 {bulk_elapsed / max(created, 1) * 1000:.3f}ms"
+            )
+
+            #2) 단건 등록 반복
+            single_rows = rows[:options["single"]]
+            with CaptureQueriesContext(connection) as queries:
+                started = time.perf_counter()
+                for row in single_rows:
+                    request = factory.post("/ledgers/fill/", row, format="json")
+                    force_authenticate(request, user=user)
+                    LedgerEntryCreateView.as_view()(request)
+                single_elapsed = time.perf_counter() - started
+            per_row = single_elapsed / max(len(single_rows), 1)
+            self.stdout.write(
+                f"[단건] {len(single_rows)}건, {single_elapsed * 1000:.0f}ms, 쿼리 {len(queries)}개, "
+                f"행당 {per_row * 1000:.3f}ms (={len(rows)}건 환산 {per_row * len(rows):.1f}s)"
+            )
+
+            transaction.set_rollback(True)
+
+    def _row(self):
+        entry_type = random.choice(["EXPENSE", "EXPENSE", "EXPENSE", "INCOME"])
+        row = {
+            "entry_type": entry_type,
+            "date": (date.today() - timedelta(days=random.randint(0, 365))).isoformat(),
+            "category": random.choice(LedgerEntry.Category.values),
+            "amount": f"{random.randint(1, 100000) / 100:.2f}",
+            "currency_code": random.choice(["KRW", "USD", "JPY", "EUR"]),
+        }
+        if entry_type == "EXPENSE":
+            row["payment_method"] = "CARD"
+        return row
@@ -0,0 +1,18 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from ledgers.models import LedgerIdempotencyKey
+
+
+class Command(BaseCommand):
+    help = "오래된 가계부 등록 Idempotency-Key 기록을 삭제합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--hours", type=int, default=24, help="이 시간보다 오래된 키 삭제 (기본 24시간)")
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(hours=options["hours"])
+        deleted, _ = LedgerIdempotencyKey.objects.filter(created_at__lt=cutoff).delete()
+        self.stdout.write(self.style.SUCCESS(f"Idempotency-Key {deleted}건 삭제 완료"))
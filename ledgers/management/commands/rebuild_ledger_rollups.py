@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from accounts.models import User
+from ledgers.models import LedgerMonthlyRollup
+
+
+class Command(BaseCommand):
+    help = "LedgerEntry 전체를 다시 읽어서 월별 가계부 집계(LedgerMonthlyRollup)를 재생성합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--user", help="특정 유저(username)만 재생성")
+
+    @transaction.atomic
+    def handle(self, *args, **options):
+        user = None
+        username = options.get("user")
+        if username:
+            user = User.objects.filter(username=username).first()
+            if user is None:
+                raise CommandError(f"유저를 찾을 수 없습니다: {username}")
+
+        count = LedgerMonthlyRollup.rebuild(user=user)
+        self.stdout.write(self.style.SUCCESS(f"월별 가계부 집계 {count}건 재생성 완료"))
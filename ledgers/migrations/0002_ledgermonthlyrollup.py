@@ -0,0 +1,76 @@
+# Generated by Django 4.2.24 on 2026-10-18 18:45
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+from django.db.models import Count, Sum
+from django.db.models.functions import TruncMonth
+
+
+# 기존 LedgerEntry로 월별 집계 초기 데이터 생성
+def populate_rollups(apps, schema_editor):
+    LedgerEntry = apps.get_model("ledgers", "LedgerEntry")
+    LedgerMonthlyRollup = apps.get_model("ledgers", "LedgerMonthlyRollup")
+
+    rows = (
+        LedgerEntry.objects
+        .filter(user__isnull=False)
+        .annotate(month=TruncMonth("date"))
+        .values("user_id", "month", "entry_type", "category", "currency_code", "converted_currency_code")
+        .annotate(amount_sum=Sum("amount"), amount_converted_sum=Sum("amount_converted"), entry_count=Count("id"))
+        .order_by()
+    )
+
+    merged = {}
+    for row in rows:
+        converted_currency_code = row["converted_currency_code"] or ""
+        key = (row["user_id"], row["month"], row["entry_type"], row["category"], row["currency_code"], converted_currency_code)
+        rollup = merged.get(key)
+        if rollup is None:
+            merged[key] = LedgerMonthlyRollup(
+                user_id=row["user_id"],
+                month=row["month"],
+                entry_type=row["entry_type"],
+                category=row["category"],
+                currency_code=row["currency_code"],
+                converted_currency_code=converted_currency_code,
+                amount_sum=row["amount_sum"],
+                amount_converted_sum=row["amount_converted_sum"] or 0,
+                entry_count=row["entry_count"],
+            )
+        else:
+            rollup.amount_sum += row["amount_sum"]
+            rollup.amount_converted_sum += row["amount_converted_sum"] or 0
+            rollup.entry_count += row["entry_count"]
+
+    LedgerMonthlyRollup.objects.bulk_create(merged.values(), batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('ledgers', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LedgerMonthlyRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('month', models.DateField(help_text='해당 월의 1일')),
+                ('entry_type', models.CharField(choices=[('EXPENSE', '지출'), ('INCOME', '수입')], max_length=10)),
+                ('category', models.CharField(choices=[('FOOD', '식비'), ('HOUSING', '주거비'), ('TRANSPORT', '교통비'), ('SHOPPING', '쇼핑비'), ('TRAVEL', '여행비'), ('STUDY_MATERIALS', '교재비'), ('ALLOWANCE', '용돈'), ('ETC', '기타')], max_length=20)),
+                ('currency_code', models.CharField(max_length=3)),
+                ('converted_currency_code', models.CharField(blank=True, default='', max_length=3)),
+                ('amount_sum', models.DecimalField(decimal_places=2, default=0, max_digits=18)),
+                ('amount_converted_sum', models.DecimalField(decimal_places=2, default=0, max_digits=20)),
+                ('entry_count', models.IntegerField(default=0)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='ledger_rollups', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'unique_together': {('user', 'month', 'entry_type', 'category', 'currency_code', 'converted_currency_code')},
+            },
+        ),
+        migrations.RunPython(populate_rollups, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 4.2.24 on 2026-10-18 18:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ledgers', '0002_ledgermonthlyrollup'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='ledgerentry',
+            index=models.Index(fields=['user', 'date', 'created_at'], name='ledger_user_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='ledgerentry',
+            index=models.Index(fields=['user', 'entry_type', 'category'], name='ledger_user_type_cat_idx'),
+        ),
+    ]
@@ -0,0 +1,16 @@
+# Generated by Django 4.2.24 on 2026-10-18 18:51
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ledgers', '0003_ledgerentry_indexes'),
+    ]
+
+    operations = [
+        migrations.DeleteModel(
+            name='Ledger',
+        ),
+    ]
@@ -1,5 +1,8 @@
 from django.db import models
+from django.db.models import Count, Sum
+from django.db.models.functions import TruncMonth
 from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
 
 
 class LedgerEntry(models.Model):
@@ -39,11 +42,218 @@ class LedgerEntry(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    # 월별 집계(LedgerMonthlyRollup)에 반영되는 필드
+    ROLLUP_FIELDS = (
+        "user_id", "date", "entry_type", "category",
+        "currency_code", "converted_currency_code", "amount", "amount_converted",
+    )
 
-class Ledger(models.Model):
-    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="ledgers_user")
-    ledger_entries = models.ManyToManyField(LedgerEntry, related_name="ledgers_entries", blank=True)
-    month = models.DateField(help_text="LedgerEntry에서 몇 월인지 참고")
+    class Meta:
+        indexes = [
+            # 날짜별 조회/월 범위 조회 (user + date 범위, -date/-created_at 정렬까지 인덱스로 처리)
+            models.Index(fields=["user", "date", "created_at"], name="ledger_user_date_idx"),
+            # 수입/지출 + 카테고리 필터 (생활비 집계, 피드 비용 집계)
+            models.Index(fields=["user", "entry_type", "category"], name="ledger_user_type_cat_idx"),
+        ]
+
+    # DB에서 불러온 값을 보관 -> 수정/삭제 시그널에서 저장돼 있던 값만큼 집계에서 빼기
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._rollup_state = instance.rollup_state()
+        return instance
+
+    # 집계 필드 값 dict (only()/defer() 로 일부 필드만 불러왔으면 None)
+    def rollup_state(self):
+        if any(field not in self.__dict__ for field in self.ROLLUP_FIELDS):
+            return None
+        return {field: self.__dict__[field] for field in self.ROLLUP_FIELDS}
+
+
+# 월별 가계부 집계 (user, 월, 수입/지출, 카테고리, 통화) 단위 합계/건수
+# LedgerEntry save()/delete() 시 시그널(ledgers/signals.py)로 같은 트랜잭션에서 증감 (관리자 페이지/쉘 포함)
+# bulk_create / queryset.update() 는 시그널이 없으므로 apply_many 로 직접 반영하거나
+# rebuild() (rebuild_ledger_rollups 커맨드)로 전체 재계산
+class LedgerMonthlyRollup(models.Model):
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="ledger_rollups")
+    month = models.DateField(help_text="해당 월의 1일")
+    entry_type = models.CharField(max_length=10, choices=LedgerEntry.EntryType.choices)
+    category = models.CharField(max_length=20, choices=LedgerEntry.Category.choices)
+    currency_code = models.CharField(max_length=3)
+    # 등록 당시 환산 통화 (환산값이 없으면 "")
+    converted_currency_code = models.CharField(max_length=3, blank=True, default="")
+
+    amount_sum = models.DecimalField(max_digits=18, decimal_places=2, default=0)
+    amount_converted_sum = models.DecimalField(max_digits=20, decimal_places=2, default=0)
+    entry_count = models.IntegerField(default=0)
+
+    class Meta:
+        unique_together = ("user", "month", "entry_type", "category", "currency_code", "converted_currency_code")
+
+    @classmethod
+    def _key(cls, entry):
+        return {
+            "user_id": entry.user_id,
+            "month": entry.date.replace(day=1),
+            "entry_type": entry.entry_type,
+            "category": entry.category,
+            "currency_code": entry.currency_code,
+            "converted_currency_code": entry.converted_currency_code or "",
+        }
+
+    # 더할 때만 집계 행을 만들고, 뺄 때는 있는 행만 갱신
+    # (유저 삭제로 집계 행이 먼저 CASCADE 삭제된 경우 다시 만들지 않도록)
+    @classmethod
+    def _add(cls, key, amount, amount_converted, count):
+        rollups = cls.objects.filter(**key)
+        if count > 0:
+            rollup, _ = cls.objects.get_or_create(**key)
+            rollups = cls.objects.filter(pk=rollup.pk)
+        rollups.update(
+            amount_sum=models.F("amount_sum") + amount,
+            amount_converted_sum=models.F("amount_converted_sum") + amount_converted,
+            entry_count=models.F("entry_count") + count,
+        )
+        if count < 0:
+            rollups.filter(entry_count__lte=0).delete()
+
+    # entry 하나를 집계에 더하기(sign=1) / 빼기(sign=-1), 유저가 없는 entry 는 집계하지 않음 (rebuild 와 동일)
+    @classmethod
+    def apply(cls, entry, sign=1):
+        if entry.user_id is None:
+            return
+        cls._add(
+            cls._key(entry),
+            sign * entry.amount,
+            sign * (entry.amount_converted or 0),
+            sign,
+        )
+
+    # 수정 전 entry(previous) -> 수정 후 entry(current)
+    # 집계 키가 같으면 차이만 한 번에 반영, 금액도 같으면 쿼리 없음
+    @classmethod
+    def replace(cls, previous, current):
+        if previous.user_id is None or current.user_id is None or cls._key(previous) != cls._key(current):
+            cls.apply(previous, -1)
+            cls.apply(current, 1)
+            return
+        amount = current.amount - previous.amount
+        amount_converted = (current.amount_converted or 0) - (previous.amount_converted or 0)
+        if amount or amount_converted:
+            cls._add(cls._key(current), amount, amount_converted, 0)
+
+    # 여러 entry를 키별로 먼저 합친 뒤 한꺼번에 반영 (bulk_create 는 시그널/apply 를 거치지 않음)
+    # 기존 집계 행은 잠그고 읽어서 bulk_update, 없는 키는 bulk_create
+    @classmethod
+    def apply_many(cls, entries, sign=1):
+        grouped = {}
+        for entry in entries:
+            if entry.user_id is None:
+                continue
+            key = tuple(cls._key(entry).values())
+            amount, amount_converted, count = grouped.get(key, (0, 0, 0))
+            grouped[key] = (
+                amount + entry.amount,
+                amount_converted + (entry.amount_converted or 0),
+                count + 1,
+            )
+        if not grouped:
+            return 0
+
+        fields = ("user_id", "month", "entry_type", "category", "currency_code", "converted_currency_code")
+        existing = {
+            tuple(getattr(rollup, field) for field in fields): rollup
+            for rollup in cls.objects.select_for_update().filter(
+                user_id__in={key[0] for key in grouped},
+                month__in={key[1] for key in grouped},
+            )
+        }
+
+        to_create, to_update = [], []
+        for key, (amount, amount_converted, count) in grouped.items():
+            rollup = existing.get(key)
+            if rollup is None:
+                rollup = cls(**dict(zip(fields, key)))
+                to_create.append(rollup)
+            else:
+                to_update.append(rollup)
+            rollup.amount_sum += sign * amount
+            rollup.amount_converted_sum += sign * amount_converted
+            rollup.entry_count += sign * count
+
+        cls.objects.bulk_create(to_create, batch_size=500)
+        cls.objects.bulk_update(to_update, ["amount_sum", "amount_converted_sum", "entry_count"], batch_size=500)
+        if sign < 0:
+            cls.objects.filter(pk__in=[rollup.pk for rollup in to_update], entry_count__lte=0).delete()
+        return len(grouped)
+
+    # LedgerEntry에서 전체 재계산 (user를 주면 해당 유저만)
+    @classmethod
+    def rebuild(cls, user=None):
+        entries = LedgerEntry.objects.filter(user__isnull=False)
+        rollups = cls.objects.all()
+        if user is not None:
+            entries = entries.filter(user=user)
+            rollups = rollups.filter(user=user)
+
+        rows = (
+            entries
+            .annotate(month=TruncMonth("date"))
+            .values("user_id", "month", "entry_type", "category", "currency_code", "converted_currency_code")
+            .annotate(
+                amount_sum=Sum("amount"),
+                amount_converted_sum=Sum("amount_converted"),
+                entry_count=Count("id"),
+            )
+            .order_by()
+        )
+
+        merged = {}
+        for row in rows:
+            row["converted_currency_code"] = row["converted_currency_code"] or ""
+            key = (
+                row["user_id"], row["month"], row["entry_type"],
+                row["category"], row["currency_code"], row["converted_currency_code"],
+            )
+            if key in merged:
+                # converted_currency_code가 NULL/"" 인 행은 같은 키로 합침
+                merged[key].amount_sum += row["amount_sum"]
+                merged[key].amount_converted_sum += row["amount_converted_sum"] or 0
+                merged[key].entry_count += row["entry_count"]
+                continue
+            merged[key] = cls(
+                user_id=row["user_id"],
+                month=row["month"],
+                entry_type=row["entry_type"],
+                category=row["category"],
+                currency_code=row["currency_code"],
+                converted_currency_code=row["converted_currency_code"],
+                amount_sum=row["amount_sum"],
+                amount_converted_sum=row["amount_converted_sum"] or 0,
+                entry_count=row["entry_count"],
+            )
+
+        rollups.delete()
+        cls.objects.bulk_create(merged.values(), batch_size=1000)
+        return len(merged)
+
+
+# 가계부 등록 재시도 중복 방지 (Idempotency-Key 헤더)
+# 같은 유저 + 같은 키로 다시 요청하면 저장해 둔 첫 응답을 그대로 돌려줌, 오래된 키는 purge_idempotency_keys 커맨드로 정리
+class LedgerIdempotencyKey(models.Model):
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="ledger_idempotency_keys")
+    key = models.CharField(max_length=255)
+    # 같은 키로 다른 내용을 보내는 경우를 막기 위한 요청 본문 해시
+    request_hash = models.CharField(max_length=64)
+    entry = models.ForeignKey(LedgerEntry, on_delete=models.SET_NULL, null=True, blank=True, related_name="idempotency_keys")
+
+    response_status = models.PositiveSmallIntegerField(null=True, blank=True)
+    response_body = models.JSONField(null=True, blank=True, encoder=DjangoJSONEncoder)
+
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
 
     class Meta:
-        unique_together = ("user", "month")
\ No newline at end of file
+        unique_together = ("user", "key")
+
+    def __str__(self):
+        return f"{self.user_id} {self.key}"
@@ -1,35 +1,10 @@
 from rest_framework import serializers
 from .models import *
 from rates.views import convert_to_krw, convert_from_krw
+from rates.utils import resolve_user_currency
 from decimal import Decimal, InvalidOperation
 
 
-COUNTRY_TO_CURRENCY = {
-    "한국": "KRW",
-    "미국": "USD",
-    "일본": "JPY",
-    "독일": "EUR",
-    "프랑스": "EUR",
-    "중국": "CNY",
-    "대만": "TWD",
-    "캐나다": "CAD",
-    "이탈리아": "EUR",
-    "네덜란드": "EUR",
-    "영국": "GBP",
-    "USA": "USD",
-    "JAPAN": "JPY",
-    "KOREA": "KRW",
-    "CHINA": "CNY",
-    "TAIWAN": "TWD",
-    "CANADA": "CAD",
-    "UK": "GBP",
-    "FRANCE": "EUR",
-    "GERMANY": "EUR",
-    "NETHERLANDS": "EUR",
-    "ITALY": "EUR",
-}
-
-
 def safe_decimal(value):
     try:
         if value in (None, "", "None"):
@@ -85,25 +60,17 @@ class LedgerEntryCreateSerializer(serializers.ModelSerializer):
         data["currency_code"] = str(currency_code).upper()
         return data
 
-    def _convert_amount(self, user, original_amount: Decimal, original_currency: str):
+    # rates 를 주면 해당 환율 스냅샷으로 변환 (일괄 등록)
+    def _convert_amount(self, user, original_amount: Decimal, original_currency: str, rates=None):
         if original_currency == "KRW":
-            exchange_profile = getattr(user, "exchange_profile", None)
-            if exchange_profile is None:
-                return None, None
-            country_name = exchange_profile.exchange_country
-            if not country_name:
-                return None, None
-            country_name = country_name.strip()
-            target_currency = COUNTRY_TO_CURRENCY.get(country_name)
-            if target_currency is None:
-                return None, None
+            target_currency = resolve_user_currency(user)
             if target_currency == "KRW":
                 return None, None
-            converted_amount = convert_from_krw(original_amount, target_currency)
+            converted_amount = convert_from_krw(original_amount, target_currency, rates)
             if converted_amount is None:
                 return None, None
             return converted_amount, target_currency
-        converted_amount = convert_to_krw(original_amount, original_currency)
+        converted_amount = convert_to_krw(original_amount, original_currency, rates)
         if converted_amount is None:
             return None, None
         return converted_amount, "KRW"
@@ -123,6 +90,18 @@ class LedgerEntryCreateSerializer(serializers.ModelSerializer):
         )
         return entry
 
+    # 저장하지 않은 LedgerEntry 생성 (bulk_create 용)
+    def build_entry(self, user, validated_data, rates=None):
+        converted_amount, converted_currency = self._convert_amount(
+            user, validated_data["amount"], validated_data["currency_code"], rates
+        )
+        return LedgerEntry(
+            user=user,
+            **validated_data,
+            amount_converted=converted_amount,
+            converted_currency_code=converted_currency,
+        )
+
     def update(self, instance, validated_data):
         user = self.context["request"].user
         amount = validated_data.get("amount", instance.amount)
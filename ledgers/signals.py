@@ -0,0 +1,62 @@
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from dongleDongle.cache import bump_user_version
+
+from .models import LedgerEntry, LedgerMonthlyRollup
+
+
+# 가계부가 바뀌면 해당 유저의 응답 캐시(카테고리별 조회, 가계부 요약본) 무효화
+# 일괄 등록(bulk_create)은 LedgerEntryBulkCreateView 에서 직접 무효화
+@receiver([post_save, post_delete], sender=LedgerEntry)
+def invalidate_user_cache_on_ledger_change(sender, instance, **kwargs):
+    bump_user_version(instance.user_id)
+
+
+# 집계 필드 dict -> 집계 계산용 LedgerEntry (쉘에서 문자열로 넣은 금액/날짜도 변환)
+def _rollup_entry(state):
+    return LedgerEntry(**{
+        field: LedgerEntry._meta.get_field(field).to_python(value)
+        for field, value in state.items()
+    })
+
+
+def _stored_state(pk):
+    return LedgerEntry.objects.filter(pk=pk).values(*LedgerEntry.ROLLUP_FIELDS).first()
+
+
+"""
+    # 월별 집계(LedgerMonthlyRollup) 유지
+    - 뷰/관리자 페이지/쉘 어디서 save()/delete() 해도 같은 트랜잭션에서 집계 증감
+    - 수정 전 값은 불러올 때 보관한 값(from_db), 없으면 저장 직전에 DB에서 조회
+    - fixture 로드(raw)는 집계 행도 같이 로드하므로 반영하지 않음
+"""
+@receiver(pre_save, sender=LedgerEntry)
+def remember_stored_rollup_state(sender, instance, raw=False, **kwargs):
+    if raw or instance.pk is None:
+        return
+    if getattr(instance, "_rollup_state", None) is None:
+        instance._rollup_state = _stored_state(instance.pk)
+
+
+@receiver(post_save, sender=LedgerEntry)
+def update_rollup_on_ledger_save(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    state = instance.rollup_state() or _stored_state(instance.pk)
+    previous = None if created else getattr(instance, "_rollup_state", None)
+
+    current = _rollup_entry(state)
+    if previous is None:
+        LedgerMonthlyRollup.apply(current, 1)
+    else:
+        LedgerMonthlyRollup.replace(_rollup_entry(previous), current)
+    instance._rollup_state = state
+
+
+@receiver(post_delete, sender=LedgerEntry)
+def update_rollup_on_ledger_delete(sender, instance, **kwargs):
+    state = getattr(instance, "_rollup_state", None) or instance.rollup_state()
+    if state is not None:
+        LedgerMonthlyRollup.apply(_rollup_entry(state), -1)
+    instance._rollup_state = None
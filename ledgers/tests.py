@@ -1,3 +1,478 @@
-from django.test import TestCase
+import csv
+import io
+import json
+from datetime import date, timedelta
+from decimal import Decimal
+from unittest import mock
 
-# Create your tests here.
+from django.core.cache import cache
+from django.core.management import call_command
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from accounts.models import User
+from dongleDongle.testing import QueryBudgetMixin
+from rates.models import ExchangeRate
+from rates.utils import rate_table
+
+from .models import LedgerEntry, LedgerIdempotencyKey, LedgerMonthlyRollup
+
+
+class LedgerQueryBudgetTest(QueryBudgetMixin, TestCase):
+    def test_ledger_by_category(self):
+        self.assertQueryBudget("ledgers:ledger_by_category", reverse("ledgers:ledger_by_category"))
+
+
+class LedgerResponseCacheTest(QueryBudgetMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+
+    def test_cached_until_ledger_changes(self):
+        url = reverse("ledgers:ledger_by_category")
+        first = self.client.get(url).json()
+
+        with CaptureQueriesContext(connection) as captured:
+            second = self.client.get(url).json()
+        self.assertEqual(second, first)
+        # 세션/유저 조회만 남음
+        self.assertLessEqual(len(captured), 2)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(
+                reverse("ledgers:ledgerCreate"),
+                {
+                    "entry_type": "EXPENSE",
+                    "date": date.today().isoformat(),
+                    "category": "FOOD",
+                    "payment_method": "CARD",
+                    "amount": "12345.00",
+                    "currency_code": "KRW",
+                },
+                content_type="application/json",
+            )
+        self.assertEqual(response.status_code, 201, response.content[:500])
+        self.assertNotEqual(self.client.get(url).json(), first)
+
+    # 캐시 키에 쿼리스트링까지 포함 (request.get_full_path)
+    def test_query_string_is_part_of_key(self):
+        url = reverse("ledgers:ledger_by_category")
+        self.client.get(url + "?page=1")
+
+        with CaptureQueriesContext(connection) as captured:
+            self.client.get(url + "?page=2")
+        self.assertGreater(len(captured), 2)
+
+        with CaptureQueriesContext(connection) as captured:
+            self.client.get(url + "?page=1")
+        self.assertLessEqual(len(captured), 2)
+
+    # 공유 캐시가 없는 기본 설정(0)에서는 매번 새로 계산
+    @override_settings(RESPONSE_CACHE_TIMEOUT=0)
+    def test_disabled_without_timeout(self):
+        url = reverse("ledgers:ledger_by_category")
+        self.client.get(url)
+
+        with CaptureQueriesContext(connection) as captured:
+            self.client.get(url)
+        self.assertGreater(len(captured), 2)
+
+
+# 가계부 API 테스트 공통 (유저 1명 + USD 환율, _create 는 등록 API 로 저장)
+class LedgerApiTestCase(TestCase):
+    def setUp(self):
+        ExchangeRate.objects.create(base_currency="KRW", target_currency="USD", rate=Decimal("0.000750"))
+        rate_table.invalidate()
+        self.user = User.objects.create_user(username="ledger", password="pw", nickname="ledger", gender="M")
+        self.client.force_login(self.user)
+
+    def tearDown(self):
+        rate_table.invalidate()
+
+    def _payload(self, **overrides):
+        payload = {
+            "entry_type": "EXPENSE",
+            "date": "2025-03-15",
+            "category": "FOOD",
+            "payment_method": "CARD",
+            "amount": "10.00",
+            "currency_code": "USD",
+        }
+        payload.update(overrides)
+        return payload
+
+    def _create(self, **overrides):
+        response = self.client.post(reverse("ledgers:ledgerCreate"), self._payload(**overrides), content_type="application/json")
+        self.assertEqual(response.status_code, 201, response.content[:500])
+        return response.json()["data"]["id"]
+
+
+"""
+    # 월별 집계(LedgerMonthlyRollup) 정합성
+    - 등록/일괄 등록/월·통화를 바꾸는 수정/삭제/쉘에서의 save()·delete() 후 집계가
+      LedgerEntry 전체 재계산(rebuild) 결과와 같아야 함
+"""
+class LedgerMonthlyRollupTest(LedgerApiTestCase):
+    def _rollups(self):
+        return sorted(
+            LedgerMonthlyRollup.objects.filter(user=self.user).values_list(
+                "month", "entry_type", "category", "currency_code", "converted_currency_code",
+                "amount_sum", "amount_converted_sum", "entry_count",
+            )
+        )
+
+    def assertRollupsMatchRebuild(self):
+        maintained = self._rollups()
+        LedgerMonthlyRollup.rebuild(user=self.user)
+        self.assertEqual(maintained, self._rollups())
+
+    def test_apply(self):
+        self._create()
+        self._create(amount="2.50")
+        self._create(date="2025-04-01", currency_code="KRW", amount="5000.00")
+
+        self.assertEqual(LedgerMonthlyRollup.objects.filter(user=self.user).count(), 2)
+        self.assertRollupsMatchRebuild()
+
+    def test_apply_many(self):
+        self._create()
+        entries = [
+            LedgerEntry(user=self.user, entry_type="EXPENSE", date=date(2025, 3, day), category="FOOD",
+                        payment_method="CASH", amount=Decimal("1.25"), currency_code="USD",
+                        amount_converted=Decimal("1666.67"), converted_currency_code="KRW")
+            for day in range(1, 6)
+        ]
+        LedgerEntry.objects.bulk_create(entries)
+        LedgerMonthlyRollup.apply_many(entries)
+
+        self.assertRollupsMatchRebuild()
+
+    def test_put_across_months_and_currencies(self):
+        ledger_id = self._create()
+        self._create(amount="3.00")
+
+        response = self.client.put(
+            reverse("ledgers:ledger_detail", args=[ledger_id]),
+            self._payload(date="2025-05-02", currency_code="KRW", amount="20000.00", category="TRAVEL"),
+            content_type="application/json",
+        )
+        self.assertEqual(response.status_code, 200, response.content[:500])
+
+        months = set(LedgerMonthlyRollup.objects.filter(user=self.user).values_list("month", flat=True))
+        self.assertEqual(months, {date(2025, 3, 1), date(2025, 5, 1)})
+        self.assertRollupsMatchRebuild()
+
+    def test_delete(self):
+        ledger_id = self._create()
+        self._create(date="2025-06-10")
+
+        response = self.client.delete(reverse("ledgers:ledger_detail", args=[ledger_id]))
+        self.assertEqual(response.status_code, 204)
+
+        self.assertFalse(LedgerMonthlyRollup.objects.filter(user=self.user, month=date(2025, 3, 1)).exists())
+        self.assertRollupsMatchRebuild()
+
+    # 관리자 페이지/쉘처럼 뷰를 거치지 않고 save()/delete() 해도 집계 유지
+    def test_model_save_and_delete_outside_views(self):
+        entry = LedgerEntry.objects.create(
+            user=self.user, entry_type="INCOME", date=date(2025, 3, 2), category="ALLOWANCE",
+            amount=Decimal("300.00"), currency_code="KRW",
+        )
+        entry.amount = "450.00"
+        entry.save()
+        self.assertRollupsMatchRebuild()
+
+        entry = LedgerEntry.objects.get(pk=entry.pk)
+        entry.date = date(2025, 7, 9)
+        entry.save()
+        self.assertRollupsMatchRebuild()
+
+        LedgerEntry.objects.filter(pk=entry.pk).delete()
+        self.assertEqual(self._rollups(), [])
+
+    def test_rebuild_repairs_drift(self):
+        self._create()
+        LedgerMonthlyRollup.objects.filter(user=self.user).update(amount_sum=Decimal("999.00"), entry_count=7)
+
+        LedgerMonthlyRollup.rebuild(user=self.user)
+
+        rollup = LedgerMonthlyRollup.objects.get(user=self.user)
+        self.assertEqual((rollup.amount_sum, rollup.entry_count), (Decimal("10.00"), 1))
+
+
+"""
+    # 날짜별 조회 월 단위 페이지 (?months=, ?cursor=YYYY-MM)
+    - 내역이 있는 월만 months 개씩, cursor 월(포함)부터 과거 방향으로
+"""
+class LedgerMonthWindowTest(LedgerApiTestCase):
+    def setUp(self):
+        super().setUp()
+        for day in ("2025-01-20", "2025-02-03", "2025-03-15", "2025-03-01", "2025-05-31"):
+            self._create(date=day)
+        self.url = reverse("ledgers:ledger_by_date")
+
+    def _get(self, **params):
+        response = self.client.get(self.url, params)
+        self.assertEqual(response.status_code, 200, response.content[:500])
+        body = response.json()
+        return [block["month"] for block in body["data"]], body.get("next_cursor", "absent")
+
+    def test_pages_follow_next_cursor(self):
+        self.assertEqual(self._get(months=2), (["2025-05", "2025-03"], "2025-02"))
+        self.assertEqual(self._get(months=2, cursor="2025-02"), (["2025-02", "2025-01"], None))
+
+    def test_window_contains_whole_months(self):
+        response = self.client.get(self.url, {"months": 1, "cursor": "2025-03"})
+        days = [day["date"] for day in response.json()["data"][0]["days"]]
+        self.assertEqual(days, ["2025-03-15", "2025-03-01"])
+
+    def test_cursor_on_empty_month_starts_at_previous_month(self):
+        self.assertEqual(self._get(months=1, cursor="2025-04"), (["2025-03"], "2025-02"))
+
+    def test_cursor_before_first_month_is_empty(self):
+        self.assertEqual(self._get(cursor="2024-12"), ([], None))
+
+    def test_cursor_after_last_month_starts_at_latest(self):
+        self.assertEqual(self._get(months=1, cursor="2030-01"), (["2025-05"], "2025-03"))
+
+    def test_months_is_clamped(self):
+        self.assertEqual(self._get(months=0)[0], ["2025-05"])
+        self.assertEqual(self._get(months=99), (["2025-05", "2025-03", "2025-02", "2025-01"], None))
+        # 숫자가 아니면 기본값(3개월)
+        self.assertEqual(self._get(months="abc"), (["2025-05", "2025-03", "2025-02"], "2025-01"))
+
+    def test_invalid_cursor(self):
+        for cursor in ("2025-13", "2025/03", "abc", "2025-03-01"):
+            response = self.client.get(self.url, {"cursor": cursor})
+            self.assertEqual(response.status_code, 400, cursor)
+
+    def test_without_params_returns_everything(self):
+        self.assertEqual(self._get(), (["2025-05", "2025-03", "2025-02", "2025-01"], "absent"))
+
+
+"""
+    # 일괄 등록 (JSON 배열 / {"entries": [...]} / CSV 본문 / CSV 파일)
+    - 한 행이라도 틀리면 아무것도 저장하지 않고 행 번호(1부터)별 오류 반환
+"""
+class LedgerBulkCreateTest(LedgerApiTestCase):
+    csv_text = (
+        "entry_type,date,payment_method,category,amount,currency_code\n"
+        "EXPENSE,2025-03-01,CARD,FOOD,12.50,usd\n"
+        "INCOME,2025-04-02,,ALLOWANCE,300000,KRW\n"
+    )
+
+    def setUp(self):
+        super().setUp()
+        self.url = reverse("ledgers:ledger_bulk_create")
+
+    def _post_json(self, data):
+        return self.client.post(self.url, data, content_type="application/json")
+
+    def assertCreated(self, response, count):
+        self.assertEqual(response.status_code, 201, response.content[:500])
+        self.assertEqual(response.json()["data"], {"created": count})
+        self.assertEqual(LedgerEntry.objects.filter(user=self.user).count(), count)
+
+    def test_json_array(self):
+        response = self._post_json([self._payload(), self._payload(date="2025-04-01", amount="5.00")])
+
+        self.assertCreated(response, 2)
+        entry = LedgerEntry.objects.get(user=self.user, date=date(2025, 3, 15))
+        self.assertEqual((entry.amount_converted, entry.converted_currency_code), (Decimal("13333.33"), "KRW"))
+        self.assertEqual(LedgerMonthlyRollup.objects.filter(user=self.user).count(), 2)
+
+    def test_json_entries_object(self):
+        self.assertCreated(self._post_json({"entries": [self._payload()]}), 1)
+
+    def test_csv_body(self):
+        response = self.client.post(self.url, self.csv_text, content_type="text/csv")
+
+        self.assertCreated(response, 2)
+        self.assertTrue(LedgerEntry.objects.filter(user=self.user, currency_code="USD", amount=Decimal("12.50")).exists())
+        self.assertTrue(LedgerEntry.objects.filter(user=self.user, entry_type="INCOME", payment_method__isnull=True).exists())
+
+    def test_csv_file_with_bom(self):
+        upload = SimpleUploadedFile("ledger.csv", ("\ufeff" + self.csv_text).encode("utf-8"), content_type="text/csv")
+        self.assertCreated(self.client.post(self.url, {"file": upload}), 2)
+
+    def test_row_errors_are_numbered_and_nothing_is_saved(self):
+        response = self._post_json([
+            self._payload(),
+            self._payload(amount="-1"),
+            self._payload(),
+            self._payload(entry_type="INCOME", category="ALLOWANCE"),
+        ])
+
+        self.assertEqual(response.status_code, 400)
+        errors = response.json()["error"]
+        self.assertEqual([error["row"] for error in errors], [2, 4])
+        self.assertIn("amount", errors[0]["errors"])
+        self.assertIn("payment_method", errors[1]["errors"])
+        self.assertFalse(LedgerEntry.objects.filter(user=self.user).exists())
+        self.assertFalse(LedgerMonthlyRollup.objects.filter(user=self.user).exists())
+
+    def test_csv_row_error(self):
+        text = self.csv_text + "EXPENSE,2025-13-01,CARD,FOOD,1,KRW\n"
+        response = self.client.post(self.url, text, content_type="text/csv")
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual([error["row"] for error in response.json()["error"]], [3])
+        self.assertFalse(LedgerEntry.objects.filter(user=self.user).exists())
+
+    def test_empty_or_wrong_shape(self):
+        for data in ([], {}, {"entries": "x"}):
+            self.assertEqual(self._post_json(data).status_code, 400, data)
+
+    def test_too_many_rows(self):
+        with mock.patch("ledgers.views.LEDGER_BULK_MAX_ROWS", 2):
+            response = self._post_json([self._payload()] * 3)
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(LedgerEntry.objects.filter(user=self.user).exists())
+
+    # 저장 도중 실패하면 이미 넣은 행까지 전부 롤백
+    def test_failure_after_insert_rolls_back(self):
+        with mock.patch.object(LedgerMonthlyRollup, "apply_many", side_effect=RuntimeError("boom")):
+            with self.assertRaises(RuntimeError):
+                self._post_json([self._payload(), self._payload()])
+        self.assertFalse(LedgerEntry.objects.filter(user=self.user).exists())
+
+
+"""
+    # 전체 내역 내보내기 (?type=csv / ndjson 스트리밍)
+    - (date, created_at, id) 순서, chunk 경계에서 빠지거나 겹치는 행이 없어야 함
+"""
+class LedgerExportTest(LedgerApiTestCase):
+    def setUp(self):
+        super().setUp()
+        self.url = reverse("ledgers:ledger_export")
+        self.ids = [
+            self._create(date="2025-03-02"),
+            self._create(date="2025-03-01", entry_type="INCOME", category="ALLOWANCE", payment_method=None, currency_code="KRW", amount="5000"),
+            self._create(date="2025-03-02"),
+            self._create(date="2025-03-02"),
+            self._create(date="2025-04-10"),
+        ]
+        # 같은 날짜 + 같은 created_at 이면 id 로 순서 결정
+        LedgerEntry.objects.filter(pk__in=self.ids[2:4]).update(created_at=LedgerEntry.objects.get(pk=self.ids[0]).created_at)
+        self.expected_ids = [self.ids[1], self.ids[0], self.ids[2], self.ids[3], self.ids[4]]
+
+        other = User.objects.create_user(username="other", password="pw", nickname="other", gender="F")
+        LedgerEntry.objects.create(user=other, entry_type="INCOME", date=date(2025, 3, 1), category="ETC", amount=1, currency_code="KRW")
+
+    def _export(self, export_type):
+        response = self.client.get(self.url, {"type": export_type})
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        return response, b"".join(response.streaming_content).decode("utf-8")
+
+    def test_csv(self):
+        response, body = self._export("csv")
+
+        self.assertEqual(response["Content-Type"], "text/csv; charset=utf-8")
+        self.assertIn('.csv"', response["Content-Disposition"])
+        self.assertTrue(body.startswith("\ufeff"))
+        rows = list(csv.DictReader(io.StringIO(body.lstrip("\ufeff"))))
+        self.assertEqual([int(row["id"]) for row in rows], self.expected_ids)
+        income = rows[0]
+        self.assertEqual((income["payment_method"], income["converted_currency_code"], income["amount"]), ("", "", "5000.00"))
+        self.assertEqual((rows[1]["amount_converted"], rows[1]["converted_currency_code"]), ("13333.33", "KRW"))
+
+    def test_ndjson(self):
+        response, body = self._export("ndjson")
+
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        items = [json.loads(line) for line in body.splitlines()]
+        self.assertEqual([item["id"] for item in items], self.expected_ids)
+        self.assertIsNone(items[0]["payment_method"])
+        self.assertEqual((items[1]["date"], items[1]["amount"]), ("2025-03-02", "10.00"))
+
+    def test_chunk_boundaries(self):
+        for chunk_size in (1, 2, 3, 5, 6):
+            with mock.patch("ledgers.views.LEDGER_EXPORT_CHUNK_SIZE", chunk_size):
+                _, body = self._export("ndjson")
+            self.assertEqual([json.loads(line)["id"] for line in body.splitlines()], self.expected_ids, chunk_size)
+
+    def test_empty(self):
+        LedgerEntry.objects.filter(user=self.user).delete()
+        _, body = self._export("csv")
+        self.assertEqual(body.splitlines(), ["\ufeffid,entry_type,date,payment_method,category,amount,currency_code,amount_converted,converted_currency_code"])
+        self.assertEqual(self._export("ndjson")[1], "")
+
+    def test_invalid_type(self):
+        self.assertEqual(self.client.get(self.url, {"type": "xml"}).status_code, 400)
+
+
+"""
+    # 가계부 등록 Idempotency-Key
+    - 같은 키 + 같은 본문 재시도: 저장 없이 첫 응답(201) + Idempotent-Replayed
+    - 같은 키 + 다른 본문: 422, 처리 중인 키: 409
+"""
+class LedgerIdempotencyTest(LedgerApiTestCase):
+    def setUp(self):
+        super().setUp()
+        self.url = reverse("ledgers:ledgerCreate")
+
+    def _post(self, key, **overrides):
+        headers = {"HTTP_IDEMPOTENCY_KEY": key} if key is not None else {}
+        return self.client.post(self.url, self._payload(**overrides), content_type="application/json", **headers)
+
+    def test_replay_returns_first_response(self):
+        first = self._post("key-1")
+        self.assertEqual(first.status_code, 201)
+        self.assertFalse(first.has_header("Idempotent-Replayed"))
+
+        replay = self._post("key-1")
+        self.assertEqual(replay.status_code, 201)
+        self.assertEqual(replay["Idempotent-Replayed"], "true")
+        self.assertEqual(replay.json(), first.json())
+        self.assertEqual(LedgerEntry.objects.filter(user=self.user).count(), 1)
+        self.assertEqual(LedgerMonthlyRollup.objects.get(user=self.user).entry_count, 1)
+
+    def test_same_key_with_different_body(self):
+        self._post("key-1")
+        response = self._post("key-1", amount="99.00")
+
+        self.assertEqual(response.status_code, 422)
+        self.assertEqual(LedgerEntry.objects.filter(user=self.user).count(), 1)
+
+    def test_key_in_progress(self):
+        LedgerIdempotencyKey.objects.create(user=self.user, key="key-1", request_hash="x")
+        self.assertEqual(self._post("key-1").status_code, 409)
+        self.assertFalse(LedgerEntry.objects.filter(user=self.user).exists())
+
+    def test_keys_are_per_user(self):
+        self._post("key-1")
+        other = User.objects.create_user(username="other", password="pw", nickname="other", gender="F")
+        self.client.force_login(other)
+
+        response = self._post("key-1")
+        self.assertEqual(response.status_code, 201)
+        self.assertFalse(response.has_header("Idempotent-Replayed"))
+        self.assertEqual(LedgerEntry.objects.filter(user=other).count(), 1)
+
+    def test_invalid_request_does_not_claim_key(self):
+        self.assertEqual(self._post("key-1", amount="-1").status_code, 400)
+        self.assertFalse(LedgerIdempotencyKey.objects.exists())
+        self.assertEqual(self._post("key-1").status_code, 201)
+
+    def test_without_key_every_request_creates(self):
+        self._post(None)
+        self._post(None)
+        self.assertEqual(LedgerEntry.objects.filter(user=self.user).count(), 2)
+
+    def test_key_too_long(self):
+        self.assertEqual(self._post("k" * 256).status_code, 400)
+        self.assertFalse(LedgerEntry.objects.filter(user=self.user).exists())
+
+    def test_purge_old_keys(self):
+        self._post("old")
+        self._post("new")
+        LedgerIdempotencyKey.objects.filter(key="old").update(created_at=timezone.now() - timedelta(hours=25))
+
+        call_command("purge_idempotency_keys", stdout=io.StringIO())
+
+        self.assertEqual(list(LedgerIdempotencyKey.objects.values_list("key", flat=True)), ["new"])
@@ -5,7 +5,9 @@ app_name = 'ledgers'
 
 urlpatterns = [
     path('fill/', LedgerEntryCreateView.as_view(), name='ledgerCreate'),
+    path('fill/bulk/', LedgerEntryBulkCreateView.as_view(), name='ledger_bulk_create'),
     path("date/", MyLedgerAllDateView.as_view(), name="ledger_by_date"),
+    path("export/", LedgerExportView.as_view(), name="ledger_export"),
     path("category/", MyLedgerAllCategoryView.as_view(), name="ledger_by_category"),
     path("fill/<int:ledger_id>/", LedgerEntryDetailView.as_view(), name="ledger_detail"),
     path("fill/<int:ledger_id>", LedgerEntryDetailView.as_view()), # 슬래시 없는 url도 가능하도록
@@ -1,16 +1,28 @@
+import csv
+import hashlib
+import io
+import json
+
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
 from rest_framework.permissions import IsAuthenticated
 from datetime import datetime, date as date_type
 from collections import defaultdict
+from itertools import groupby
 from datetime import date
-from django.db.models import QuerySet
-from rates.views import convert_to_krw, convert_from_krw
+from django.db import IntegrityError, transaction
+from django.http import StreamingHttpResponse
+from django.db.models import Q, QuerySet, Sum
+from rates.views import convert_to_krw, convert_from_krw, convert_totals
+from rates.utils import rate_table
+from accounts.context import get_user_context
+from dongleDongle.cache import bump_user_version, cache_user_response
 
 from .serializers import *
 from .models import *
 from budgets.models import Budget, LivingBudget, BaseBudget, BaseBudgetItem
+from feeds.models import FeedCostSummary
 from decimal import Decimal, InvalidOperation
 
 
@@ -24,20 +36,6 @@ LIVING_CATEGORIES = {
     "STUDY_MATERIALS",
 }
 
-COUNTRY_TO_CURRENCY = {
-    "한국": "KRW",
-    "미국": "USD",
-    "일본": "JPY",
-    "독일": "EUR",
-    "프랑스": "EUR",
-    "중국": "CNY",
-    "대만": "TWD",
-    "캐나다": "CAD",
-    "이탈리아": "EUR",
-    "네덜란드": "EUR",
-    "영국": "GBP",
-}
-
 
 def ok(message, data=None, status=200):
     return Response({"message": message, "data": data}, status=status)
@@ -60,9 +58,41 @@ def safe_decimal(value):
         return Decimal("0.00")
 
 
+# Idempotency-Key 헤더 (없으면 None)
+IDEMPOTENCY_KEY_MAX_LENGTH = 255
+
+
+def _request_hash(data):
+    if hasattr(data, "dict"):
+        data = data.dict()
+    payload = json.dumps(data, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+# 키 선점: 처음이면 새 행, 이미 있으면 (None, 기존 행)
+def _claim_idempotency_key(user, key, request_hash):
+    try:
+        with transaction.atomic():
+            return LedgerIdempotencyKey.objects.create(user=user, key=key, request_hash=request_hash), None
+    except IntegrityError:
+        # 동시에 같은 키로 들어온 요청은 먼저 들어온 트랜잭션이 끝날 때까지 기다렸다가 여기로 옴
+        return None, LedgerIdempotencyKey.objects.filter(user=user, key=key).first()
+
+
+def _replay_idempotent_response(record, request_hash):
+    if record is None or record.response_status is None:
+        return bad("등록 실패", "같은 Idempotency-Key 요청을 처리 중입니다.", status=409)
+    if record.request_hash != request_hash:
+        return bad("등록 실패", "같은 Idempotency-Key로 다른 내용을 보낼 수 없습니다.", status=422)
+    response = Response(record.response_body, status=record.response_status)
+    response["Idempotent-Replayed"] = "true"
+    return response
+
+
 class LedgerEntryCreateView(APIView):
     permission_classes = [IsAuthenticated]
 
+    @transaction.atomic
     def post(self, request):
         serializer = LedgerEntryCreateSerializer(
             data=request.data,
@@ -71,56 +101,333 @@ class LedgerEntryCreateView(APIView):
         if not serializer.is_valid():
             return bad("유효성 검사 실패", serializer.errors, status=400)
 
+        # 재시도 요청이면 저장하지 않고 첫 응답을 그대로 반환
+        key = request.headers.get("Idempotency-Key")
+        record = None
+        if key:
+            if len(key) > IDEMPOTENCY_KEY_MAX_LENGTH:
+                return bad("유효성 검사 실패", f"Idempotency-Key는 {IDEMPOTENCY_KEY_MAX_LENGTH}자 이하여야 합니다.", status=400)
+            request_hash = _request_hash(request.data)
+            record, existing = _claim_idempotency_key(request.user, key, request_hash)
+            if record is None:
+                return _replay_idempotent_response(existing, request_hash)
+
+        # 월별 집계는 post_save 시그널에서 반영
         entry = serializer.save()
 
-        month_first = entry.date.replace(day=1)
-        ledger, _ = Ledger.objects.get_or_create(user=request.user, month=month_first)
-        ledger.ledger_entries.add(entry)
-
         data = LedgerEntrySimpleSerializer(entry).data
-        return ok("등록 완료", data, status=201)
+        response = ok("등록 완료", data, status=201)
+
+        if record is not None:
+            record.entry = entry
+            record.response_status = response.status_code
+            record.response_body = response.data
+            record.save(update_fields=["entry", "response_status", "response_body"])
+        return response
+
+
+# 일괄 등록 (JSON 배열 또는 CSV)
+LEDGER_BULK_MAX_ROWS = 10000
+LEDGER_BULK_BATCH_SIZE = 1000
+LEDGER_CSV_FIELDS = ("entry_type", "date", "payment_method", "category", "amount", "currency_code")
+
+
+def _read_csv_rows(text):
+    reader = csv.DictReader(io.StringIO(text))
+    rows = []
+    for row in reader:
+        item = {field: (row.get(field) or "").strip() for field in LEDGER_CSV_FIELDS}
+        # CSV 빈 칸은 값 없음으로 (수입은 결제수단을 비워둠)
+        rows.append({field: value for field, value in item.items() if value != ""})
+    return rows
+
+
+def _bulk_rows(request):
+    if request.content_type.startswith("text/csv"):
+        return _read_csv_rows(request.body.decode("utf-8-sig"))
+    upload = request.FILES.get("file")
+    if upload is not None:
+        return _read_csv_rows(upload.read().decode("utf-8-sig"))
+    data = request.data
+    if isinstance(data, dict):
+        data = data.get("entries")
+    return data
+
+
+class LedgerEntryBulkCreateView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    @transaction.atomic
+    def post(self, request):
+        # 1) 입력 읽기
+        try:
+            rows = _bulk_rows(request)
+        except (UnicodeDecodeError, csv.Error) as e:
+            return bad("CSV 형식 오류", str(e), status=400)
+        if not isinstance(rows, list) or not rows:
+            return bad("유효성 검사 실패", "등록할 항목 목록(JSON 배열 또는 CSV)이 필요합니다.", status=400)
+        if len(rows) > LEDGER_BULK_MAX_ROWS:
+            return bad("유효성 검사 실패", f"한 번에 최대 {LEDGER_BULK_MAX_ROWS}건까지 등록할 수 있습니다.", status=400)
+
+        #2) 전체 검증 (하나라도 실패하면 아무것도 저장하지 않고 행 번호별 오류 반환)
+        serializer = LedgerEntryCreateSerializer(
+            data=rows,
+            many=True,
+            context={"request": request},
+        )
+        if not serializer.is_valid():
+            errors = serializer.errors
+            if isinstance(errors, list):
+                errors = [
+                    {"row": index, "errors": row_errors}
+                    for index, row_errors in enumerate(errors, start=1)
+                    if row_errors
+                ]
+            return bad("유효성 검사 실패", errors, status=400)
+
+        #3) 환율 스냅샷 하나로 전부 환산 후 bulk_create
+        user = request.user
+        rates = rate_table.rates()
+        builder = serializer.child
+        entries = [
+            builder.build_entry(user, validated_data, rates)
+            for validated_data in serializer.validated_data
+        ]
+        LedgerEntry.objects.bulk_create(entries, batch_size=LEDGER_BULK_BATCH_SIZE)
+
+        #4) bulk_create 는 시그널이 없으므로 집계/응답 캐시 버전을 직접 갱신
+        LedgerMonthlyRollup.apply_many(entries, 1)
+        FeedCostSummary.refresh_if_published(user.id, base_budget=False)
+        bump_user_version(user.id)
+
+        return ok("일괄 등록 완료", {"created": len(entries)}, status=201)
+
+
+# 전체 내역 내보내기 (CSV / NDJSON 스트리밍)
+LEDGER_EXPORT_CHUNK_SIZE = 2000
+LEDGER_EXPORT_FIELDS = (
+    "id",
+    "entry_type",
+    "date",
+    "payment_method",
+    "category",
+    "amount",
+    "currency_code",
+    "amount_converted",
+    "converted_currency_code",
+)
+
+
+class _Echo:
+    # csv.writer 가 쓴 한 줄을 그대로 돌려주는 버퍼
+    def write(self, value):
+        return value
+
+
+def _export_value(value):
+    if value is None:
+        return None
+    if isinstance(value, (Decimal, date_type)):
+        return str(value)
+    return value
+
+
+# (date, created_at, id) 키셋으로 chunk 단위만 읽기
+# MySQL(mysqlclient)은 .iterator() 를 써도 결과 전체를 클라이언트에 버퍼링하므로
+# chunk 마다 인덱스 범위 조회를 새로 해서 메모리를 일정하게 유지
+def _iter_export_rows(user):
+    base = LedgerEntry.objects.filter(user=user).order_by("date", "created_at", "id")
+    last = None
+    while True:
+        qs = base
+        if last is not None:
+            last_date, last_created_at, last_id = last
+            qs = qs.filter(
+                Q(date__gt=last_date)
+                | Q(date=last_date, created_at__gt=last_created_at)
+                | Q(date=last_date, created_at=last_created_at, id__gt=last_id)
+            )
+        chunk = list(qs.values_list("created_at", *LEDGER_EXPORT_FIELDS)[:LEDGER_EXPORT_CHUNK_SIZE])
+        for row in chunk:
+            yield row[1:]
+        if len(chunk) < LEDGER_EXPORT_CHUNK_SIZE:
+            return
+        created_at, row = chunk[-1][0], chunk[-1][1:]
+        last = (row[LEDGER_EXPORT_FIELDS.index("date")], created_at, row[0])
+
+
+def _export_csv_lines(rows):
+    writer = csv.writer(_Echo())
+    # 엑셀에서 한글이 깨지지 않도록 BOM
+    yield "\ufeff" + writer.writerow(LEDGER_EXPORT_FIELDS)
+    for row in rows:
+        yield writer.writerow(["" if value is None else _export_value(value) for value in row])
+
+
+def _export_ndjson_lines(rows):
+    for row in rows:
+        item = {field: _export_value(value) for field, value in zip(LEDGER_EXPORT_FIELDS, row)}
+        yield json.dumps(item, ensure_ascii=False) + "\n"
+
+
+class LedgerExportView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        # ?format= 은 DRF 렌더러 선택에 쓰이므로 type 으로 받음
+        export_type = request.query_params.get("type", "csv").lower()
+        if export_type not in ("csv", "ndjson"):
+            return bad("잘못된 type 값입니다.", "csv 또는 ndjson", status=400)
+
+        rows = _iter_export_rows(request.user)
+
+        filename = f"ledger_{date.today():%Y%m%d}.{export_type}"
+        if export_type == "csv":
+            response = StreamingHttpResponse(_export_csv_lines(rows), content_type="text/csv; charset=utf-8")
+        else:
+            response = StreamingHttpResponse(_export_ndjson_lines(rows), content_type="application/x-ndjson")
+        response["Content-Disposition"] = f'attachment; filename="{filename}"'
+        return response
+
+
+# 날짜별 조회 월 단위 페이지 (months 개월씩, cursor 는 "YYYY-MM")
+LEDGER_MONTH_WINDOW = 3
+LEDGER_MAX_MONTH_WINDOW = 12
+
+
+def _get_month_window(value):
+    try:
+        months = int(value)
+    except (TypeError, ValueError):
+        return LEDGER_MONTH_WINDOW
+    return max(1, min(months, LEDGER_MAX_MONTH_WINDOW))
+
+
+def _parse_month_cursor(value):
+    return datetime.strptime(value, "%Y-%m").date()
+
+
+def _next_month(month_start):
+    if month_start.month == 12:
+        return month_start.replace(year=month_start.year + 1, month=1)
+    return month_start.replace(month=month_start.month + 1)
+
+
+# -date, -created_at 으로 정렬된 내역을 월 -> 일 블록으로 묶기
+def _build_month_blocks(entries):
+    month_blocks = []
+    for month_key, month_entries in groupby(entries, key=lambda e: e.date.replace(day=1)):
+        days = []
+        for day, day_entries in groupby(month_entries, key=lambda e: e.date):
+            days.append(
+                {
+                    "date": day.isoformat(),
+                    "weekday_ko": _weekday_ko(day),
+                    "items": LedgerEntrySimpleSerializer(list(day_entries), many=True).data,
+                }
+            )
+        month_blocks.append(
+            {
+                "month": month_key.strftime("%Y-%m"),
+                "days": days,
+            }
+        )
+    return month_blocks
 
 
 class MyLedgerAllDateView(APIView):
     permission_classes = [IsAuthenticated]
 
     def get(self, request):
+        params = request.query_params
+        if "months" in params or "cursor" in params:
+            return self._get_window(request)
+
         qs = (
             LedgerEntry.objects
             .filter(user=request.user)
             .order_by("-date", "-created_at")
         )
+        return ok("내 가계부 전체 조회 성공", _build_month_blocks(qs.iterator(chunk_size=500)))
 
-        months = defaultdict(list)
-        for e in qs:
-            month_key = e.date.replace(day=1)
-            months[month_key].append(e)
-
-        month_blocks = []
-        for month_key in sorted(months.keys(), reverse=True):
-            days_map = defaultdict(list)
-            for e in months[month_key]:
-                days_map[e.date].append(e)
-
-            days = []
-            for day in sorted(days_map.keys(), reverse=True):
-                items = LedgerEntrySimpleSerializer(days_map[day], many=True).data
-                days.append(
-                    {
-                        "date": day.isoformat(),
-                        "weekday_ko": _weekday_ko(day),
-                        "items": items,
-                    }
-                )
-
-            month_blocks.append(
-                {
-                    "month": month_key.strftime("%Y-%m"),
-                    "days": days,
-                }
-            )
+    # 월 범위 페이지 조회 (전체 기간과 상관없이 months 개월만 읽음)
+    def _get_window(self, request):
+        window = _get_month_window(request.query_params.get("months"))
+
+        # 1) 내역이 있는 월 목록은 월별 집계에서 가져오기
+        rollups = LedgerMonthlyRollup.objects.filter(user=request.user)
+        cursor = request.query_params.get("cursor")
+        if cursor:
+            try:
+                rollups = rollups.filter(month__lte=_parse_month_cursor(cursor))
+            except ValueError:
+                return bad("잘못된 cursor 값입니다. (YYYY-MM)")
+
+        months = list(
+            rollups
+            .order_by("-month")
+            .values_list("month", flat=True)
+            .distinct()[:window + 1]
+        )
+        next_cursor = months[window].strftime("%Y-%m") if len(months) > window else None
+        months = months[:window]
 
-        return ok("내 가계부 전체 조회 성공", month_blocks)
+        if not months:
+            response = ok("내 가계부 전체 조회 성공", [])
+            response.data["next_cursor"] = None
+            return response
+
+        # 2) 해당 월 범위의 내역만 인덱스 순서대로 읽어서 묶기
+        qs = (
+            LedgerEntry.objects
+            .filter(user=request.user, date__gte=months[-1], date__lt=_next_month(months[0]))
+            .order_by("-date", "-created_at")
+        )
+        response = ok("내 가계부 전체 조회 성공", _build_month_blocks(qs.iterator(chunk_size=500)))
+        response.data["next_cursor"] = next_cursor
+        return response
+
+
+# 수입/지출 합계
+# 월별 집계(LedgerMonthlyRollup)에서 (entry_type, 통화)별 SUM만 가져오고, 환산은 집계된 행에만 적용
+def _sum_rollups_by_currency(rollups, foreign_currency):
+    rows = (
+        rollups
+        .order_by()
+        .values("entry_type", "currency_code", "converted_currency_code")
+        .annotate(amount_sum=Sum("amount_sum"), converted_sum=Sum("amount_converted_sum"))
+    )
+
+    # 등록 당시 교환국 통화로 환산된 금액이 있는 행 -> 외화는 저장된 값 사용
+    stored_pairs = defaultdict(list)
+    stored_foreign = defaultdict(lambda: Decimal("0.00"))
+    # 나머지 행 -> 원화 합계를 외화로 한 번에 환산
+    pairs = defaultdict(list)
+
+    for row in rows:
+        entry_type = row["entry_type"]
+        amount = row["amount_sum"]
+        currency_code = row["currency_code"]
+        converted_sum = row["converted_sum"]
+        converted_currency_code = row["converted_currency_code"]
+
+        if foreign_currency != "KRW" and converted_sum and converted_currency_code == foreign_currency:
+            stored_pairs[entry_type].append((amount, currency_code))
+            stored_foreign[entry_type] += safe_decimal(converted_sum)
+        elif converted_sum and converted_currency_code == "KRW":
+            pairs[entry_type].append((converted_sum, "KRW"))
+        else:
+            pairs[entry_type].append((amount, currency_code))
+
+    totals = {}
+    for entry_type, _ in LedgerEntry.EntryType.choices:
+        stored_krw, _ = convert_totals(stored_pairs[entry_type])
+        pairs_krw, pairs_foreign = convert_totals(pairs[entry_type], foreign_currency)
+
+        total_foreign = (stored_foreign[entry_type] + pairs_foreign).quantize(Decimal("0.01"))
+        total_krw = (stored_krw + pairs_krw).quantize(Decimal("0.01"))
+        totals[entry_type] = (total_foreign, total_krw)
+    return totals
 
 
 def _weekday_ko(d: date_type) -> str:
@@ -131,33 +438,38 @@ def _weekday_ko(d: date_type) -> str:
 class MyLedgerAllCategoryView(APIView):
     permission_classes = [IsAuthenticated]
 
+    @cache_user_response("ledgers:ledger_by_category")
     def get(self, request):
         user = request.user
         today = date.today()
         month_start = today.replace(day=1)
 
-        entries = (
-            LedgerEntry.objects
-            .filter(user=user, date__gte=month_start, date__lte=today)
-            .order_by("-date", "-created_at")
+        # 이번 달 카테고리/통화별 합계는 월별 집계에서 가져오기
+        rows = (
+            LedgerMonthlyRollup.objects
+            .filter(user=user, month=month_start)
+            .values("category", "currency_code")
+            .annotate(amount_sum=Sum("amount_sum"))
+            .order_by()
         )
 
-        foreign_currency = self._foreign_currency(user)
+        context = get_user_context(request)
+        foreign_currency = context.currency
 
         # 카테고리별 합계
         category_totals = defaultdict(lambda: {"krw": Decimal("0.00"), "foreign": Decimal("0.00")})
         living_krw_total = Decimal("0.00")
         living_foreign_total = Decimal("0.00")
 
-        for entry in entries:
-            krw_amount = self._to_krw(entry)
+        for row in rows:
+            krw_amount = self._to_krw(row["amount_sum"], row["currency_code"])
             if krw_amount is None:
                 continue
             foreign_amount = self._to_foreign(krw_amount, foreign_currency)
-            category_totals[entry.category]["krw"] += krw_amount
-            category_totals[entry.category]["foreign"] += foreign_amount
+            category_totals[row["category"]]["krw"] += krw_amount
+            category_totals[row["category"]]["foreign"] += foreign_amount
 
-            if entry.category in LIVING_CATEGORIES:
+            if row["category"] in LIVING_CATEGORIES:
                 living_krw_total += krw_amount
                 living_foreign_total += foreign_amount
 
@@ -165,13 +477,12 @@ class MyLedgerAllCategoryView(APIView):
         living_foreign_total = living_foreign_total.quantize(Decimal("0.01"))
 
         # 예산(LivingBudget) 비교 (한화 기준으로만)
-        budget = Budget.objects.filter(user=user).first()
         diff_krw = Decimal("0.00")
         diff_foreign = Decimal("0.00")
         diff_sign = "-"
 
-        if budget and hasattr(budget, "living_budget"):
-            living_budget = budget.living_budget
+        living_budget = context.living_budget
+        if living_budget is not None:
             budget_krw = safe_decimal(living_budget.total_amount)
 
             # 예산 - 실제
@@ -188,9 +499,8 @@ class MyLedgerAllCategoryView(APIView):
             "total": {"foreign_amount": "0.00", "foreign_currency": foreign_currency, "krw_amount": "0.00", "krw_currency": "KRW"},
         }
 
-        if budget and hasattr(budget, "base_budget"):
-            base_budget = budget.base_budget
-            items = base_budget.items.all()
+        if context.base_budget is not None:
+            items = context.base_budget_items
             total_krw = Decimal("0.00")
             total_foreign = Decimal("0.00")
 
@@ -228,9 +538,8 @@ class MyLedgerAllCategoryView(APIView):
         existing_codes = [code for code, _ in LedgerEntry.Category.choices]
 
         living_budget_items = {}
-        if budget and hasattr(budget, "living_budget"):
-            for item in budget.living_budget.items.all():
-                living_budget_items[item.type] = safe_decimal(item.amount)
+        for item in context.living_budget_items:
+            living_budget_items[item.type] = safe_decimal(item.amount)
 
         categories_payload = []
         for code in existing_codes:
@@ -286,10 +595,10 @@ class MyLedgerAllCategoryView(APIView):
         serializer = MonthlyCategoryDashboardSerializer(payload)
         return ok("내 가계부 카테고리별 합산 조회 성공", serializer.data)
 
-    def _to_krw(self, entry: LedgerEntry):
-        if entry.currency_code == "KRW":
-            return entry.amount
-        return convert_to_krw(entry.amount, entry.currency_code)
+    def _to_krw(self, amount: Decimal, currency_code: str):
+        if currency_code == "KRW":
+            return amount
+        return convert_to_krw(amount, currency_code)
 
     def _to_foreign(self, krw_amount: Decimal, foreign_currency: str):
         if foreign_currency == "KRW":
@@ -299,15 +608,6 @@ class MyLedgerAllCategoryView(APIView):
             return Decimal("0.00")
         return converted
 
-    def _foreign_currency(self, user):
-        exchange_profile = getattr(user, "exchange_profile", None)
-        if not exchange_profile:
-            return "KRW"
-        country_name = getattr(exchange_profile, "exchange_country", None)
-        if not country_name:
-            return "KRW"
-        return COUNTRY_TO_CURRENCY.get(country_name.strip(), "KRW")
-
     def _category_label_map(self):
         return {code: label for code, label in LedgerEntry.Category.choices}
 
@@ -321,13 +621,12 @@ class LedgerEntryDetailView(APIView):
         except LedgerEntry.DoesNotExist:
             return None
 
+    @transaction.atomic
     def put(self, request, ledger_id):
         entry = self._get_entry(request, ledger_id)
         if entry is None:
             return bad("수정 실패", "없거나 권한 없음", status=404)
 
-        old_date = entry.date
-
         serializer = LedgerEntryCreateSerializer(
             entry,
             data=request.data,
@@ -337,30 +636,16 @@ class LedgerEntryDetailView(APIView):
         if not serializer.is_valid():
             return bad("유효성 검사 실패", serializer.errors, status=400)
 
+        # 수정 전 값은 집계에서 빼고 수정 후 값을 더하는 것은 post_save 시그널에서 처리
         updated = serializer.save()
 
-        if updated.date != old_date:
-            old_month = old_date.replace(day=1)
-            new_month = updated.date.replace(day=1)
-
-            try:
-                old_ledger = Ledger.objects.get(user=request.user, month=old_month)
-                old_ledger.ledger_entries.remove(updated)
-            except Ledger.DoesNotExist:
-                pass
-
-            new_ledger, _ = Ledger.objects.get_or_create(
-                user=request.user,
-                month=new_month,
-            )
-            new_ledger.ledger_entries.add(updated)
-
         return ok(
             "가계부 항목이 수정되었습니다.",
             LedgerEntrySimpleSerializer(updated).data,
             status=200,
         )
 
+    @transaction.atomic
     def delete(self, request, ledger_id):
         entry = self._get_entry(request, ledger_id)
         if entry is None:
@@ -377,47 +662,18 @@ class ThisMonthSummaryView(APIView):
         user = request.user
         today = date.today()
         month_start = today.replace(day=1)
-        entries = LedgerEntry.objects.filter(
-            user=user,
-            date__gte=month_start,
-            date__lte=today,
-        )
+        rollups = LedgerMonthlyRollup.objects.filter(user=user, month=month_start)
 
-        result = self._calculate_summary(user, entries, today)
+        result = self._calculate_summary(get_user_context(request), rollups, today)
         serializer = ThisMonthSummarySerializer(result)
         return ok("이번달 수입/지출 합계 조회 성공", serializer.data)
 
-    def _calculate_summary(self, user, entries, today=None):
-        foreign_currency = self._foreign_currency(user)
+    def _calculate_summary(self, context, rollups, today=None):
+        foreign_currency = context.currency
 
-        def _sum(entry_type):
-            qs = entries.filter(entry_type=entry_type)
-            total_foreign = Decimal("0.00")
-            total_krw = Decimal("0.00")
-
-            for entry in qs:
-                krw_amount = safe_decimal(
-                    entry.amount_converted if entry.amount_converted and entry.converted_currency_code == "KRW"
-                    else entry.amount if entry.currency_code == "KRW"
-                    else convert_to_krw(entry.amount, entry.currency_code)
-                )
-
-                total_krw += krw_amount
-
-                if foreign_currency == "KRW":
-                    total_foreign += krw_amount
-                else:
-                    if entry.amount_converted and entry.converted_currency_code == foreign_currency:
-                        total_foreign += safe_decimal(entry.amount_converted)
-                    else:
-                        total_foreign += safe_decimal(convert_from_krw(krw_amount, foreign_currency))
-
-            total_foreign = total_foreign.quantize(Decimal("0.01"))
-            total_krw = total_krw.quantize(Decimal("0.01"))
-            return total_foreign, total_krw
-
-        income_foreign, income_krw = _sum(LedgerEntry.EntryType.INCOME)
-        expense_foreign, expense_krw = _sum(LedgerEntry.EntryType.EXPENSE)
+        totals = _sum_rollups_by_currency(rollups, foreign_currency)
+        income_foreign, income_krw = totals[LedgerEntry.EntryType.INCOME]
+        expense_foreign, expense_krw = totals[LedgerEntry.EntryType.EXPENSE]
 
         return {
             "month": today.strftime("%Y-%m") if today else "전체 기간",
@@ -428,60 +684,23 @@ class ThisMonthSummaryView(APIView):
             "expense_krw": expense_krw,
         }
 
-    def _foreign_currency(self, user):
-        exchange_profile = getattr(user, "exchange_profile", None)
-        if not exchange_profile:
-            return "KRW"
-
-        country_name = getattr(exchange_profile, "exchange_country", None)
-        if not country_name:
-            return "KRW"
-
-        name = country_name.strip()
-        return COUNTRY_TO_CURRENCY.get(name, "KRW")
-
 
 class TotalSummaryView(APIView):
     permission_classes = [IsAuthenticated]
 
     def get(self, request):
         user = request.user
-        entries = LedgerEntry.objects.filter(user=user)
-        result = self._calculate_summary(user, entries)
+        rollups = LedgerMonthlyRollup.objects.filter(user=user)
+        result = self._calculate_summary(get_user_context(request), rollups)
         serializer = ThisMonthSummarySerializer(result)
         return ok("전체 수입/지출 합계 조회 성공", serializer.data)
 
-    def _calculate_summary(self, user, entries, today=None):
-        foreign_currency = self._foreign_currency(user)
-
-        def _sum(entry_type):
-            qs = entries.filter(entry_type=entry_type)
-            total_foreign = Decimal("0.00")
-            total_krw = Decimal("0.00")
-
-            for entry in qs:
-                krw_amount = safe_decimal(
-                    entry.amount_converted if entry.amount_converted and entry.converted_currency_code == "KRW"
-                    else entry.amount if entry.currency_code == "KRW"
-                    else convert_to_krw(entry.amount, entry.currency_code)
-                )
-
-                total_krw += krw_amount
-
-                if foreign_currency == "KRW":
-                    total_foreign += krw_amount
-                else:
-                    if entry.amount_converted and entry.converted_currency_code == foreign_currency:
-                        total_foreign += safe_decimal(entry.amount_converted)
-                    else:
-                        total_foreign += safe_decimal(convert_from_krw(krw_amount, foreign_currency))
-
-            total_foreign = total_foreign.quantize(Decimal("0.01"))
-            total_krw = total_krw.quantize(Decimal("0.01"))
-            return total_foreign, total_krw
+    def _calculate_summary(self, context, rollups, today=None):
+        foreign_currency = context.currency
 
-        income_foreign, income_krw = _sum(LedgerEntry.EntryType.INCOME)
-        expense_foreign, expense_krw = _sum(LedgerEntry.EntryType.EXPENSE)
+        totals = _sum_rollups_by_currency(rollups, foreign_currency)
+        income_foreign, income_krw = totals[LedgerEntry.EntryType.INCOME]
+        expense_foreign, expense_krw = totals[LedgerEntry.EntryType.EXPENSE]
 
         return {
             "month": today.strftime("%Y-%m") if today else "전체 기간",
@@ -491,15 +710,3 @@ class TotalSummaryView(APIView):
             "expense_foreign": expense_foreign,
             "expense_krw": expense_krw,
         }
-
-    def _foreign_currency(self, user):
-        exchange_profile = getattr(user, "exchange_profile", None)
-        if not exchange_profile:
-            return "KRW"
-
-        country_name = getattr(exchange_profile, "exchange_country", None)
-        if not country_name:
-            return "KRW"
-
-        name = country_name.strip()
-        return COUNTRY_TO_CURRENCY.get(name, "KRW")
@@ -0,0 +1,150 @@
+import asyncio
+import random
+import time
+from decimal import Decimal, InvalidOperation
+
+import httpx
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections, connection, transaction
+from django.utils import timezone
+
+from rates.models import CurrencyOption, ExchangeRate, ExchangeRateHistory
+from rates.signals import rates_updated
+
+
+DEFAULT_API_URL = "https://open.er-api.com/v6/latest/KRW"
+RATE_QUANTUM = Decimal("0.000001")
+# ExchangeRate.rate (max_digits=10, decimal_places=6) 에 들어가는 범위
+RATE_MAX = Decimal("10000")
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+
+class FetchError(Exception):
+    pass
+
+
+# 1) 환율 API 호출 (타임아웃 + 지수 백오프 재시도)
+#    transport 는 테스트에서 httpx.MockTransport 등을 넘길 때 사용
+async def fetch_rates(url, timeout=10.0, retries=3, backoff=1.0, transport=None):
+    async with httpx.AsyncClient(timeout=httpx.Timeout(timeout), transport=transport) as client:
+        for attempt in range(retries + 1):
+            try:
+                response = await client.get(url)
+                if response.status_code not in RETRY_STATUS_CODES:
+                    response.raise_for_status()
+                    return response.json()
+                error = f"HTTP {response.status_code}"
+            except httpx.TransportError as e:
+                error = f"{type(e).__name__}: {e}"
+            except (httpx.HTTPStatusError, ValueError) as e:
+                # 4xx / JSON 오류는 재시도해도 같으므로 바로 실패
+                raise FetchError(str(e)) from e
+
+            if attempt == retries:
+                raise FetchError(f"{retries + 1}회 시도 실패 ({error})")
+            await asyncio.sleep(backoff * (2 ** attempt) + random.uniform(0, backoff))
+
+
+#2) 응답에서 저장할 통화만 골라서 Decimal 로 변환
+#   응답 형식이 다르면 FetchError, 0 이하/범위 밖 값은 건너뜀 (0 이면 환산 시 0으로 나누게 됨)
+def parse_rates(data, targets):
+    if not isinstance(data, dict):
+        raise FetchError(f"환율 API 응답 형식 오류 ({type(data).__name__})")
+    if data.get("result") == "error":
+        raise FetchError(f"환율 API 오류 응답 ({data.get('error-type', 'unknown')})")
+    values = data.get("rates") or {}
+    if not isinstance(values, dict):
+        raise FetchError(f"환율 API 응답의 rates 형식 오류 ({type(values).__name__})")
+
+    base = data.get("base") or data.get("base_code") or "KRW"
+    rates = {}
+    for target, value in values.items():
+        if target not in targets:
+            continue
+        try:
+            rate = Decimal(str(value)).quantize(RATE_QUANTUM)
+        except (InvalidOperation, TypeError):
+            continue
+        if rate.is_nan() or not 0 < rate < RATE_MAX:
+            continue
+        rates[target] = rate
+    return base, rates
+
+
+#3) 한 번의 INSERT ... ON DUPLICATE KEY UPDATE (MySQL) / ON CONFLICT (그 외) 로 전체 갱신 + 이력 추가
+@transaction.atomic
+def upsert_rates(base, rates):
+    now = timezone.now()
+    objs = [
+        ExchangeRate(base_currency=base, target_currency=target, rate=rate, updated_at=now)
+        for target, rate in rates.items()
+    ]
+    options = {
+        "update_conflicts": True,
+        "update_fields": ["base_currency", "rate", "updated_at"],
+    }
+    # MySQL 은 충돌 대상 컬럼을 지정하지 않음 (unique 인덱스 기준)
+    if connection.features.supports_update_conflicts_with_target:
+        options["unique_fields"] = ["target_currency"]
+    ExchangeRate.objects.bulk_create(objs, **options)
+    ExchangeRateHistory.objects.bulk_create(
+        ExchangeRateHistory(base_currency=base, target_currency=target, rate=rate, effective_at=now)
+        for target, rate in rates.items()
+    )
+
+    # bulk_create 는 post_save 가 없으므로 직접 알림
+    transaction.on_commit(lambda: rates_updated.send(sender=ExchangeRate, currencies=sorted(rates)))
+    return len(objs)
+
+
+class Command(BaseCommand):
+    help = "외부 API에서 환율을 받아 ExchangeRate 를 갱신합니다. --interval 을 주면 주기적으로 반복합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--url", help="환율 API 주소 (기본: settings.EXCHANGE_API_URL)")
+        parser.add_argument("--interval", type=int, default=0, help="반복 주기(초), 0이면 한 번만 실행")
+        parser.add_argument("--timeout", type=float, default=10.0, help="요청 타임아웃(초)")
+        parser.add_argument("--retries", type=int, default=3, help="실패 시 재시도 횟수")
+        parser.add_argument("--backoff", type=float, default=1.0, help="재시도 대기 기본값(초), 시도마다 2배")
+
+    def handle(self, *args, **options):
+        url = options["url"] or getattr(settings, "EXCHANGE_API_URL", DEFAULT_API_URL)
+        targets = set(getattr(settings, "EXCHANGE_TARGETS", CurrencyOption.values))
+
+        if not options["interval"]:
+            self._run_once(url, targets, options)
+            return
+
+        self.stdout.write(f"{options['interval']}초마다 환율 자동 갱신 중")
+        while True:
+            started = time.monotonic()
+            try:
+                self._run_once(url, targets, options)
+            except CommandError as e:
+                # 반복 모드에서는 한 번 실패해도 다음 주기에 다시 시도
+                self.stderr.write(str(e))
+            finally:
+                close_old_connections()
+            time.sleep(max(options["interval"] - (time.monotonic() - started), 0))
+
+    def _run_once(self, url, targets, options):
+        self.stdout.write(f"[{timezone.localtime():%Y-%m-%d %H:%M:%S}] 환율 업데이트 시작")
+        try:
+            data = asyncio.run(
+                fetch_rates(
+                    url,
+                    timeout=options["timeout"],
+                    retries=options["retries"],
+                    backoff=options["backoff"],
+                )
+            )
+            base, rates = parse_rates(data, targets)
+        except FetchError as e:
+            raise CommandError(f"환율 API 호출 실패: {e}")
+
+        if not rates:
+            raise CommandError("환율 API 응답에 저장할 통화가 없습니다.")
+
+        count = upsert_rates(base, rates)
+        self.stdout.write(self.style.SUCCESS(f"환율 업데이트 완료 ({count}개 갱신)"))
@@ -19,4 +19,20 @@ class ExchangeRate(models.Model):
     rate = models.DecimalField(max_digits = 10, decimal_places = 6)
     updated_at = models.DateTimeField(auto_now=True)
 
-    
+
+#환율 이력 (추가만 함, 수정/삭제 X)
+#ExchangeRate 가 갱신될 때마다 한 건씩 쌓아서 "특정 시점의 환율" 조회에 사용
+class ExchangeRateHistory(models.Model):
+    base_currency = models.CharField(max_length = 10, blank = True)
+    target_currency = models.CharField(max_length = 10, choices=CurrencyOption.choices)
+    rate = models.DecimalField(max_digits = 10, decimal_places = 6)
+    effective_at = models.DateTimeField(help_text="이 환율이 적용되기 시작한 시각")
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["target_currency", "effective_at"], name="rate_history_currency_at_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.target_currency} {self.rate} ({self.effective_at})"
+
@@ -5,5 +5,5 @@ from .models import *
 class ConvertResultSerializer(serializers.Serializer):
     from_currency = serializers.CharField()
     to_currency = serializers.CharField()
-    amount = serializers.DecimalField(max_digits=10, decimal_places=2)
-    converted = serializers.DecimalField(max_digits=10, decimal_places=2)
+    amount = serializers.DecimalField(max_digits=20, decimal_places=2)
+    converted = serializers.DecimalField(max_digits=20, decimal_places=2)
@@ -0,0 +1,50 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import Signal, receiver
+
+from accounts.models import ExchangeProfile
+
+from dongleDongle.cache import RATES_SCOPE, bump_versions
+
+from .models import ExchangeRate, ExchangeRateHistory
+from .utils import clear_resolved_currency, rate_table
+
+
+# 환율 일괄 갱신 완료 알림 (update_exchange_rates 커맨드, currencies=갱신된 통화 목록)
+# 같은 프로세스 안에서만 전달됨 -> 다른 프로세스(웹 워커)의 환율 테이블은
+# 아래에서 올리는 공유 캐시 RATES_SCOPE 버전을 조회마다 비교해서 다시 로드 (rates/utils.py RateTable)
+rates_updated = Signal()
+
+
+# 환율이 저장/삭제되면 프로세스 내 환율 테이블 무효화
+@receiver([post_save, post_delete], sender=ExchangeRate)
+def invalidate_rate_table(sender, **kwargs):
+    rate_table.invalidate()
+
+
+# 관리자 화면 등에서 한 건씩 저장된 환율도 이력에 추가 (커맨드의 일괄 갱신은 upsert_rates 에서 직접 추가)
+@receiver(post_save, sender=ExchangeRate)
+def append_rate_history(sender, instance, **kwargs):
+    ExchangeRateHistory.objects.create(
+        base_currency=instance.base_currency,
+        target_currency=instance.target_currency,
+        rate=instance.rate,
+        effective_at=instance.updated_at,
+    )
+
+
+@receiver(rates_updated)
+def invalidate_rate_table_on_update(sender, **kwargs):
+    rate_table.invalidate()
+
+
+# 파견 국가가 바뀌었을 수 있으므로 프로필에 저장해 둔 통화 지우기
+@receiver(post_save, sender=ExchangeProfile)
+def clear_profile_currency(sender, instance, **kwargs):
+    clear_resolved_currency(instance)
+
+
+# 환율이 바뀌면 환산 금액이 들어간 응답 캐시 전체 무효화
+@receiver([post_save, post_delete], sender=ExchangeRate)
+@receiver(rates_updated)
+def invalidate_response_cache_on_rate_change(sender, **kwargs):
+    bump_versions(RATES_SCOPE)
@@ -1,3 +1,358 @@
-from django.test import TestCase
+import asyncio
+from datetime import date, datetime
+from decimal import Decimal
+from unittest import mock
 
-# Create your tests here.
+import httpx
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from dongleDongle.cache import RATES_SCOPE, bump_versions
+
+from .management.commands.update_exchange_rates import FetchError, fetch_rates, parse_rates, upsert_rates
+from .models import ExchangeRate, ExchangeRateHistory
+from .signals import rates_updated
+from .utils import rate_table, rates_as_of
+from .views import convert_to_krw_as_of
+
+
+TARGETS = {"USD", "JPY", "EUR"}
+
+
+class ParseRatesTest(TestCase):
+    def test_picks_targets_and_quantizes(self):
+        base, rates = parse_rates(
+            {"base_code": "KRW", "rates": {"USD": 0.00075123456, "JPY": "0.108", "GBP": 0.00056}},
+            TARGETS,
+        )
+        self.assertEqual(base, "KRW")
+        self.assertEqual(rates, {"USD": Decimal("0.000751"), "JPY": Decimal("0.108000")})
+
+    def test_skips_invalid_values(self):
+        _, rates = parse_rates(
+            {"rates": {"USD": "abc", "JPY": 0, "EUR": None}},
+            TARGETS,
+        )
+        self.assertEqual(rates, {})
+
+        for value in ("-1", "NaN", "Infinity", "1e30", "10000"):
+            self.assertEqual(parse_rates({"rates": {"USD": value}}, TARGETS)[1], {}, value)
+
+    def test_missing_rates(self):
+        self.assertEqual(parse_rates({"base": "KRW"}, TARGETS), ("KRW", {}))
+
+    def test_rejects_unexpected_payload(self):
+        for data in (None, [], "KRW", 1, {"rates": ["USD", 1]}, {"rates": "USD"}):
+            with self.assertRaises(FetchError, msg=repr(data)):
+                parse_rates(data, TARGETS)
+
+    def test_rejects_error_response(self):
+        with self.assertRaisesMessage(FetchError, "unsupported-code"):
+            parse_rates({"result": "error", "error-type": "unsupported-code"}, TARGETS)
+
+
+class UpsertRatesTest(TestCase):
+    def setUp(self):
+        self.received = []
+        rates_updated.connect(self._receive)
+        rate_table.invalidate()
+
+    def tearDown(self):
+        rates_updated.disconnect(self._receive)
+        rate_table.invalidate()
+
+    def _receive(self, sender, currencies, **kwargs):
+        self.received.append(currencies)
+
+    def test_insert_then_update(self):
+        upsert_rates("KRW", {"USD": Decimal("0.000750"), "JPY": Decimal("0.108000")})
+        upsert_rates("KRW", {"USD": Decimal("0.000760"), "JPY": Decimal("0.108000")})
+
+        self.assertEqual(
+            dict(ExchangeRate.objects.values_list("target_currency", "rate")),
+            {"USD": Decimal("0.000760"), "JPY": Decimal("0.108000")},
+        )
+        # 최신 환율은 통화당 1건, 이력은 갱신마다 추가
+        self.assertEqual(ExchangeRateHistory.objects.filter(target_currency="USD").count(), 2)
+
+    def test_same_rates_twice_is_idempotent(self):
+        rates = {"USD": Decimal("0.000750"), "EUR": Decimal("0.000690")}
+        upsert_rates("KRW", rates)
+        before = dict(ExchangeRate.objects.values_list("target_currency", "rate"))
+
+        self.assertEqual(upsert_rates("KRW", rates), 2)
+        self.assertEqual(dict(ExchangeRate.objects.values_list("target_currency", "rate")), before)
+        self.assertEqual(ExchangeRate.objects.count(), 2)
+
+    def test_rates_updated_sent_on_commit(self):
+        with self.captureOnCommitCallbacks() as callbacks:
+            upsert_rates("KRW", {"USD": Decimal("0.000750"), "JPY": Decimal("0.108000")})
+        self.assertEqual(self.received, [])
+
+        for callback in callbacks:
+            callback()
+        self.assertEqual(self.received, [["JPY", "USD"]])
+
+    def test_rate_table_sees_new_rates(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            upsert_rates("KRW", {"USD": Decimal("0.000750")})
+        self.assertEqual(rate_table.get("USD"), Decimal("0.000750"))
+
+
+class FetchRatesTest(TestCase):
+    def _fetch(self, handler, retries=2):
+        return asyncio.run(fetch_rates("https://rates.test/latest/KRW", retries=retries, backoff=0, transport=httpx.MockTransport(handler)))
+
+    def test_retries_server_errors(self):
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            if len(calls) < 3:
+                return httpx.Response(503)
+            return httpx.Response(200, json={"base_code": "KRW", "rates": {"USD": 0.00075}})
+
+        self.assertEqual(self._fetch(handler)["rates"], {"USD": 0.00075})
+        self.assertEqual(len(calls), 3)
+
+    def test_gives_up_after_retries(self):
+        with self.assertRaises(FetchError):
+            self._fetch(lambda request: httpx.Response(502), retries=1)
+
+    def test_client_error_is_not_retried(self):
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            return httpx.Response(404)
+
+        with self.assertRaises(FetchError):
+            self._fetch(handler)
+        self.assertEqual(len(calls), 1)
+
+    def test_invalid_json(self):
+        with self.assertRaises(FetchError):
+            self._fetch(lambda request: httpx.Response(200, content=b"<html>"))
+
+
+"""
+    # 특정 날짜 기준 환율 (ExchangeRateHistory)
+    - 그날 자정까지 적용 중이던 마지막 환율, 첫 이력보다 이전 날짜나 이력이 없는 통화는 None
+"""
+class RatesAsOfTest(TestCase):
+    def setUp(self):
+        for effective_at, rate in (
+            (datetime(2025, 3, 1, 10), "0.000700"),
+            (datetime(2025, 3, 10, 9), "0.000800"),
+            (datetime(2025, 3, 10, 23, 59), "0.000750"),
+        ):
+            ExchangeRateHistory.objects.create(
+                base_currency="KRW", target_currency="USD", rate=Decimal(rate),
+                effective_at=timezone.make_aware(effective_at),
+            )
+
+    def test_rate_at_date(self):
+        result = rates_as_of([("USD", date(2025, 3, 1)), ("USD", date(2025, 3, 5)), ("USD", date(2025, 3, 10)), ("USD", date(2026, 1, 1))])
+        self.assertEqual(result, {
+            ("USD", date(2025, 3, 1)): Decimal("0.000700"),
+            ("USD", date(2025, 3, 5)): Decimal("0.000700"),
+            # 같은 날 여러 번 바뀌면 그날 마지막 환율
+            ("USD", date(2025, 3, 10)): Decimal("0.000750"),
+            ("USD", date(2026, 1, 1)): Decimal("0.000750"),
+        })
+
+    def test_before_earliest_history(self):
+        self.assertEqual(rates_as_of([("USD", date(2025, 2, 28))]), {("USD", date(2025, 2, 28)): None})
+
+    def test_currency_without_history(self):
+        self.assertEqual(rates_as_of([("JPY", date(2025, 3, 5))]), {("JPY", date(2025, 3, 5)): None})
+
+    def test_single_query_and_krw(self):
+        pairs = [("USD", date(2025, 3, day)) for day in range(1, 20)] + [("JPY", date(2025, 3, 5))]
+        with self.assertNumQueries(1):
+            rates_as_of(pairs)
+        with self.assertNumQueries(0):
+            self.assertEqual(rates_as_of([("KRW", date(2025, 3, 5))]), {("KRW", date(2025, 3, 5)): Decimal("1")})
+
+    def test_convert_to_krw_as_of(self):
+        self.assertEqual(
+            convert_to_krw_as_of([
+                (Decimal("7.00"), "USD", date(2025, 3, 5)),
+                (Decimal("7.50"), "USD", date(2025, 3, 11)),
+                (Decimal("7.00"), "USD", date(2025, 2, 1)),
+                (Decimal("100"), "JPY", date(2025, 3, 5)),
+                (Decimal("5000"), "KRW", date(2025, 3, 5)),
+            ]),
+            [Decimal("10000.00"), Decimal("10000.00"), None, None, Decimal("5000.00")],
+        )
+
+
+"""
+    # 환율 변환 API (/rates/convert/, /rates/convert/batch/)
+    - 응답 자릿수(max_digits=20, 소수 2자리)를 넘는 금액/결과는 500 이 아니라 400, 일괄 변환은 항목별 오류
+"""
+class ConvertViewTest(TestCase):
+    def setUp(self):
+        ExchangeRate.objects.create(base_currency="KRW", target_currency="USD", rate=Decimal("0.000750"))
+        ExchangeRate.objects.create(base_currency="KRW", target_currency="JPY", rate=Decimal("0.108000"))
+        rate_table.invalidate()
+        self.url = reverse("rates:convert-currency")
+        self.batch_url = reverse("rates:convert-currency-batch")
+
+    def tearDown(self):
+        rate_table.invalidate()
+
+    def _get(self, from_currency, to_currency, amount):
+        return self.client.get(self.url, {"from": from_currency, "to": to_currency, "amount": amount})
+
+    def test_convert(self):
+        response = self._get("usd", "KRW", "10")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {"from_currency": "USD", "to_currency": "KRW", "amount": "10.00", "converted": "13333.33"})
+
+        self.assertEqual(self._get("USD", "JPY", "10").json()["converted"], "1440.00")
+
+    def test_invalid_params(self):
+        self.assertEqual(self._get("USD", "XXX", "10").status_code, 400)
+        self.assertEqual(self._get("USD", "KRW", "abc").status_code, 400)
+        self.assertEqual(self._get("USD", "KRW", "NaN").status_code, 400)
+        self.assertEqual(self._get("EUR", "KRW", "10").status_code, 404)
+
+    def test_oversized_amount(self):
+        for amount in ("1e18", "999999999999999999.999", "1e30", "-1e18"):
+            response = self._get("KRW", "KRW", amount)
+            self.assertEqual(response.status_code, 400, amount)
+            self.assertEqual(response.json()["error"], "amount가 너무 큽니다.")
+
+    def test_oversized_result(self):
+        # 금액은 범위 안이지만 원화 환산 결과(약 1.33e18)가 응답 자릿수를 넘음
+        response = self._get("USD", "KRW", "1e15")
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()["error"], "amount가 너무 큽니다.")
+
+        self.assertEqual(self._get("USD", "KRW", "1e14").status_code, 200)
+
+    def test_batch_reports_errors_per_item(self):
+        response = self.client.post(
+            self.batch_url,
+            {"items": [
+                {"from": "USD", "to": "KRW", "amount": "10"},
+                {"from": "USD", "to": "KRW", "amount": "1e15"},
+                {"from": "KRW", "to": "USD", "amount": "1e30"},
+                {"from": "EUR", "to": "KRW", "amount": "1"},
+                "USD",
+            ]},
+            content_type="application/json",
+        )
+
+        self.assertEqual(response.status_code, 200)
+        results = response.json()["results"]
+        self.assertEqual(results[0]["converted"], "13333.33")
+        self.assertEqual(
+            [result.get("error") for result in results[1:]],
+            ["amount가 너무 큽니다.", "amount가 너무 큽니다.", "Rate not Found", "잘못된 항목입니다."],
+        )
+
+    def test_batch_shape(self):
+        self.assertEqual(self.client.post(self.batch_url, [], content_type="application/json").status_code, 400)
+        with mock.patch("rates.views.CONVERT_BATCH_MAX_ITEMS", 1):
+            response = self.client.post(self.batch_url, [{"from": "USD", "to": "KRW", "amount": "1"}] * 2, content_type="application/json")
+        self.assertEqual(response.status_code, 400)
+
+
+"""
+    # /rates/convert/ 캐시 헤더
+    - ETag / Last-Modified 는 환율 테이블 버전 기준, 같으면 304, 환율이 갱신되면 새 ETag
+"""
+class ConvertCacheHeadersTest(TestCase):
+    def setUp(self):
+        upsert_rates("KRW", {"USD": Decimal("0.000750")})
+        rate_table.invalidate()
+        self.url = reverse("rates:convert-currency") + "?from=USD&to=KRW&amount=10"
+
+    def tearDown(self):
+        rate_table.invalidate()
+
+    def test_headers(self):
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response["ETag"].startswith('"rates-'))
+        self.assertIn("Last-Modified", response)
+        self.assertIn("public", response["Cache-Control"])
+        self.assertIn("max-age=", response["Cache-Control"])
+
+    def test_if_none_match_returns_304(self):
+        etag = self.client.get(self.url)["ETag"]
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response["ETag"], etag)
+        self.assertEqual(response.content, b"")
+
+    def test_if_modified_since_returns_304(self):
+        last_modified = self.client.get(self.url)["Last-Modified"]
+        self.assertEqual(self.client.get(self.url, HTTP_IF_MODIFIED_SINCE=last_modified).status_code, 304)
+
+    def test_rate_update_changes_etag(self):
+        first = self.client.get(self.url)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            upsert_rates("KRW", {"USD": Decimal("0.000800")})
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=first["ETag"])
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], first["ETag"])
+        self.assertEqual(response.json()["converted"], "12500.00")
+
+    def test_errors_are_not_cacheable(self):
+        response = self.client.get(reverse("rates:convert-currency") + "?from=USD&to=KRW&amount=abc")
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(response.has_header("ETag"))
+
+    def test_no_rates_no_validators(self):
+        ExchangeRate.objects.all().delete()
+        rate_table.invalidate()
+
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 404)
+        self.assertFalse(response.has_header("ETag"))
+
+
+"""
+    # 다른 프로세스의 환율 갱신 감지
+    - exchange-updater 컨테이너는 DB 갱신 + 공유 캐시 RATES_SCOPE 버전만 올림 (이 프로세스 시그널은 안 옴)
+    - TTL 안이라도 공유 버전이 바뀌었으면 다시 로드
+"""
+@override_settings(EXCHANGE_RATE_CACHE_TTL=3600)
+class RateTableSharedVersionTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        ExchangeRate.objects.create(base_currency="KRW", target_currency="USD", rate=Decimal("0.000750"))
+        rate_table.invalidate()
+
+    def tearDown(self):
+        rate_table.invalidate()
+
+    # 시그널 없이 DB만 바뀐 상태 (다른 프로세스의 upsert_rates)
+    def _update_elsewhere(self, rate):
+        ExchangeRate.objects.filter(target_currency="USD").update(rate=Decimal(rate), updated_at=timezone.now())
+
+    def test_reloads_when_shared_version_moves(self):
+        self.assertEqual(rate_table.get("USD"), Decimal("0.000750"))
+        self._update_elsewhere("0.000800")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            bump_versions(RATES_SCOPE)
+
+        self.assertEqual(rate_table.get("USD"), Decimal("0.000800"))
+        self.assertEqual(rate_table.cross("USD", "KRW"), Decimal("1250"))
+
+    def test_no_queries_within_ttl_without_bump(self):
+        rate_table.get("USD")
+        self._update_elsewhere("0.000800")
+
+        with self.assertNumQueries(0):
+            self.assertEqual(rate_table.get("USD"), Decimal("0.000750"))
@@ -5,5 +5,6 @@ app_name = 'rates'
 
 urlpatterns = [
     path('convert/', ConvertView.as_view(), name='convert-currency'),
+    path('convert/batch/', ConvertBatchView.as_view(), name='convert-currency-batch'),
     path("200/", AlwaysOkView.as_view(), name="always-ok"),
 ]
@@ -1,28 +1,287 @@
+import threading
+import time
+from bisect import bisect_right
+from collections import defaultdict
+from datetime import datetime, time as dt_time, timedelta
 from decimal import Decimal, ROUND_HALF_UP
+
+from django.conf import settings
+from django.db.models import Count, F, Max, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from dongleDongle.cache import RATES_SCOPE, get_versions, register_loaded_version
+
 from .models import *
-from django.core.exceptions import ObjectDoesNotExist
-from rest_framework.views import APIView
-from rest_framework import permissions
-from .serializers import *
-from rest_framework.response import Response
 
-# 예산안용 함수 저장 파일 
+# 예산안용 함수 저장 파일
+
+
+"""
+    # 프로세스 내 환율 테이블 캐시
+    - 통화별 환율(최대 8건)을 쿼리 한 번으로 읽어서 dict로 보관
+    - TTL(EXCHANGE_RATE_CACHE_TTL초) 동안은 쿼리 없이 dict에서 조회
+    - TTL이 지나면 updated_at 버전만 확인하고, 바뀐 경우에만 다시 로드
+    - 같은 프로세스에서 ExchangeRate가 저장/삭제되면 signals에서 바로 무효화
+    - 다른 프로세스(exchange-updater 컨테이너)의 갱신은 공유 캐시의 RATES_SCOPE 버전으로 감지
+      -> 조회마다 버전을 비교해서 바뀌었으면 TTL과 상관없이 다시 로드
+    - 로드할 때 모든 통화쌍의 교차 환율(1 from = ? to)도 같이 계산해 둠 (역환율 포함)
+"""
+class RateTable:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._rates = {}
+        self._cross = {}
+        self._version = None
+        # 로드할 때의 공유 캐시 RATES_SCOPE 버전
+        self._scope_version = None
+        self._checked_at = 0.0
+
+    def _ttl(self):
+        return getattr(settings, "EXCHANGE_RATE_CACHE_TTL", 60)
+
+    def _shared_version(self):
+        return get_versions([RATES_SCOPE])[RATES_SCOPE]
+
+    def _is_fresh(self, now, scope_version):
+        return (
+            self._version is not None
+            and self._scope_version == scope_version
+            and now - self._checked_at < self._ttl()
+        )
+
+    # updated_at 최댓값 + 개수로 버전 비교
+    def _current_version(self):
+        agg = ExchangeRate.objects.aggregate(latest=Max("updated_at"), count=Count("id"))
+        return (agg["latest"], agg["count"])
+
+    def _load(self):
+        rates = {}
+        latest = None
+        rows = (
+            ExchangeRate.objects
+            .order_by("updated_at")
+            .values_list("target_currency", "rate", "updated_at")
+        )
+        for target, rate, updated_at in rows:
+            # 중복된 환율 데이터가 있으면 최신 것으로 덮어씀
+            rates[target] = rate
+            if latest is None or updated_at > latest:
+                latest = updated_at
+        return rates, (latest, len(rows))
+
+    # 1 KRW = rate 외화 이므로 1 A = rate[B] / rate[A] B
+    def _build_cross(self, rates):
+        krw_rates = {"KRW": Decimal("1")}
+        krw_rates.update((currency, Decimal(rate)) for currency, rate in rates.items() if rate)
+        return {
+            (from_currency, to_currency): to_rate / from_rate
+            for from_currency, from_rate in krw_rates.items()
+            for to_currency, to_rate in krw_rates.items()
+        }
+
+    # 공유 버전은 DB를 읽기 전에 조회한 값 (읽는 도중 갱신되면 다음 조회에서 다시 로드)
+    def _reload(self, now, scope_version):
+        self._rates, self._version = self._load()
+        self._cross = self._build_cross(self._rates)
+        self._scope_version = scope_version
+        self._checked_at = now
+
+    def _refresh(self):
+        now = time.monotonic()
+        scope_version = self._shared_version()
+        if self._is_fresh(now, scope_version):
+            return
+
+        with self._lock:
+            if self._is_fresh(now, scope_version):
+                return
+            if (
+                self._version is not None
+                and self._scope_version == scope_version
+                and self._current_version() == self._version
+            ):
+                self._checked_at = now
+                return
+            self._reload(now, scope_version)
+
+    def rates(self):
+        self._refresh()
+        return self._rates
+
+    def get(self, currency):
+        return self.rates().get(currency)
+
+    # (updated_at 최댓값, 개수) - 응답 캐시 헤더(ETag/Last-Modified)에 사용
+    def version(self):
+        self._refresh()
+        return self._version
+
+    # 지금 들고 있는 환율을 로드할 때의 RATES_SCOPE 버전 - 응답 캐시 키에 사용
+    def scope_version(self):
+        self._refresh()
+        return self._scope_version
+
+    # 1 from_currency = ? to_currency (환율이 없으면 None)
+    def cross(self, from_currency, to_currency):
+        self._refresh()
+        return self._cross.get((from_currency, to_currency))
+
+    def invalidate(self):
+        with self._lock:
+            self._rates = {}
+            self._cross = {}
+            self._version = None
+            self._scope_version = None
+            self._checked_at = 0.0
+
+
+rate_table = RateTable()
+# 환산 금액이 들어간 응답 캐시는 이 프로세스 환율 테이블의 버전으로 키를 만듦 (dongleDongle.cache)
+register_loaded_version(RATES_SCOPE, rate_table.scope_version)
+
+
+"""
+    # 파견 국가 -> 통화 (한 곳에서만 관리)
+    - ExchangeProfile.exchange_country 는 보통 CountryOption 라벨("미국")이지만 코드("USA")가 들어간 경우도 있음
+    - 모르는 국가/프로필 없음은 모두 KRW
+    - 결과는 ExchangeProfile 인스턴스에 저장해 두고, 프로필이 저장되면 signals 에서 지움
+"""
+COUNTRY_TO_CURRENCY = {
+    "한국": "KRW",
+    "미국": "USD",
+    "일본": "JPY",
+    "독일": "EUR",
+    "프랑스": "EUR",
+    "중국": "CNY",
+    "대만": "TWD",
+    "캐나다": "CAD",
+    "이탈리아": "EUR",
+    "네덜란드": "EUR",
+    "영국": "GBP",
+    "KOREA": "KRW",
+    "USA": "USD",
+    "JAPAN": "JPY",
+    "GERMANY": "EUR",
+    "FRANCE": "EUR",
+    "CHINA": "CNY",
+    "TAIWAN": "TWD",
+    "CANADA": "CAD",
+    "ITALY": "EUR",
+    "NETHERLANDS": "EUR",
+    "UK": "GBP",
+}
+
+DEFAULT_CURRENCY = "KRW"
+_PROFILE_CURRENCY_ATTR = "_resolved_currency"
+
 
-# 1) 외화 -> 한화 
+def currency_for_country(country_name):
+    name = str(country_name or "").strip()
+    return COUNTRY_TO_CURRENCY.get(name) or COUNTRY_TO_CURRENCY.get(name.upper(), DEFAULT_CURRENCY)
+
+
+def resolve_currency(exchange_profile):
+    if exchange_profile is None:
+        return DEFAULT_CURRENCY
+
+    # (국가, 통화) 로 저장해서 저장 전에 국가만 바꾼 경우에도 다시 계산
+    country_name = exchange_profile.exchange_country
+    cached = getattr(exchange_profile, _PROFILE_CURRENCY_ATTR, None)
+    if cached is not None and cached[0] == country_name:
+        return cached[1]
+
+    currency = currency_for_country(country_name)
+    setattr(exchange_profile, _PROFILE_CURRENCY_ATTR, (country_name, currency))
+    return currency
+
+
+# user.exchange_profile 은 유저 인스턴스에 캐시되므로 같은 요청에서 여러 번 불러도 조회는 한 번
+def resolve_user_currency(user):
+    if user is None or not getattr(user, "is_authenticated", False):
+        return DEFAULT_CURRENCY
+    return resolve_currency(getattr(user, "exchange_profile", None))
+
+
+def clear_resolved_currency(exchange_profile):
+    exchange_profile.__dict__.pop(_PROFILE_CURRENCY_ATTR, None)
+
+
+# KRW 1원당 외화 환율 (없으면 None)
+def get_rate(currency):
+    return rate_table.get(currency)
+
+
+# 1 from_currency = ? to_currency
+def get_cross_rate(from_currency, to_currency):
+    return rate_table.cross(from_currency, to_currency)
+
+
+# 1) 외화 -> 한화
 def convert_to_krw(amount, from_currency):
-    try:
-        krw_to_foreign = ExchangeRate.objects.get(target_currency=from_currency).rate
-        converted = Decimal(amount) / Decimal(krw_to_foreign)
-        return converted.quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
-    except ObjectDoesNotExist:
+    krw_to_foreign = get_rate(from_currency)
+    if krw_to_foreign is None:
         return None
-    
+    converted = Decimal(amount) / Decimal(krw_to_foreign)
+    return converted.quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
+
 
 #2) 한화 -> 외화
 def convert_from_krw(amount, to_currency):
-    try:
-        krw_to_foreign = ExchangeRate.objects.get(target_currency=to_currency).rate
-        converted = Decimal(amount) * Decimal(krw_to_foreign)
-        return converted.quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
-    except ObjectDoesNotExist:
-        return None
\ No newline at end of file
+    krw_to_foreign = get_rate(to_currency)
+    if krw_to_foreign is None:
+        return None
+    converted = Decimal(amount) * Decimal(krw_to_foreign)
+    return converted.quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
+
+
+"""
+    # 특정 날짜 기준 환율 (ExchangeRateHistory)
+    - (통화, 날짜) 여러 건을 쿼리 한 번으로 조회
+    - 날짜 범위 안의 이력 + 범위 시작 직전의 이력 1건(통화별)만 읽고, 메모리에서 bisect
+    - 해당 날짜가 끝날 때(자정) 적용 중이던 환율, 그 이전 이력이 없으면 None
+"""
+def _end_of_day(day):
+    return timezone.make_aware(datetime.combine(day + timedelta(days=1), dt_time.min))
+
+
+def rates_as_of(pairs):
+    pairs = set(pairs)
+    result = {pair: Decimal("1") for pair in pairs if pair[0] == "KRW"}
+    pairs -= set(result)
+    if not pairs:
+        return result
+
+    currencies = {currency for currency, _ in pairs}
+    days = [day for _, day in pairs]
+    start = _end_of_day(min(days) - timedelta(days=1))
+    end = _end_of_day(max(days))
+
+    # 범위 시작 직전(통화별 마지막) 이력부터 읽기
+    before_start = (
+        ExchangeRateHistory.objects
+        .filter(target_currency=OuterRef("target_currency"), effective_at__lt=start)
+        .order_by("-effective_at")
+        .values("effective_at")[:1]
+    )
+    rows = (
+        ExchangeRateHistory.objects
+        .filter(target_currency__in=currencies, effective_at__lt=end)
+        .alias(window_start=Coalesce(Subquery(before_start), Value(start)))
+        .filter(effective_at__gte=F("window_start"))
+        .order_by("target_currency", "effective_at", "id")
+        .values_list("target_currency", "effective_at", "rate")
+    )
+
+    history = defaultdict(lambda: ([], []))
+    for currency, effective_at, rate in rows:
+        times, rates = history[currency]
+        times.append(effective_at)
+        rates.append(rate)
+
+    for currency, day in pairs:
+        times, rates = history.get(currency, ([], []))
+        index = bisect_right(times, _end_of_day(day)) - 1
+        result[(currency, day)] = rates[index] if index >= 0 else None
+    return result
+
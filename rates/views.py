@@ -1,10 +1,16 @@
+import time
+
+from django.conf import settings
 from django.shortcuts import render
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, quote_etag
 from .models import *
-from decimal import Decimal, ROUND_HALF_UP
-from django.core.exceptions import ObjectDoesNotExist
+from decimal import Decimal, InvalidOperation, ROUND_HALF_UP
+from collections import defaultdict
 from rest_framework.views import APIView
 from rest_framework import permissions
 from .serializers import *
+from .utils import get_cross_rate, get_rate, rate_table, rates_as_of
 from rest_framework.response import Response
 # Create your views here.
 
@@ -20,57 +26,235 @@ from rest_framework.response import Response
 
 # 1) 외화 -> 한화 
 # 1외화 = 1/rate KRW
-def convert_to_krw(amount, from_currency):
-    try:
-        # 중복된 환율 데이터 중 최신 것만 사용하도록
-        rate_obj = (ExchangeRate.objects.filter(target_currency=from_currency).order_by("-updated_at").first())
-        if not rate_obj:
-            return None
-
-        krw_to_foreign = rate_obj.rate
-        converted = Decimal(amount) / Decimal(krw_to_foreign)
-        return converted.quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
-    except ObjectDoesNotExist:
+# rates: 같은 환율 스냅샷으로 여러 건을 변환할 때 넘기는 {통화: 환율} dict
+def convert_to_krw(amount, from_currency, rates=None):
+    # 프로세스 내 환율 테이블에서 조회 (쿼리 없음)
+    krw_to_foreign = get_rate(from_currency) if rates is None else rates.get(from_currency)
+    if krw_to_foreign is None:
         return None
+
+    converted = Decimal(amount) / Decimal(krw_to_foreign)
+    return converted.quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
     
 #2) 한화 -> 외화
-def convert_from_krw(amount, to_currency):
-    try:
-        # 중복된 환율 데이터 중 최신 것만 사용하도록
-        rate_obj = (ExchangeRate.objects.filter(target_currency=to_currency).order_by("-updated_at").first())
-        if not rate_obj:
-            return None
-
-        krw_to_foreign = rate_obj.rate
-        converted = Decimal(amount) * Decimal(krw_to_foreign)
-        return converted.quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
-    except ObjectDoesNotExist:
+def convert_from_krw(amount, to_currency, rates=None):
+    # 프로세스 내 환율 테이블에서 조회 (쿼리 없음)
+    krw_to_foreign = get_rate(to_currency) if rates is None else rates.get(to_currency)
+    if krw_to_foreign is None:
+        return None
+
+    converted = Decimal(amount) * Decimal(krw_to_foreign)
+    return converted.quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
+
+#2-1) 임의 통화쌍 (CurrencyOption 안의 모든 조합)
+# KRW가 포함되면 위 함수와 같은 계산, 외화끼리는 미리 계산해 둔 교차 환율 사용
+def convert_currency(amount, from_currency, to_currency):
+    if from_currency == to_currency:
+        return Decimal(amount).quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
+    if to_currency == "KRW":
+        return convert_to_krw(amount, from_currency)
+    if from_currency == "KRW":
+        return convert_from_krw(amount, to_currency)
+
+    cross_rate = get_cross_rate(from_currency, to_currency)
+    if cross_rate is None:
         return None
+    converted = Decimal(amount) * cross_rate
+    return converted.quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
+
+#3) 일괄 변환
+# (amount, currency) 목록 또는 LedgerEntry queryset을 받아서
+# 통화별로 먼저 합산하고 환율은 통화당 한 번만 조회
+def _as_pairs(items):
+    if hasattr(items, "values_list"):
+        return items.values_list("amount", "currency_code")
+    return items
+
+
+def sum_by_currency(items):
+    totals = defaultdict(lambda: Decimal("0"))
+    for amount, currency in _as_pairs(items):
+        if amount is None:
+            continue
+        totals[currency] += Decimal(amount)
+    return totals
+
+
+def convert_totals(items, foreign_currency="KRW"):
+    """
+    통화별로 먼저 합산한 뒤 통화당 한 번만 변환 -> (krw 합계, foreign 합계)
+    환율이 없는 통화는 합계에서 제외
+    """
+    total_krw = Decimal("0.00")
+    for currency, amount in sum_by_currency(items).items():
+        krw_amount = amount if currency == "KRW" else convert_to_krw(amount, currency)
+        if krw_amount is not None:
+            total_krw += krw_amount
+
+    if foreign_currency == "KRW":
+        return total_krw, total_krw
+    total_foreign = convert_from_krw(total_krw, foreign_currency)
+    if total_foreign is None:
+        total_foreign = Decimal("0.00")
+    return total_krw, total_foreign
+
+def convert_to_krw_as_of(items):
+    """
+    (amount, currency, date) 목록 -> 행마다 그 날짜 환율 기준 krw_amount
+    환율 이력은 쿼리 한 번으로 조회, 이력이 없으면 None
+    """
+    items = list(items)
+    rates = rates_as_of((currency, day) for _, currency, day in items)
+
+    results = []
+    for amount, currency, day in items:
+        rate = rates[(currency, day)]
+        if rate is None:
+            results.append(None)
+            continue
+        results.append((Decimal(amount) / Decimal(rate)).quantize(Decimal("0.01"), rounding=ROUND_HALF_UP))
+    return results
+
+#4) 하나의 엔드포인트
+CURRENCY_CODES = set(CurrencyOption.values)
+CONVERT_BATCH_MAX_ITEMS = 1000
+# ConvertResultSerializer(max_digits=20, decimal_places=2)에 들어가는 금액 (소수 둘째 자리 반올림 후 미만)
+CONVERT_AMOUNT_LIMIT = Decimal(10) ** 18
+AMOUNT_TOO_LARGE = "amount가 너무 큽니다."
+
+
+def _fits_result(value):
+    try:
+        return abs(value.quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)) < CONVERT_AMOUNT_LIMIT
+    except InvalidOperation:
+        return False
+
+
+# (from, to, amount) 검증 -> (값, 오류 메시지)
+def _parse_convert_params(from_currency, to_currency, amount):
+    from_currency = (from_currency or "").upper()
+    to_currency = (to_currency or "").upper()
+    if from_currency not in CURRENCY_CODES or to_currency not in CURRENCY_CODES:
+        return None, f"지원하지 않는 통화입니다. ({', '.join(sorted(CURRENCY_CODES))})"
+    try:
+        amount = Decimal(str(amount if amount not in (None, "") else 0))
+    except InvalidOperation:
+        return None, "amount는 숫자여야 합니다."
+    if not amount.is_finite():
+        return None, "amount는 숫자여야 합니다."
+    if not _fits_result(amount):
+        return None, AMOUNT_TOO_LARGE
+    return (from_currency, to_currency, amount), None
+
+
+# 변환 -> (결과 data, None) 또는 (None, (오류 메시지, 상태 코드))
+# 변환 결과가 응답 자릿수를 넘으면 400 (직렬화 중 InvalidOperation 으로 500 이 나지 않도록)
+def _convert_result(from_currency, to_currency, amount):
+    try:
+        converted = convert_currency(amount, from_currency, to_currency)
+    except InvalidOperation:
+        return None, (AMOUNT_TOO_LARGE, 400)
+    if converted is None:
+        return None, ("Rate not Found", 404)
+    if not _fits_result(converted):
+        return None, (AMOUNT_TOO_LARGE, 400)
+
+    data = ConvertResultSerializer({
+        "from_currency": from_currency,
+        "to_currency": to_currency,
+        "amount": amount,
+        "converted": converted
+    }).data
+    return data, None
+
+
+# 환율 갱신 주기 기준 캐시 헤더
+# - ETag / Last-Modified: 환율 테이블의 updated_at 최댓값 + 개수 (바뀌면 다른 값)
+# - max-age: 다음 갱신 예정 시각까지 남은 시간 (최소 RATE_CACHE_MIN_MAX_AGE 초)
+RATE_CACHE_MIN_MAX_AGE = 60
+
+
+def _rate_validators():
+    latest, count = rate_table.version()
+    if latest is None:
+        return None, None
+    return quote_etag(f"rates-{latest:%Y%m%d%H%M%S%f}-{count}"), int(latest.timestamp())
+
+
+def _rate_max_age(last_modified):
+    interval = getattr(settings, "EXCHANGE_UPDATE_INTERVAL", 3600)
+    remaining = int(last_modified + interval - time.time())
+    return min(max(remaining, RATE_CACHE_MIN_MAX_AGE), interval)
+
+
+def _set_rate_cache_headers(response, etag, last_modified):
+    response["ETag"] = etag
+    response["Last-Modified"] = http_date(last_modified)
+    patch_cache_control(response, public=True, max_age=_rate_max_age(last_modified))
+    return response
+
 
-#3) 하나의 엔드포인트
 class ConvertView(APIView):
     permission_classes = [permissions.AllowAny]
-    
+
     def get(self, request):
-        from_currency = request.GET.get("from", "").upper()
-        to_currency = request.GET.get("to", "").upper()
-        amount = float(request.GET.get("amount", 0))
-
-        if to_currency == "KRW":
-            result = convert_to_krw(amount, from_currency)
-        elif from_currency == "KRW":
-            result = convert_from_krw(amount, to_currency)
-        
-        if result is None:
-            return Response({"error: Rate not Found"}, status=404)
-
-        serializers = ConvertResultSerializer({
-            "from_currency": from_currency,
-            "to_currency": to_currency,
-            "amount": amount,
-            "converted": result
-        })
-        return Response(serializers.data)
+        etag, last_modified = _rate_validators()
+        if etag is not None:
+            # If-None-Match / If-Modified-Since 가 같으면 변환 없이 304
+            not_modified = get_conditional_response(request, etag=etag, last_modified=last_modified)
+            if not_modified is not None:
+                return _set_rate_cache_headers(not_modified, etag, last_modified)
+
+        response = self._convert(request)
+        if etag is not None and response.status_code == 200:
+            _set_rate_cache_headers(response, etag, last_modified)
+        return response
+
+    def _convert(self, request):
+        params, error = _parse_convert_params(
+            request.GET.get("from"),
+            request.GET.get("to"),
+            request.GET.get("amount"),
+        )
+        if error:
+            return Response({"error": error}, status=400)
+
+        data, error = _convert_result(*params)
+        if error:
+            message, status_code = error
+            return Response({"error": message}, status=status_code)
+        return Response(data)
+
+
+#5) 여러 금액/통화쌍을 한 번에 변환
+# body: [{"from": "USD", "to": "JPY", "amount": "10"}, ...] 또는 {"items": [...]}
+class ConvertBatchView(APIView):
+    permission_classes = [permissions.AllowAny]
+
+    def post(self, request):
+        items = request.data
+        if isinstance(items, dict):
+            items = items.get("items")
+        if not isinstance(items, list) or not items:
+            return Response({"error": "items 목록이 필요합니다."}, status=400)
+        if len(items) > CONVERT_BATCH_MAX_ITEMS:
+            return Response({"error": f"한 번에 최대 {CONVERT_BATCH_MAX_ITEMS}건까지 변환할 수 있습니다."}, status=400)
+
+        results = []
+        for item in items:
+            if not isinstance(item, dict):
+                results.append({"error": "잘못된 항목입니다."})
+                continue
+            params, error = _parse_convert_params(item.get("from"), item.get("to"), item.get("amount"))
+            if error:
+                results.append({"error": error})
+                continue
+
+            # 항목별 오류는 해당 항목에만 표시 (나머지 항목은 정상 변환)
+            data, error = _convert_result(*params)
+            results.append({"error": error[0]} if error else data)
+
+        return Response({"results": results})
 
 # 200 테스트용
 class AlwaysOkView(APIView):
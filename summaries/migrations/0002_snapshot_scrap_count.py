@@ -0,0 +1,44 @@
+# Generated by Django 4.2.24 on 2026-10-18 18:47
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+# 기존 스크랩 수로 scrap_count 채우기
+def populate_scrap_count(apps, schema_editor):
+    SummarySnapshot = apps.get_model("summaries", "SummarySnapshot")
+    FeedScrap = apps.get_model("feeds", "FeedScrap")
+
+    counts = (
+        FeedScrap.objects
+        .values("snapshot_id")
+        .annotate(total=Count("id"))
+        .order_by()
+    )
+    for row in counts:
+        SummarySnapshot.objects.filter(id=row["snapshot_id"]).update(scrap_count=row["total"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('summaries', '0001_initial'),
+        ('feeds', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='summarysnapshot',
+            name='scrap_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(populate_scrap_count, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='summarysnapshot',
+            index=models.Index(fields=['created_at', 'id'], name='snapshot_created_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='summarysnapshot',
+            index=models.Index(fields=['scrap_count', 'id'], name='snapshot_scrap_id_idx'),
+        ),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 4.2.24 on 2026-10-18 18:47
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+# 기존 좋아요 수로 like_count 채우기
+def populate_like_count(apps, schema_editor):
+    SummarySnapshot = apps.get_model("summaries", "SummarySnapshot")
+    FeedFavorite = apps.get_model("feeds", "FeedFavorite")
+
+    counts = (
+        FeedFavorite.objects
+        .values("snapshot_id")
+        .annotate(total=Count("id"))
+        .order_by()
+    )
+    for row in counts:
+        SummarySnapshot.objects.filter(id=row["snapshot_id"]).update(like_count=row["total"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('summaries', '0002_snapshot_scrap_count'),
+        ('feeds', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='summarysnapshot',
+            name='like_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(populate_like_count, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,53 @@
+# Generated by Django 4.2.24 on 2026-10-18 18:48
+
+from django.db import migrations, models
+from django.db.models import Max
+
+
+# 유저별 가장 최근 스냅샷만 is_latest=True 로 남기기
+def mark_latest_snapshots(apps, schema_editor):
+    SummarySnapshot = apps.get_model("summaries", "SummarySnapshot")
+
+    latest_ids = list(
+        SummarySnapshot.objects
+        .values("user")
+        .annotate(latest_id=Max("id"))
+        .values_list("latest_id", flat=True)
+    )
+    SummarySnapshot.objects.exclude(id__in=latest_ids).update(is_latest=False)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('summaries', '0003_snapshot_like_count'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='summarysnapshot',
+            name='snapshot_created_id_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='summarysnapshot',
+            name='snapshot_scrap_id_idx',
+        ),
+        migrations.AddField(
+            model_name='summarysnapshot',
+            name='is_latest',
+            field=models.BooleanField(default=True),
+        ),
+        migrations.RunPython(mark_latest_snapshots, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='summarysnapshot',
+            index=models.Index(fields=['is_latest', 'created_at', 'id'], name='snapshot_latest_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='summarysnapshot',
+            index=models.Index(fields=['is_latest', 'scrap_count', 'id'], name='snapshot_latest_scrap_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='summarysnapshot',
+            index=models.Index(fields=['user', 'is_latest'], name='snapshot_user_latest_idx'),
+        ),
+    ]
@@ -60,7 +60,21 @@ class SummarySnapshot(models.Model):
     base_dispatch_foreign_amount = models.DecimalField(max_digits=14, decimal_places=2, null=True, blank=True)
     base_dispatch_krw_amount = models.DecimalField(max_digits=14, decimal_places=2, null=True, blank=True)
 
+    # 유저별 가장 최근 스냅샷 여부 (DetailProfileView._create_snapshot에서 갱신, 피드 목록은 이 값으로 필터)
+    is_latest = models.BooleanField(default=True)
+
+    # 좋아요/스크랩 수 (FeedFavoriteView/FeedScrapView에서 증감, 어긋나면 reconcile_feed_counts 커맨드)
+    like_count = models.PositiveIntegerField(default=0)
+    scrap_count = models.PositiveIntegerField(default=0)
+
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["is_latest", "created_at", "id"], name="snapshot_latest_created_idx"),
+            models.Index(fields=["is_latest", "scrap_count", "id"], name="snapshot_latest_scrap_idx"),
+            models.Index(fields=["user", "is_latest"], name="snapshot_user_latest_idx"),
+        ]
+
     def __str__(self):
         return f"{self.user} 가계부 요약본 ({self.created_at.date()})"
\ No newline at end of file
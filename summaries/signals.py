@@ -0,0 +1,12 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from dongleDongle.cache import FEEDS_SCOPE, bump_versions
+
+from .models import SummarySnapshot
+
+
+# 요약본이 새로 게시/삭제되면 피드 목록 캐시 무효화
+@receiver([post_save, post_delete], sender=SummarySnapshot)
+def invalidate_feed_cache_on_snapshot_change(sender, instance, **kwargs):
+    bump_versions(FEEDS_SCOPE)
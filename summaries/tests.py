@@ -1,3 +1,124 @@
+from datetime import date, datetime
+from decimal import Decimal
+from unittest import mock
+
+from django.core.cache import cache
 from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from accounts.models import User
+from dongleDongle.cache import RATES_SCOPE, bump_versions
+from dongleDongle.testing import QueryBudgetMixin
+from ledgers.models import LedgerEntry
+from rates.models import ExchangeRate, ExchangeRateHistory
+from rates.utils import RateTable, rate_table
+
+
+class LedgerSummaryQueryBudgetTest(QueryBudgetMixin, TestCase):
+    def test_ledger_summary(self):
+        self.assertQueryBudget("summaries:ledger-summary", reverse("summaries:ledger-summary"))
+
+
+"""
+    # 가계부 요약본 원화 금액
+    - krw_amount: 지출일 환율(ExchangeRateHistory), 이력이 없으면 등록 당시 원화 환산값
+    - current_rate_krw_amount: 현재 환율(ExchangeRate)
+"""
+class LedgerSummaryEntryRateTest(TestCase):
+    def setUp(self):
+        # 현재 환율 저장 시 이력도 지금 시각으로 한 건씩 추가됨
+        ExchangeRate.objects.create(base_currency="KRW", target_currency="USD", rate=Decimal("0.000750"))
+        ExchangeRate.objects.create(base_currency="KRW", target_currency="JPY", rate=Decimal("0.100000"))
+        ExchangeRateHistory.objects.create(
+            base_currency="KRW", target_currency="USD", rate=Decimal("0.000700"),
+            effective_at=timezone.make_aware(datetime(2025, 3, 1)),
+        )
+        rate_table.invalidate()
+        cache.clear()
+
+        self.user = User.objects.create_user(username="summary", password="pw", nickname="summary", gender="F")
+        self.client.force_login(self.user)
+
+    def tearDown(self):
+        rate_table.invalidate()
+
+    def _expense(self, day, amount, currency_code, amount_converted=None, category="FOOD"):
+        LedgerEntry.objects.create(
+            user=self.user, entry_type="EXPENSE", date=day, category=category, payment_method="CARD",
+            amount=Decimal(amount), currency_code=currency_code,
+            amount_converted=Decimal(amount_converted) if amount_converted else None,
+            converted_currency_code="KRW" if amount_converted else None,
+        )
+
+    def _category(self, code):
+        response = self.client.get(reverse("summaries:ledger-summary"))
+        self.assertEqual(response.status_code, 200, response.content[:500])
+        return next(item for item in response.json()["data"]["categories"] if item["code"] == code)
+
+    def test_uses_rate_at_entry_date(self):
+        # 3/1 이력(0.0007) 기준 7 USD = 10000 KRW (등록 당시 환산값 9333.33 보다 우선)
+        self._expense(date(2025, 3, 5), "7.00", "USD", "9333.33")
+        self._expense(date(2025, 3, 6), "5000.00", "KRW")
+
+        food = self._category("FOOD")
+        self.assertEqual(Decimal(food["krw_amount"]), Decimal("15000.00"))
+        self.assertEqual(Decimal(food["current_rate_krw_amount"]), Decimal("14333.33"))
+
+    def test_before_earliest_history_uses_amount_converted(self):
+        # JPY 이력은 오늘 것뿐 -> 등록 당시 원화 환산값
+        self._expense(date(2025, 3, 5), "1000", "JPY", "9000.00", category="TRAVEL")
+
+        travel = self._category("TRAVEL")
+        self.assertEqual(Decimal(travel["krw_amount"]), Decimal("9000.00"))
+        self.assertEqual(Decimal(travel["current_rate_krw_amount"]), Decimal("10000.00"))
+
+    def test_currency_without_history_or_conversion_uses_current_rate(self):
+        ExchangeRateHistory.objects.filter(target_currency="JPY").delete()
+        self._expense(date(2025, 3, 5), "1000", "JPY", category="SHOPPING")
+
+        shopping = self._category("SHOPPING")
+        self.assertEqual(Decimal(shopping["krw_amount"]), Decimal("10000.00"))
+        self.assertEqual(Decimal(shopping["current_rate_krw_amount"]), Decimal("10000.00"))
+
+
+"""
+    # 환율 갱신 후 응답 캐시
+    - 다른 프로세스가 환율을 갱신하고 RATES_SCOPE 버전을 올렸는데 이 프로세스 환율 테이블이 아직 예전 값이면
+      예전 환산 금액을 새 버전 키로 저장하면 안 됨 (키는 환율 테이블이 로드한 버전 기준)
+"""
+class LedgerSummaryRateCacheTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        ExchangeRate.objects.create(base_currency="KRW", target_currency="USD", rate=Decimal("0.000750"))
+        rate_table.invalidate()
+
+        self.user = User.objects.create_user(username="ratecache", password="pw", nickname="ratecache", gender="M")
+        self.client.force_login(self.user)
+        LedgerEntry.objects.create(
+            user=self.user, entry_type="EXPENSE", date=date.today(), category="FOOD", payment_method="CARD",
+            amount=Decimal("7.00"), currency_code="USD",
+        )
+
+    def tearDown(self):
+        rate_table.invalidate()
+
+    def _current_krw(self):
+        response = self.client.get(reverse("summaries:ledger-summary"))
+        self.assertEqual(response.status_code, 200, response.content[:500])
+        food = next(item for item in response.json()["data"]["categories"] if item["code"] == "FOOD")
+        return Decimal(food["current_rate_krw_amount"])
+
+    def test_bump_with_stale_rate_table_does_not_cache_old_amounts(self):
+        self.assertEqual(self._current_krw(), Decimal("9333.33"))
+
+        # exchange-updater 컨테이너의 갱신: DB 변경 + 공유 버전 올리기 (이 프로세스 시그널 없음)
+        ExchangeRate.objects.filter(target_currency="USD").update(rate=Decimal("0.000700"))
+        with self.captureOnCommitCallbacks(execute=True):
+            bump_versions(RATES_SCOPE)
+
+        # 환율 테이블이 아직 다시 로드하지 못한 상태로 요청
+        with mock.patch.object(RateTable, "_refresh"):
+            self.assertEqual(self._current_krw(), Decimal("9333.33"))
 
-# Create your tests here.
+        self.assertEqual(self._current_krw(), Decimal("10000.00"))
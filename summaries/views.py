@@ -1,3 +1,4 @@
+from collections import defaultdict
 from decimal import Decimal
 import re
 
@@ -10,9 +11,10 @@ from rest_framework import status
 
 from .models import DetailProfile, SummarySnapshot
 from .serializers import (DetailProfileSerializer, LedgerSummarySerializer)
-from ledgers.models import LedgerEntry
-from rates.views import convert_to_krw, convert_from_krw
-from budgets.models import BaseBudget
+from ledgers.models import LedgerEntry, LedgerMonthlyRollup
+from rates.views import convert_to_krw, convert_from_krw, convert_totals, convert_to_krw_as_of
+from accounts.context import get_user_context
+from dongleDongle.cache import cache_user_response
 
 
 INCLUDED_CATEGORIES = [
@@ -25,21 +27,6 @@ INCLUDED_CATEGORIES = [
 ]
 
 
-KOREAN_COUNTRY_TO_CURRENCY = {
-    "미국": "USD",
-    "일본": "JPY",
-    "독일": "EUR",
-    "프랑스": "EUR",
-    "중국": "CNY",
-    "대만": "TWD",
-    "캐나다": "CAD",
-    "이탈리아": "EUR",
-    "네덜란드": "EUR",
-    "영국": "GBP",
-    "UK": "GBP",
-}
-
-
 def ok(message, data=None, status_code=status.HTTP_200_OK):
     return Response({"message": message, "data": data}, status=status_code)
 
@@ -48,23 +35,6 @@ def bad(message, error=None, status_code=status.HTTP_400_BAD_REQUEST):
     return Response({"message": message, "error": error}, status=status_code)
 
 
-def resolve_foreign_currency(exchange_profile):
-    if not exchange_profile:
-        return "KRW"
-
-    country_name = getattr(exchange_profile, "exchange_country", "") or ""
-    name = str(country_name).strip()
-
-    from ledgers.serializers import COUNTRY_TO_CURRENCY
-    if name in COUNTRY_TO_CURRENCY:
-        return COUNTRY_TO_CURRENCY[name]
-
-    if name in KOREAN_COUNTRY_TO_CURRENCY:
-        return KOREAN_COUNTRY_TO_CURRENCY[name]
-
-    return "KRW"
-
-
 def extract_months(exchange_profile):
     if not exchange_profile:
         return 1
@@ -80,6 +50,57 @@ def extract_months(exchange_profile):
     return months
 
 
+"""
+    # 생활비 지출 행 (카테고리, 원본 금액, 원본 통화, 지출일 기준 원화 (금액, "KRW") 쌍)
+    - KRW 지출: 월별 집계에서 그대로
+    - 외화 지출: (카테고리, 통화, 날짜)별로 합산해서 그 날짜의 환율(ExchangeRateHistory)로 원화 환산
+      환율 이력이 없는 날짜/통화는 등록 당시 원화 환산값, 그것도 없으면 원본 금액 (현재 환율로 환산됨)
+    - 외화 지출이 없으면 환율 이력은 조회하지 않음
+"""
+def _expense_rows_at_entry_rate(user):
+    krw_rows = (
+        LedgerMonthlyRollup.objects
+        .filter(
+            user=user,
+            entry_type=LedgerEntry.EntryType.EXPENSE,
+            category__in=INCLUDED_CATEGORIES,
+            currency_code="KRW",
+        )
+        .values("category")
+        .annotate(amount_total=Sum("amount_sum"))
+        .order_by()
+        .values_list("category", "amount_total")
+    )
+    rows = [(category, amount, "KRW", (amount, "KRW")) for category, amount in krw_rows]
+
+    foreign_rows = list(
+        LedgerEntry.objects
+        .filter(
+            user=user,
+            entry_type=LedgerEntry.EntryType.EXPENSE,
+            category__in=INCLUDED_CATEGORIES,
+        )
+        .exclude(currency_code="KRW")
+        .values("category", "currency_code", "date", "converted_currency_code")
+        .annotate(amount_total=Sum("amount"), converted_total=Sum("amount_converted"))
+        .order_by()
+        .values_list("category", "currency_code", "date", "amount_total", "converted_total", "converted_currency_code")
+    )
+    krw_amounts = convert_to_krw_as_of(
+        (amount, currency_code, day) for _, currency_code, day, amount, _, _ in foreign_rows
+    )
+
+    for (category, currency_code, _, amount, amount_converted, converted_currency_code), krw_amount in zip(foreign_rows, krw_amounts):
+        if krw_amount is not None:
+            pair = (krw_amount, "KRW")
+        elif amount_converted and converted_currency_code == "KRW":
+            pair = (amount_converted, "KRW")
+        else:
+            pair = (amount, currency_code)
+        rows.append((category, amount, currency_code, pair))
+    return rows
+
+
 class DetailProfileView(APIView):
     permission_classes = [IsAuthenticated]
 
@@ -101,7 +122,7 @@ class DetailProfileView(APIView):
             return bad("세부 프로필 생성 실패", serializer.errors)
 
         detail_profile = serializer.save(user=request.user)
-        snapshot = self._create_snapshot(request.user, detail_profile)
+        snapshot = self._create_snapshot(get_user_context(request), detail_profile)
 
         data = {
             "detail_profile_id": detail_profile.id,
@@ -124,7 +145,7 @@ class DetailProfileView(APIView):
             return bad("세부 프로필 수정 실패", serializer.errors)
 
         detail_profile = serializer.save()
-        snapshot = self._create_snapshot(request.user, detail_profile)
+        snapshot = self._create_snapshot(get_user_context(request), detail_profile)
 
         data = {
             "detail_profile_id": detail_profile.id,
@@ -133,37 +154,22 @@ class DetailProfileView(APIView):
         return ok("세부 프로필 수정 및 가계부 요약본 스냅샷 생성 완료", data)
 
     def _sum_ledger_for_user(self, user, foreign_currency):
-        entries = (
-            LedgerEntry.objects
-            .filter(
-                user=user,
-                entry_type=LedgerEntry.EntryType.EXPENSE,
-                category__in=INCLUDED_CATEGORIES,
-            )
-        )
-
+        # 지출일 기준 원화로 합산, 외화 원본은 그대로 합산
+        entry_pairs = []
         total_foreign = Decimal("0")
-        total_krw = Decimal("0")
+        foreign_pairs = []
 
-        for entry in entries:
-            if entry.amount_converted and entry.converted_currency_code == "KRW":
-                krw_at_entry = entry.amount_converted
-            else:
-                if entry.currency_code == "KRW":
-                    krw_at_entry = entry.amount
-                else:
-                    converted = convert_to_krw(entry.amount, entry.currency_code)
-                    if converted is None:
-                        continue
-                    krw_at_entry = converted
-            total_krw += krw_at_entry
+        for _, amount, currency_code, pair in _expense_rows_at_entry_rate(user):
+            entry_pairs.append(pair)
 
-            if entry.currency_code == foreign_currency:
-                foreign_at_entry = entry.amount
+            if currency_code == foreign_currency:
+                total_foreign += amount
             else:
-                foreign_at_entry = convert_from_krw(krw_at_entry, foreign_currency)
-            if foreign_at_entry is not None:
-                total_foreign += foreign_at_entry
+                foreign_pairs.append(pair)
+
+        total_krw, _ = convert_totals(entry_pairs)
+        _, converted_foreign = convert_totals(foreign_pairs, foreign_currency)
+        total_foreign += converted_foreign
 
         total_foreign = total_foreign.quantize(Decimal("0.01"))
         total_krw = total_krw.quantize(Decimal("0.01"))
@@ -175,10 +181,11 @@ class DetailProfileView(APIView):
         except DetailProfile.DoesNotExist:
             return None
 
-    def _create_snapshot(self, user, detail_profile):
-        exchange_profile = getattr(user, "exchange_profile", None)
+    def _create_snapshot(self, context, detail_profile):
+        user = context.user
+        exchange_profile = context.exchange_profile
 
-        foreign_currency = resolve_foreign_currency(exchange_profile)
+        foreign_currency = context.currency
         total_foreign, total_krw = self._sum_ledger_for_user(user, foreign_currency)
 
         months = extract_months(exchange_profile)
@@ -186,8 +193,12 @@ class DetailProfileView(APIView):
         monthly_foreign = (total_foreign / months).quantize(Decimal("0.01"))
         monthly_krw = (total_krw / months).quantize(Decimal("0.01"))
 
+        # 이전 최신 스냅샷은 내리고 새 스냅샷을 최신으로 (post/put 트랜잭션 안에서 실행)
+        SummarySnapshot.objects.filter(user=user, is_latest=True).update(is_latest=False)
+
         snapshot = SummarySnapshot.objects.create(
             user=user,
+            is_latest=True,
             exchange_profile=exchange_profile,
             detail_profile=detail_profile,
             snapshot_nickname=getattr(user, "nickname", "") or "",
@@ -221,15 +232,17 @@ class LedgerSummaryView(APIView):
         LedgerEntry.Category.STUDY_MATERIALS: "교재비",
     }
 
+    @cache_user_response("summaries:ledger-summary")
     def get(self, request):
         user = request.user
+        context = get_user_context(request)
 
         # if not hasattr(user, "summary_detail_profile"):
         #     return bad("세부 프로필이 등록되어 있지 않습니다.", status_code=status.HTTP_403_FORBIDDEN)
 
-        exchange_profile = getattr(user, "exchange_profile", None)
+        exchange_profile = context.exchange_profile
 
-        foreign_currency = resolve_foreign_currency(exchange_profile)
+        foreign_currency = context.currency
         months = extract_months(exchange_profile)
 
         categories_data, total_foreign, total_krw, total_current_krw = self._build_category_summaries(
@@ -245,7 +258,7 @@ class LedgerSummaryView(APIView):
             "current_rate_krw_amount": (total_current_krw / months).quantize(Decimal("0.01")),
         }
 
-        base_dispatch_cost = self._build_dispatch_cost(user, foreign_currency)
+        base_dispatch_cost = self._build_dispatch_cost(context, foreign_currency)
 
         serializer = LedgerSummarySerializer(
             {
@@ -269,50 +282,40 @@ class LedgerSummaryView(APIView):
                 "current_rate_krw_amount": Decimal("0"),
             }
 
-        entries = (
-            LedgerEntry.objects
-            .filter(
-                user=user,
-                entry_type=LedgerEntry.EntryType.EXPENSE,
-                category__in=INCLUDED_CATEGORIES,
-            )
-        )
+        # 카테고리별로 (금액, 통화) 묶기 -> 통화당 한 번만 환산
+        # krw_amount 는 지출일 환율, current_rate_krw_amount 는 현재 환율 기준
+        current_pairs = defaultdict(list)
+        entry_pairs = defaultdict(list)
+        foreign_pairs = defaultdict(list)
+        foreign_fixed = defaultdict(lambda: Decimal("0"))
+
+        for category, amount, currency_code, pair in _expense_rows_at_entry_rate(user):
+            current_pairs[category].append((amount, currency_code))
+            entry_pairs[category].append(pair)
+
+            if currency_code == foreign_currency:
+                foreign_fixed[category] += amount
+            else:
+                foreign_pairs[category].append(pair)
 
         total_foreign = Decimal("0")
         total_krw = Decimal("0")
         total_current_krw = Decimal("0")
 
-        for entry in entries:
-            item = grouped[entry.category]
+        for code in INCLUDED_CATEGORIES:
+            item = grouped[code]
 
-            if entry.currency_code == "KRW":
-                current_krw = entry.amount
-            else:
-                current_krw = convert_to_krw(entry.amount, entry.currency_code)
-            if current_krw is not None:
-                item["current_rate_krw_amount"] += current_krw
-                total_current_krw += current_krw
+            current_krw, _ = convert_totals(current_pairs[code])
+            krw_at_entry, _ = convert_totals(entry_pairs[code])
+            _, foreign_val = convert_totals(foreign_pairs[code], foreign_currency)
+            foreign_val += foreign_fixed[code]
 
-            if entry.amount_converted and entry.converted_currency_code == "KRW":
-                krw_at_entry = entry.amount_converted
-            else:
-                if entry.currency_code == "KRW":
-                    krw_at_entry = entry.amount
-                else:
-                    krw_at_entry = convert_to_krw(entry.amount, entry.currency_code)
-            if krw_at_entry is not None:
-                item["krw_amount"] += krw_at_entry
-                total_krw += krw_at_entry
-
-            if entry.currency_code == foreign_currency:
-                item["foreign_amount"] += entry.amount
-                total_foreign += entry.amount
-            else:
-                if krw_at_entry is not None:
-                    foreign_val = convert_from_krw(krw_at_entry, foreign_currency)
-                    if foreign_val is not None:
-                        item["foreign_amount"] += foreign_val
-                        total_foreign += foreign_val
+            item["current_rate_krw_amount"] += current_krw
+            item["krw_amount"] += krw_at_entry
+            item["foreign_amount"] += foreign_val
+            total_current_krw += current_krw
+            total_krw += krw_at_entry
+            total_foreign += foreign_val
 
         result = []
         for code in INCLUDED_CATEGORIES:
@@ -324,9 +327,8 @@ class LedgerSummaryView(APIView):
 
         return result, total_foreign, total_krw, total_current_krw
 
-    def _build_dispatch_cost(self, user, foreign_currency):
-        base_budget = BaseBudget.objects.filter(budget__user=user).first()
-        if not base_budget:
+    def _build_dispatch_cost(self, context, foreign_currency):
+        if context.base_budget is None:
             return self._empty_dispatch_cost(foreign_currency)
 
         dispatch_items = {
@@ -336,7 +338,7 @@ class LedgerSummaryView(APIView):
             "tuition": self._empty_dispatch_cost_item(foreign_currency),
         }
 
-        for item in base_budget.items.all():
+        for item in context.base_budget_items:
             key = item.type.lower()
             if key not in dispatch_items:
                 continue
@@ -435,7 +437,7 @@ class LatestSummarySnapshotView(APIView):
         # 최신 스냅샷으로 (수정했으면 계속 누적되어서 최신 걸로 가져오기)
         snapshot = (
             SummarySnapshot.objects
-            .filter(user=user)
+            .filter(user=user, is_latest=True)
             .order_by('-created_at')
             .first()
         )